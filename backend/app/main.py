@@ -1,10 +1,16 @@
 import asyncio
 import sys
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.routers import health, prompts, analyze, results_fetch
+from app.services.analysis_jobs import get_job_queue
+from app.services.openai_client import close_openai_client, start_openai_client
+from app.services.pdf_pool import shutdown_pdf_pool, start_pdf_pool
+from app.services.results_store import close_results_store
+from app.services.voice_pool import shutdown_voice_pool, start_voice_pool
 
 if sys.platform.startswith("win"):
     try:
@@ -13,7 +19,28 @@ if sys.platform.startswith("win"):
         # If the runtime does not expose this policy, continue with default.
         pass
 
-app = FastAPI(title="Interview Coach API")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Spawn and warm the voice-analysis workers before the first upload arrives.
+    start_voice_pool()
+    # PDF reports render on their own processes, off the event loop.
+    start_pdf_pool()
+    # One pooled OpenAI client for every service, closed with the app.
+    start_openai_client()
+    get_job_queue().start()
+    try:
+        yield
+    finally:
+        await get_job_queue().stop()
+        await close_openai_client()
+        shutdown_voice_pool()
+        shutdown_pdf_pool()
+        close_results_store()
+
+
+app = FastAPI(title="Interview Coach API", lifespan=lifespan)
 
 # CORS (simple hardcoded version)
 app.add_middleware(
@@ -1,28 +1,48 @@
-import io
+import asyncio
+import contextlib
 import json
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import Response
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable, Image as RLImage
-from reportlab.lib.units import inch
-from reportlab.lib.utils import ImageReader
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 
 from app.services.analysis_service import (
     parse_json_field,
+    decode_upload_audio,
     parse_vision_metrics,
+    read_upload_audio,
     read_upload_bytes,
     save_json_payload,
     save_upload_bytes,
 )
-from app.services.results_store import store_latest_results, load_latest_results, load_latest_timelines
+from app.services.analysis_cache import get_analysis_cache
+from app.services.analysis_checkpoint import StageCheckpoint
+from app.services.analysis_jobs import JobQueueFullError, get_job_queue, iter_job_events
+from app.services.openai_client import openai_client_stats
+from app.services.pdf_export import PDF_EXPORT_MAX_RESULTS, load_report_inputs, stream_reports_zip
+from app.services.pdf_pool import cached_interview_pdf
+from app.services.pdf_report import pdf_etag
+from app.services.timeline_arrays import (
+    decode_timelines_binary,
+    timelines_from_payload,
+    timelines_to_json,
+)
+from app.services.results_store import (
+    load_audio,
+    load_timelines,
+    new_result_id,
+    store_results,
+    store_timelines,
+)
+from app.services.timeline_stats import compute_timeline_stats
 router = APIRouter()
 
 
+class BulkPdfExportRequest(BaseModel):
+    result_ids: List[str] = Field(..., min_length=1, max_length=PDF_EXPORT_MAX_RESULTS)
+
+
 def _as_list(value):
     return value if isinstance(value, list) else []
 
@@ -58,25 +78,51 @@ async def analyze(
     interview_summary: str = Form("{}"),
     interview_timelines: str = Form("{}"),
     interview_feedback: str = Form("{}"),
-    audio: UploadFile = File(...)
+    audio: UploadFile = File(...),
+    interview_timelines_bin: Optional[UploadFile] = File(
+        None, description="Timelines in the binary TLN1 encoding (see app/services/timeline_arrays.py)."
+    ),
+    mode: str = Query("sync", description="'sync' waits for the analysis; 'job' returns a job id immediately."),
 ):
     """
-    MVP endpoint:
-    - receives audio + prompt + vision metrics
-    - returns confirmation + parsed vision json
-    Next step: transcription + scoring.
+    Receives audio + prompt + vision metrics and runs transcription, voice
+    analysis and the LLM review.
+    - mode=sync (default): responds once the analysis has finished.
+    - mode=job: responds 202 with a job id; poll GET /analyze/jobs/{id} or
+      stream GET /analyze/jobs/{id}/events for progress. The audio is
+      decoded inside the job; a full queue is refused before any work.
     """
+    if mode == "job":
+        try:
+            get_job_queue().check_capacity()
+        except JobQueueFullError as exc:
+            raise _queue_full(exc) from exc
     vision = parse_vision_metrics(vision_metrics)
     summary = parse_json_field(interview_summary)
-    timelines = parse_json_field(interview_timelines)
+    # Timelines are converted to float32 arrays once, here; everything
+    # downstream (storage, /results/*_timeline, the PDF) reads the arrays.
+    timelines = timelines_from_payload(parse_json_field(interview_timelines))
+    if interview_timelines_bin is not None:
+        try:
+            timelines.update(decode_timelines_binary(await interview_timelines_bin.read()))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid interview_timelines_bin: {exc}") from exc
+    # Aggregates are computed once here and travel with the result (and into the prompt).
+    timeline_stats = compute_timeline_stats(timelines)
     feedback = normalize_feedback_payload(parse_json_field(interview_feedback))
     good_signals = summary.get("good_signals", [])
     red_flags = summary.get("red_flags", [])
     resolved_prompt_type = prompt_type or summary.get("type", "")
     resolved_prompt_difficulty = prompt_difficulty or summary.get("difficulty", "")
-    audio_size, filename, content_type, audio_bytes = await read_upload_bytes(audio)
-    saved_path = save_upload_bytes(audio_bytes, filename)
-    timelines_saved_path = save_json_payload(timelines, "results.json")
+    result_id = new_result_id()
+    if mode == "job":
+        # Decoded later, on the job worker.
+        audio_size, filename, content_type, audio_bytes = await read_upload_bytes(audio)
+        pcm = None
+    else:
+        audio_size, filename, content_type, audio_bytes, pcm = await read_upload_audio(audio)
+    saved_path = save_upload_bytes(audio_bytes, filename, result_id)
+    timelines_saved_path = save_json_payload(timelines, "results.json", result_id)
 
     # Terminal log for quick debugging during development.
     print("[/analyze] received audio upload", flush=True)
@@ -87,37 +133,145 @@ async def analyze(
     print(f"interview_summary={summary}", flush=True)
     print(f"interview_feedback={feedback}", flush=True)
 
+    submission = {
+        "result_id": result_id,
+        "prompt_id": prompt_id,
+        "prompt_text": prompt_text,
+        "prompt_type": resolved_prompt_type,
+        "prompt_difficulty": resolved_prompt_difficulty,
+        "vision_metrics_raw": vision_metrics,
+        "vision_metrics": vision,
+        "audio": {
+            "filename": filename,
+            "content_type": content_type,
+            "bytes": audio_size,
+            "saved_to": saved_path,
+        },
+        "interview_summary": summary,
+        "interview_timelines": timelines_to_json(timelines),
+        "timeline_stats": timeline_stats,
+        "interview_feedback": feedback,
+        "good_signals": good_signals,
+        "red_flags": red_flags,
+        "interview_timelines_saved_to": timelines_saved_path,
+    }
+
+    if mode == "job":
+        try:
+            job = get_job_queue().submit(lambda job: _run_analysis_job(job, submission, audio_bytes))
+        except JobQueueFullError as exc:
+            raise _queue_full(exc) from exc
+        print(f"[/analyze] queued job {job.id}", flush=True)
+        return JSONResponse(
+            status_code=202,
+            content={
+                "ok": True,
+                "job_id": job.id,
+                "result_id": result_id,
+                "status": job.status,
+                "status_url": f"/analyze/jobs/{job.id}",
+                "events_url": f"/analyze/jobs/{job.id}/events",
+            },
+        )
+
+    return await run_analysis(submission, audio_bytes, pcm=pcm)
+
+
+def _queue_full(exc: JobQueueFullError) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": "5"})
+
+
+async def _run_analysis_job(job, submission: dict, audio_bytes: bytes) -> dict:
+    # Decode on the job worker, so the POST answers without waiting for ffmpeg.
+    pcm = await decode_upload_audio(audio_bytes)
+    return await run_analysis(submission, audio_bytes, pcm=pcm, on_stage=job.emit)
+
+
+async def run_analysis(submission: dict, audio_bytes: bytes, pcm=None, on_stage=None, checkpoint=None) -> dict:
+    """
+    Run the Converter pipeline for one parsed /analyze submission, store the
+    combined results and return the /analyze response body.
+    Each stage is checkpointed under the result id (a new checkpoint unless
+    one is passed in by a retry). Releases the decoded PCM buffer (if any)
+    once the pipeline is done.
+    """
+    try:
+        if checkpoint is None:
+            checkpoint = StageCheckpoint(submission["result_id"], submission)
+        checkpoint.begin_attempt()
+        return await _run_analysis(submission, audio_bytes, pcm=pcm, on_stage=on_stage, checkpoint=checkpoint)
+    finally:
+        if pcm is not None:
+            pcm.close()
+
+
+async def _run_analysis(submission: dict, audio_bytes: bytes, pcm=None, on_stage=None, checkpoint=None) -> dict:
+    result_id = submission["result_id"]
+    prompt_id = submission["prompt_id"]
+    prompt_text = submission["prompt_text"]
+    resolved_prompt_type = submission["prompt_type"]
+    resolved_prompt_difficulty = submission["prompt_difficulty"]
+    summary = submission["interview_summary"]
+    timelines = submission["interview_timelines"]
+    timeline_stats = submission.get("timeline_stats")
+    feedback = submission["interview_feedback"]
+    good_signals = submission["good_signals"]
+    red_flags = submission["red_flags"]
+
     interview_analysis = None
     try:
         # Lazy import so missing optional deps (e.g. openai) do not break router startup.
         from app.services.Converter import analyze_interview
         interview_analysis = await analyze_interview(
             audio_bytes, 
-            vision_metrics,
+            submission["vision_metrics_raw"],
             prompt_id=prompt_id,
             prompt_text=prompt_text,
             prompt_difficulty=resolved_prompt_difficulty,
             prompt_type=resolved_prompt_type,
             prompt_good_signals=good_signals,
             prompt_red_flags=red_flags,
+            timeline_stats=timeline_stats,
+            on_stage=on_stage,
+            pcm=pcm,
+            checkpoint=checkpoint,
             )
         
         analysis_payload = _as_dict(interview_analysis)
+        if "error" in analysis_payload and checkpoint is not None:
+            # Keep whatever stages did finish visible in the stored results.
+            voice_checkpoint = _as_dict(checkpoint.value("voice"))
+            analysis_payload.setdefault("transcript", checkpoint.value("transcript"))
+            analysis_payload.setdefault(
+                "voice_analysis",
+                {key: value for key, value in voice_checkpoint.items() if key != "timeline"} or None,
+            )
+            analysis_payload.setdefault("voice_timeline", voice_checkpoint.get("timeline"))
+
+        # Keep the voice series next to the posture/eye timelines for /results/voice_timeline.
+        voice_timeline = analysis_payload.pop("voice_timeline", None)
+        if voice_timeline and isinstance(timelines, dict):
+            timelines = {**timelines, "voice_timeline": voice_timeline}
+            store_timelines(result_id, timelines)
 
         combined_results = {
+            "result_id": result_id,
             "prompt_id": prompt_id,
             "prompt_text": prompt_text,
             "prompt_type": resolved_prompt_type,
             "prompt_difficulty": resolved_prompt_difficulty,
-            "interview_timelines": timelines,
             "interview_summary": summary,
             "interview_feedback": feedback,
             "good_signals": good_signals,
             "red_flags": red_flags,
             "transcription_analysis": analysis_payload.get("transcript"),
             "vision_summary": analysis_payload.get("vision_summary"),
+            "timeline_stats": timeline_stats,
             "voice_analysis": analysis_payload.get("voice_analysis"),
             "llm_review": analysis_payload.get("llm_review"),
+            "analysis_status": (
+                "incomplete" if "error" in analysis_payload or checkpoint.pending_stages() else "complete"
+            ),
             # Persist the full Converter.py parsed output so downstream jobs can use all fields.
             "interview_analysis": analysis_payload,
             "converter_parsed": {
@@ -137,7 +291,7 @@ async def analyze(
             },
         }
         # Persist the full combined results payload in backend memory.
-        store_latest_results(combined_results)
+        store_results(result_id, combined_results)
         print("[/analyze] results stored in memory", flush=True)
 
 
@@ -148,167 +302,226 @@ async def analyze(
             "detail": str(exc),
         }
 
-    return {
+    response = {
         "ok": True,
+        "result_id": result_id,
         "prompt_id": prompt_id,
         "prompt_text": prompt_text,
         "prompt_type": resolved_prompt_type,
         "prompt_difficulty": resolved_prompt_difficulty,
-        "audio": {
-            "filename": filename,
-            "content_type": content_type,
-            "bytes": audio_size,
-            "saved_to": saved_path,
-        },
+        "audio": submission["audio"],
         "interview_summary": summary,
-        "interview_timelines": timelines,
+        "interview_timelines": timelines_to_json(timelines),
+        "timeline_stats": timeline_stats,
         "interview_feedback": feedback,
         "good_signals": good_signals,
         "red_flags": red_flags,
-        "interview_timelines_saved_to": timelines_saved_path,
-        "vision_metrics": vision,
+        "interview_timelines_saved_to": submission["interview_timelines_saved_to"],
+        "vision_metrics": submission["vision_metrics"],
         "interview_analysis": interview_analysis,
         "message": "Received audio + metrics. Next step: transcription + scoring.",
     }
+    if checkpoint is not None:
+        response["stages"] = checkpoint.summary()
+        if checkpoint.retryable_stages():
+            response["retry_url"] = f"/analyze/{result_id}/retry"
+    return response
+
 
-def generate_timeline_chart(data: list, title: str, color: str):
+# Retries in progress per result id, with how many requests hold or wait for
+# each lock. Retries of one result run one at a time (in this process), so a
+# second retry sees the stages the first one finished instead of re-running them.
+_RETRY_LOCKS: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+
+@contextlib.asynccontextmanager
+async def _retry_lock(result_id: str):
+    lock, users = _RETRY_LOCKS.get(result_id, (asyncio.Lock(), 0))
+    _RETRY_LOCKS[result_id] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = _RETRY_LOCKS[result_id]
+        if users > 1:
+            _RETRY_LOCKS[result_id] = (lock, users - 1)
+        else:
+            del _RETRY_LOCKS[result_id]
+
+
+def _load_retry(result_id: str) -> Tuple[StageCheckpoint, List[str], Optional[bytes]]:
     """
-    Generate a timeline chart and return a tuple of (ImageReader, buffer).
-    The caller is responsible for keeping a reference to the buffer alive
-    until after the PDF has been built to avoid premature garbage collection.
+    The checkpoint of an earlier /analyze call, the stages a retry would run
+    (empty if nothing is left to do) and the stored upload, if one of them
+    needs it.
     """
-    if not data:
-        return None, None
-
-    times = []
-    scores = []
-    for i, point in enumerate(data):
-        if isinstance(point, dict):
-            times.append(point.get("timeSec", i))
-            scores.append(point.get("score", 0))
-        elif isinstance(point, (list, tuple)) and len(point) >= 2:
-            times.append(point[0])  # index 0 = timeSec
-            scores.append(point[1])  # index 1 = score
-        else:
-            times.append(i)
-            scores.append(0)
-
-    fig, ax = plt.subplots(figsize=(7, 2.5))
-    ax.plot(times, scores, color=color, linewidth=1.5)
-    ax.fill_between(times, scores, alpha=0.15, color=color)
-    ax.set_title(title, fontsize=11, fontweight="bold", pad=8)
-    ax.set_xlabel("Time (s)", fontsize=9)
-    ax.set_ylabel("Score (%)", fontsize=9)
-    ax.set_ylim(0, 105)
-    ax.grid(True, alpha=0.3)
-    fig.tight_layout()
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="PNG", dpi=150, bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return ImageReader(buf), buf
+    checkpoint = StageCheckpoint.load(result_id)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired result id.")
+    pending = checkpoint.pending_stages()
+    retryable = checkpoint.retryable_stages()
+    if pending and not retryable:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Stages {pending} failed in a way a retry would not fix; submit the interview again.",
+        )
+    audio_bytes = None
+    if any(stage in retryable for stage in ("transcript", "voice")):
+        audio_bytes = (load_audio(result_id) or {}).get("raw_bytes")
+        if audio_bytes is None:
+            raise HTTPException(status_code=410, detail="The uploaded audio for this result has expired; submit it again.")
+    return checkpoint, retryable, audio_bytes
+
+
+async def _retry_stages(result_id: str, on_stage=None) -> dict:
+    async with _retry_lock(result_id):
+        # Load under the lock: a retry that held it may have finished these stages.
+        checkpoint, retryable, audio_bytes = await asyncio.to_thread(_load_retry, result_id)
+        if not retryable:
+            return {"ok": True, "result_id": result_id, "retried_stages": [], "stages": checkpoint.summary()}
+
+        submission = dict(checkpoint.submission)
+        submission["interview_timelines"] = {
+            key: value for key, value in load_timelines(result_id).items() if key != "voice_timeline"
+        }
+        if submission.get("timeline_stats") is None:
+            # Checkpoints written before the stats were computed at ingest.
+            submission["timeline_stats"] = compute_timeline_stats(submission["interview_timelines"])
+        print(f"[/analyze] retrying {retryable} for result {result_id}", flush=True)
 
+        response = await run_analysis(submission, audio_bytes or b"", on_stage=on_stage, checkpoint=checkpoint)
+        response["retried_stages"] = retryable
+        return response
 
-@router.get("/results/interview/pdf")
-async def download_interview_pdf():
+
+@router.post("/analyze/{result_id}/retry")
+async def retry_analysis(
+    result_id: str,
+    mode: str = Query("sync", description="'sync' waits for the analysis; 'job' returns a job id immediately."),
+):
+    """
+    Re-run only the stages of an earlier /analyze call that failed
+    transiently (and the review, if one of its inputs is re-run), reusing the
+    checkpointed transcript / voice analysis and the stored upload. Stages
+    that failed permanently (e.g. no speech detected) are not run again;
+    409 if nothing else is left to retry.
+    """
+    if mode != "job":
+        return await _retry_stages(result_id)
+
+    # Fail fast on the same checks the job makes once it holds the lock.
+    checkpoint, retryable, _ = await asyncio.to_thread(_load_retry, result_id)
+    if not retryable:
+        return {"ok": True, "result_id": result_id, "retried_stages": [], "stages": checkpoint.summary()}
     try:
-        data = load_latest_results()
-        if not data:
-            return {"error": "No results found. Run an analysis first."}
+        job = get_job_queue().submit(lambda job: _retry_stages(result_id, on_stage=job.emit))
+    except JobQueueFullError as exc:
+        raise _queue_full(exc) from exc
+    return JSONResponse(
+        status_code=202,
+        content={
+            "ok": True,
+            "job_id": job.id,
+            "result_id": result_id,
+            "retried_stages": retryable,
+            "status": job.status,
+            "status_url": f"/analyze/jobs/{job.id}",
+            "events_url": f"/analyze/jobs/{job.id}/events",
+        },
+    )
+
+
+@router.get("/analyze/cache_stats")
+async def get_analysis_cache_stats():
+    return {"ok": True, "cache": get_analysis_cache().stats()}
 
+
+@router.get("/analyze/openai_stats")
+async def get_openai_stats():
+    return {"ok": True, "openai": openai_client_stats()}
+
+
+@router.get("/analyze/jobs/{job_id}")
+async def get_analyze_job(job_id: str):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired analysis job.")
+    return {"ok": True, "job": job.to_dict()}
+
+
+@router.get("/analyze/jobs/{job_id}/events")
+async def stream_analyze_job_events(job_id: str):
+    """
+    Server-sent events stream of stage progress: decoded, transcribed,
+    voice_done, then the review as it is generated (review_delta per text
+    chunk, review_score per category score, review_section per finished
+    section), reviewed, and completed (with the result) or failed.
+    """
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired analysis job.")
+
+    async def event_source():
+        async for event in iter_job_events(job):
+            data = dict(event)
+            if event["stage"] == "completed":
+                data["result"] = job.result
+            yield f"id: {event['seq']}\nevent: {event['stage']}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+@router.get("/results/interview/pdf")
+async def download_interview_pdf(
+    result_id: str = Query(..., min_length=1),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    The interview report as a PDF. Rendering runs on the PDF worker pool and
+    the bytes are cached with the result under an ETag derived from its
+    content, so repeat downloads are a store read and revalidation
+    (If-None-Match) answers 304 without sending the body.
+    """
+    # Store reads (SQLite I/O) and hashing the whole result stay off the event loop.
+    inputs = await asyncio.to_thread(load_report_inputs, result_id)
+    if inputs is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired result id.")
+    report_result_id, data, eye_timeline, posture_timeline = inputs
+
+    try:
         print(f"[PDF] data keys: {list(data.keys())}", flush=True)
-        timelines = load_latest_timelines()
-        eye_timeline = timelines.get("eye_timeline", [])
-        posture_timeline = timelines.get("posture_timeline", [])
-
-        print(f"[PDF] eye_timeline points: {len(eye_timeline)}", flush=True)
-        print(f"[PDF] posture_timeline points: {len(posture_timeline)}", flush=True)
-
-        pdf_buffer = io.BytesIO()
-        doc = SimpleDocTemplate(pdf_buffer, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
-        styles = getSampleStyleSheet()
-        story = []
-        # Keep references to image buffers to prevent premature garbage collection
-        image_buffers = []
-
-        # Custom styles
-        title_style = ParagraphStyle("Title", parent=styles["Title"], fontSize=24, textColor=colors.HexColor("#1a1a2e"), spaceAfter=6)
-        heading_style = ParagraphStyle("Heading", parent=styles["Heading2"], fontSize=13, textColor=colors.HexColor("#16213e"), spaceBefore=14, spaceAfter=4)
-        body_style = ParagraphStyle("Body", parent=styles["Normal"], fontSize=10, leading=16, textColor=colors.HexColor("#333333"))
-        label_style = ParagraphStyle("Label", parent=styles["Normal"], fontSize=10, textColor=colors.HexColor("#666666"), spaceAfter=2)
-        value_style = ParagraphStyle("Value", parent=styles["Normal"], fontSize=11, textColor=colors.HexColor("#1a1a2e"), spaceBefore=0, spaceAfter=8)
-        bold_style = ParagraphStyle("Bold", parent=styles["Normal"], fontSize=10, fontName="Helvetica-Bold", textColor=colors.HexColor("#16213e"), spaceBefore=8, spaceAfter=4)
-        # Header
-        story.append(Paragraph("Interview Results Report", title_style))
-        story.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor("#4f46e5")))
-        story.append(Spacer(1, 12))
-
-        # Vision Scores
-        vision = data.get("vision_summary", {})
-        if vision:
-            story.append(Paragraph("Body Language Scores", heading_style))
-            story.append(Paragraph("Posture Score", label_style))
-            story.append(Paragraph(f"{vision.get('postureGoodPct', 'N/A')}%", value_style))
-            story.append(Paragraph("Eye Contact Score", label_style))
-            story.append(Paragraph(f"{vision.get('eyeGoodPct', 'N/A')}%", value_style))
-            story.append(HRFlowable(width="100%", thickness=0.5, color=colors.HexColor("#dddddd")))
-
-        # Voice Analysis
-        voice = data.get("voice_analysis", {})
-        if voice and "error" not in voice:
-            story.append(Paragraph("Voice Analysis", heading_style))
-            story.append(Paragraph("Pitch", label_style))
-            story.append(Paragraph(f"{voice.get('avg_pitch_hz', 'N/A')} Hz — {voice.get('pitch_feedback', '')}", value_style))
-            story.append(Paragraph("Tone", label_style))
-            story.append(Paragraph(voice.get("tone_feedback", "N/A"), value_style))
-            story.append(Paragraph("Speaking Rate", label_style))
-            story.append(Paragraph(f"{voice.get('speaking_rate', 'N/A')} — {voice.get('rate_feedback', '')}", value_style))
-            story.append(HRFlowable(width="100%", thickness=0.5, color=colors.HexColor("#dddddd")))
-
-        eye_chart_image, eye_buf = generate_timeline_chart(eye_timeline, "Eye Contact Timeline", "#4f46e5")
-        posture_chart_image, posture_buf = generate_timeline_chart(posture_timeline, "Posture Timeline", "#10b981")
-
-        story.append(Paragraph("Timeline Charts", heading_style))
-        if eye_chart_image:
-            image_buffers.append(eye_buf)
-            story.append(RLImage(eye_chart_image, width=6.5*inch, height=2.3*inch))
-            story.append(Spacer(1, 8))
-        if posture_chart_image:
-            image_buffers.append(posture_buf)
-            story.append(RLImage(posture_chart_image, width=6.5*inch, height=2.3*inch))
-        story.append(HRFlowable(width="100%", thickness=0.5, color=colors.HexColor("#dddddd")))
-
-
-        # Transcript
-        transcript = data.get("transcription_analysis") or data.get("transcript_analysis", "")
-        if transcript:
-            story.append(Paragraph("Transcript", heading_style))
-            story.append(Paragraph(transcript, body_style))
-            story.append(HRFlowable(width="100%", thickness=0.5, color=colors.HexColor("#dddddd")))
-
-        # LLM Review
-        review = data.get("llm_review", "")
-        if review:
-            story.append(Paragraph("AI Recruiter Feedback", heading_style))
-            for line in review.split("\n"):
-                line = line.strip()
-                if not line:
-                    story.append(Spacer(1, 4))
-                elif line.isupper() or line.endswith(":"):
-                    story.append(Paragraph(line, ParagraphStyle("Bold", parent=styles["Normal"], fontSize=10, fontName="Helvetica-Bold", spaceBefore=8, textColor=colors.HexColor("#16213e"))))
-                else:
-                    story.append(Paragraph(line, body_style))
-
-        doc.build(story)
-        pdf_buffer.seek(0)
-        pdf_bytes = pdf_buffer.getvalue()
-        print(f"[PDF] PDF built successfully, size: {len(pdf_bytes)} bytes", flush=True)
+        print(f"[PDF] eye_timeline points: {len(eye_timeline or ())}", flush=True)
+        print(f"[PDF] posture_timeline points: {len(posture_timeline or ())}", flush=True)
+
+        etag = await asyncio.to_thread(pdf_etag, data, eye_timeline, posture_timeline)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        pdf_bytes, from_cache = await cached_interview_pdf(
+            report_result_id, etag, data, eye_timeline, posture_timeline
+        )
+        print(f"[PDF] {'served from cache' if from_cache else 'rendered'}, size: {len(pdf_bytes)} bytes", flush=True)
 
         return Response(
             content=pdf_bytes,
             media_type="application/pdf",
-            headers={"Content-Disposition": 'attachment; filename="interview-results.pdf"'},
+            headers={
+                **headers,
+                "Content-Disposition": 'attachment; filename="interview-results.pdf"',
+                "X-PDF-Cache": "hit" if from_cache else "miss",
+            },
         )
 
     except Exception as e:
@@ -316,4 +529,25 @@ async def download_interview_pdf():
         import traceback
         traceback.print_exc()
         return {"error": str(e)}
-        
+
+
+@router.post("/results/interview/pdf/bulk")
+async def export_interview_pdfs(request: BulkPdfExportRequest):
+    """
+    The reports for several results as one zip, streamed back as each report
+    finishes rendering on the PDF worker pool. Reports already cached with
+    their result are not rendered again; ids without results are listed in
+    the archive's manifest.json instead of failing the export.
+    """
+    result_ids = list(dict.fromkeys(result_id.strip() for result_id in request.result_ids if result_id.strip()))
+    if not result_ids:
+        raise HTTPException(status_code=400, detail="Provide at least one result id.")
+    print(f"[PDF] bulk export of {len(result_ids)} reports", flush=True)
+    return StreamingResponse(
+        stream_reports_zip(result_ids),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": 'attachment; filename="interview-reports.zip"',
+            "Cache-Control": "no-store",
+        },
+    )
@@ -234,7 +234,7 @@ async def prompt_from_job_ad(request: JobAdPromptRequest):
             raise HTTPException(status_code=400, detail="Provide a job ad URL or paste job ad text.")
         job_ad = await _fetch_job_ad(job_url)
     try:
-        prompt = generate_prompt_from_job_ad_with_openai(
+        prompt = await generate_prompt_from_job_ad_with_openai(
             job_url=job_ad["url"],
             job_title=job_ad["title"],
             job_text=job_ad["text"],
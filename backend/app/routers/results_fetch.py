@@ -1,73 +1,169 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from app.services.results_store import (
+    load_results,
+    load_timelines,
+    result_exists,
+    results_store_stats,
+)
+from app.services.timeline_arrays import timeline_pairs, timelines_to_json
+from app.services.timeline_downsample import (
+    TIMELINE_MAX_POINTS_LIMIT,
+    downsample_cache_stats,
+    downsampled_timeline,
+)
+from app.services.timeline_stats import compute_timeline_stats
 
-from fastapi import APIRouter
+router = APIRouter(prefix="/results", tags=["results"])
 
-from app.services.results_store import load_latest_results, load_latest_timelines
+RESULT_ID_QUERY = Query(
+    ...,
+    min_length=1,
+    description="Result id returned by POST /analyze.",
+)
+
+MAX_POINTS_QUERY = Query(
+    None,
+    ge=2,
+    le=TIMELINE_MAX_POINTS_LIMIT,
+    description=(
+        "Downsample each timeline to at most this many points (LTTB). "
+        "Without it the full series is returned."
+    ),
+)
 
-router = APIRouter(prefix="/results", tags=["results"])
 
+def _ensure_known_result(result_id: str) -> None:
+    if not result_exists(result_id):
+        raise HTTPException(status_code=404, detail="Unknown or expired result id.")
 
-def load_results_payload() -> Dict[str, Any]:
+
+def load_results_payload(result_id: str) -> Dict[str, Any]:
     """
     Backwards-compatible helper that now reads from in-memory storage
     instead of the filesystem.
     """
-    return load_latest_results()
+    return load_results(result_id)
 
 
-def load_interview_timelines() -> Dict[str, Any]:
+def load_interview_timelines(result_id: str) -> Dict[str, Any]:
     """
-    Helper that returns the most recent interview timelines from in-memory storage.
+    Helper that returns a result's interview timelines from in-memory storage.
     """
-    timelines = load_latest_timelines()
+    timelines = load_timelines(result_id)
     if not timelines:
         return {"posture_timeline": [], "eye_timeline": []}
     return timelines
 
 
 def to_pairs(timeline: Any):
-    if not isinstance(timeline, list):
-        return []
-    pairs = []
-    for item in timeline:
-        if isinstance(item, dict):
-            pairs.append([item.get("timestamp"), item.get("percentage")])
-    return pairs
+    """
+    [[timestamp, value], ...] straight from the stored float32 arrays.
+    """
+    return timeline_pairs(timeline)
 
 
+def downsampled_pairs(
+    result_id: str,
+    interview_timelines: Dict[str, Any],
+    name: str,
+    max_points: Optional[int],
+):
+    """
+    Pairs of one timeline, downsampled to `max_points` (cached per result,
+    series and resolution) when it is given, otherwise the full series.
+    """
+    timeline = interview_timelines.get(name, [])
+    if max_points is None:
+        return to_pairs(timeline)
+    return to_pairs(downsampled_timeline(result_id, name, timeline, max_points))
+
+
+# Timeline responses are returned as JSONResponse so the (potentially long)
+# pair lists go straight to json.dumps instead of through FastAPI's encoder.
 @router.get("/timelines")
-def get_timelines():
-    interview_timelines = load_interview_timelines()
-    posture_pairs = to_pairs(interview_timelines.get("posture_timeline", []))
-    eye_pairs = to_pairs(interview_timelines.get("eye_timeline", []))
-    return {
+def get_timelines(result_id: str = RESULT_ID_QUERY, max_points: Optional[int] = MAX_POINTS_QUERY):
+    _ensure_known_result(result_id)
+    interview_timelines = load_interview_timelines(result_id)
+    posture_pairs = downsampled_pairs(result_id, interview_timelines, "posture_timeline", max_points)
+    eye_pairs = downsampled_pairs(result_id, interview_timelines, "eye_timeline", max_points)
+    return JSONResponse({
         "ok": True,
         "interview_timelines": {
             "posture_timeline": posture_pairs,
             "eye_timeline": eye_pairs,
         },
-    }
+    })
 
 @router.get("/posture_timeline")
-def get_posture_timeline():
-    interview_timelines = load_interview_timelines()
-    posture_timeline = to_pairs(interview_timelines.get("posture_timeline", []))
-    return {"ok": True, "posture_timeline": posture_timeline}
+def get_posture_timeline(result_id: str = RESULT_ID_QUERY, max_points: Optional[int] = MAX_POINTS_QUERY):
+    _ensure_known_result(result_id)
+    interview_timelines = load_interview_timelines(result_id)
+    posture_timeline = downsampled_pairs(result_id, interview_timelines, "posture_timeline", max_points)
+    return JSONResponse({"ok": True, "posture_timeline": posture_timeline})
 
 @router.get("/eye_timeline")
-def get_eye_timeline():
-    interview_timelines = load_interview_timelines()
-    eye_timeline = to_pairs(interview_timelines.get("eye_timeline", []))
-    return {"ok": True, "eye_timeline": eye_timeline}
+def get_eye_timeline(result_id: str = RESULT_ID_QUERY, max_points: Optional[int] = MAX_POINTS_QUERY):
+    _ensure_known_result(result_id)
+    interview_timelines = load_interview_timelines(result_id)
+    eye_timeline = downsampled_pairs(result_id, interview_timelines, "eye_timeline", max_points)
+    return JSONResponse({"ok": True, "eye_timeline": eye_timeline})
+
+@router.get("/timeline_stats")
+def get_timeline_stats(result_id: str = RESULT_ID_QUERY):
+    """
+    Mean, percentiles, time below the low-score threshold and the longest
+    low streak of the posture and eye-contact timelines, computed at ingest.
+    """
+    _ensure_known_result(result_id)
+    stats = load_results_payload(result_id).get("timeline_stats")
+    if not isinstance(stats, dict):
+        # Results stored before the stats existed, or still being analysed.
+        stats = compute_timeline_stats(load_interview_timelines(result_id))
+    return {"ok": True, "timeline_stats": stats}
+
+@router.get("/voice_timeline")
+def get_voice_timeline(result_id: str = RESULT_ID_QUERY):
+    _ensure_known_result(result_id)
+    interview_timelines = load_interview_timelines(result_id)
+    voice = interview_timelines.get("voice_timeline")
+    if not isinstance(voice, dict):
+        voice = {}
+    return {
+        "ok": True,
+        "voice_timeline": {
+            "window_sec": voice.get("window_sec"),
+            "pitch_hz": voice.get("pitch_hz", []),
+            "energy": voice.get("energy", []),
+            "speaking_rate": voice.get("speaking_rate", []),
+        },
+    }
 
 
 @router.get("/llm_review")
-def get_llm_review():
-    payload = load_results_payload()
+def get_llm_review(result_id: str = RESULT_ID_QUERY):
+    _ensure_known_result(result_id)
+    payload = load_results_payload(result_id)
     return {"ok": True, "llm_review": payload.get("llm_review")}
 
 
 @router.get("/full")
-def get_full_results():
-    payload = load_results_payload()
+def get_full_results(result_id: str = RESULT_ID_QUERY):
+    _ensure_known_result(result_id)
+    payload = load_results_payload(result_id)
+    if payload:
+        # Timelines are kept once, as arrays, next to the results rather than inside them.
+        payload["interview_timelines"] = timelines_to_json(load_timelines(result_id))
     return {"ok": True, "results": payload}
+
+
+@router.get("/store_stats")
+def get_store_stats():
+    return {
+        "ok": True,
+        "store": results_store_stats(),
+        "timeline_downsample_cache": downsample_cache_stats(),
+    }
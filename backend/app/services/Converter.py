@@ -1,187 +1,250 @@
+import asyncio
 import io
 import json
 import logging
 import os
-import subprocess
-import shutil
+from typing import Callable, Optional
 
-import librosa
-import numpy as np
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+from app.services.analysis_cache import audio_digest, cache_key, cached_stage
+from app.services.analysis_checkpoint import StageCheckpoint, is_transient_failure, run_stage
+from app.services.openai_client import call_with_retries, get_openai_client
+from app.services.review_parser import REVIEW_JSON_FORMAT, ReviewStreamParser, parse_review, render_review_text, review_fields
+from app.services.timeline_stats import format_timeline_stats
+from app.services.transcription_chunks import STT_CHUNK_SECONDS, should_chunk, transcribe_in_chunks
+from app.services.voice_analysis import (
+    VOICE_SAMPLE_RATE,
+    FFmpegNotAvailableError,
+    PcmBuffer,
+    decode_audio_to_pcm,
+    voice_analysis_params,
+)
+from app.services.voice_pool import analyze_voice_in_pool
+
 logger = logging.getLogger("uvicorn.error")
 
 load_dotenv()  # Load your OpenAI API key from .env
 
 
-def _resolve_ffmpeg() -> str | None:
-    """
-    Resolve path to an ffmpeg executable.
-    Priority:
-    - FFMPEG_PATH env var (full path)
-    - PATH lookup
-    - `imageio_ffmpeg` bundled binary (pip install imageio-ffmpeg)
-    """
-    ffmpeg_env = os.getenv("FFMPEG_PATH", "").strip()
-    if ffmpeg_env and os.path.isfile(ffmpeg_env):
-        return ffmpeg_env
+print("DEBUG: Analysis started...", flush=True)
 
-    converter_path = shutil.which("ffmpeg") or shutil.which("avconv")
-    if converter_path:
-        return converter_path
 
-    try:
-        import imageio_ffmpeg  # type: ignore
+# 2. OpenAI models (Whisper + chat share the app-wide client from openai_client)
+OPENAI_WHISPER_MODEL = "whisper-1"
+OPENAI_CHAT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Stream the review completion and forward it as review_delta / review_score /
+# review_section stage events while it is generated (job mode only; the
+# synchronous /analyze response has nobody to stream to).
+REVIEW_STREAMING = os.getenv("REVIEW_STREAMING", "1").lower() not in ("0", "false", "no")
 
-        candidate = imageio_ffmpeg.get_ffmpeg_exe()
-        if candidate and os.path.isfile(candidate):
-            return candidate
-    except Exception:
-        return None
+# Called as on_stage(stage_name, details) when a pipeline stage completes.
+StageCallback = Callable[[str, dict], None]
 
-    return None
+
+def _notify_stage(on_stage: Optional[StageCallback], stage: str, **details) -> None:
+    if on_stage is None:
+        return
+    try:
+        on_stage(stage, details)
+    except Exception as e:
+        logger.warning(f"Stage callback failed for '{stage}': {e}")
 
 
-def _webm_to_wav_bytes_via_ffmpeg(ffmpeg_path: str, webm_bytes: bytes) -> bytes:
+def _parse_vision_metrics(raw: str) -> dict:
     """
-    Convert WebM/Opus bytes to WAV bytes using ffmpeg via stdin/stdout pipes.
-    Avoids pydub/ffprobe and does not touch the filesystem.
+    The client's vision metrics, or {} when they are missing or not a JSON
+    object. Fields are read with fallbacks, so bad metrics degrade the review
+    prompt instead of failing outside any checkpointed stage.
     """
-    if not webm_bytes:
-        raise ValueError("Empty audio upload (0 bytes).")
-
-    proc = subprocess.run(
-        [
-            ffmpeg_path,
-            "-hide_banner",
-            "-loglevel",
-            "error",
-            "-i",
-            "pipe:0",
-            "-ac",
-            "1",
-            "-ar",
-            "16000",
-            "-f",
-            "wav",
-            "pipe:1",
-        ],
-        input=webm_bytes,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        check=False,
-    )
-    if proc.returncode != 0 or not proc.stdout:
-        stderr = (proc.stderr or b"").decode("utf-8", errors="replace")[:800]
-        raise RuntimeError(f"ffmpeg conversion failed (code={proc.returncode}). {stderr}")
-    return proc.stdout
+    try:
+        metrics = json.loads(raw) if raw else {}
+    except ValueError:
+        return {}
+    return metrics if isinstance(metrics, dict) else {}
+
+
+def _format_percent(value) -> str:
+    return f"{value}%" if isinstance(value, (int, float)) else "not measured"
 
 
-def analyze_voice_tone_from_bytes(webm_bytes: bytes) -> dict:
+WHISPER_PROMPT = (
+    "Transcribe this interview audio clearly and accurately. "
+    "Focus on capturing the candidate's words verbatim, including "
+    "filler words and hesitations, as these are important for analysis."
+)
+
+
+async def transcribe_audio(
+    audio_bytes: bytes,
+    filename: str = "interview.webm",
+    client: Optional[AsyncOpenAI] = None,
+) -> str:
     """
-    Analyze voice tone directly from in-memory WebM audio bytes.
-    No filesystem I/O is performed.
+    Transcribe interview audio via the OpenAI Whisper API.
+    Uses the async client so the event loop keeps serving other requests.
     """
-    ffmpeg_path = _resolve_ffmpeg()
-    if not ffmpeg_path:
-        msg = (
-            "ffmpeg not found. Either add ffmpeg to PATH, set FFMPEG_PATH to the full path "
-            "to ffmpeg.exe, or install `imageio-ffmpeg` so the backend can use a bundled ffmpeg."
-        )
-        logger.warning(msg)
-        return {"error": "ffmpeg_not_available", "detail": msg}
-
-    try:
-        wav_bytes = _webm_to_wav_bytes_via_ffmpeg(ffmpeg_path, webm_bytes)
-        wav_buffer = io.BytesIO(wav_bytes)
+    client = client or get_openai_client()
 
-        # Now load the clean wav from memory
-        y, sr = librosa.load(wav_buffer, sr=16000)
+    def _request():
+        # A fresh file object per attempt: a retried upload must start from byte 0.
+        audio_file = io.BytesIO(audio_bytes)
+        # Some OpenAI-compatible clients expect a name attribute on the file-like object.
+        audio_file.name = filename  # type: ignore[attr-defined]
+        return client.audio.transcriptions.create(
+            file=audio_file,
+            model=OPENAI_WHISPER_MODEL,
+            prompt=WHISPER_PROMPT,
+        )
 
-        # Remove silence before analysis — silence skews pitch readings
-        intervals = librosa.effects.split(y, top_db=30)
-        y_voiced = np.concatenate([y[start:end] for start, end in intervals])
+    stt_result = await call_with_retries(_request, operation="whisper transcription")
+    return stt_result.text
 
-        if len(y_voiced) < sr * 0.5:  # Less than 0.5 seconds of speech
-            return {"error": "Not enough speech detected"}
 
-        # 1. Pitch Analysis — use y_voiced only (no silence)
-        f0, voiced_flag, _ = librosa.pyin(
-            y_voiced,
-            fmin=librosa.note_to_hz('C2'),
-            fmax=librosa.note_to_hz('C7'),
-            frame_length=2048,
+async def transcribe_recording(
+    audio_bytes: bytes,
+    pcm: Optional[PcmBuffer] = None,
+    client: Optional[AsyncOpenAI] = None,
+) -> str:
+    """
+    Transcribe the whole upload in one request, or, for long recordings with
+    decoded PCM available, in silence-aligned chunks sent concurrently.
+    """
+    if pcm is not None and should_chunk(pcm.sample_count, VOICE_SAMPLE_RATE):
+        return await transcribe_in_chunks(
+            pcm.samples(),
+            VOICE_SAMPLE_RATE,
+            lambda chunk, name: transcribe_audio(chunk, filename=name, client=client),
         )
-        voiced_f0 = f0[voiced_flag & ~np.isnan(f0)]
-
-        avg_pitch = float(np.mean(voiced_f0)) if len(voiced_f0) > 0 else 0.0
-        pitch_variability = float(np.std(voiced_f0)) if len(voiced_f0) > 0 else 0.0
-
-        # Normalize pitch variability as % of mean for fairer comparison
-        pitch_variability_pct = (pitch_variability / avg_pitch * 100) if avg_pitch > 0 else 0
-
-        # 2. Speaking Rate — use onset detection (much more accurate than ZCR)
-        onset_frames = librosa.onset.onset_detect(y=y_voiced, sr=sr, units='time')
-        duration_voiced = len(y_voiced) / sr
-        speaking_rate = len(onset_frames) / duration_voiced if duration_voiced > 0 else 0
-
-        # 3. Energy
-        rms = librosa.feature.rms(y=y_voiced)
-        avg_energy = float(np.mean(rms))
-        energy_variation = float(np.std(rms))
-
-        # 4. Pitch feedback — use gender-neutral ranges
-        if avg_pitch < 85:
-            pitch_feedback = "Very low pitch — may sound flat or disengaged."
-        elif avg_pitch < 180:
-            pitch_feedback = "Low-normal pitch — sounds calm and authoritative."
-        elif avg_pitch < 300:
-            pitch_feedback = "Normal pitch range — good for conversation."
-        else:
-            pitch_feedback = "High pitch — may sound nervous or anxious."
-
-        # 5. Monotone feedback — use % variability for accuracy
-        if pitch_variability_pct < 10:
-            monotone_feedback = "Very monotone — your pitch barely changes, which can disengage interviewers. Practice varying your tone when emphasizing key points."
-        elif pitch_variability_pct < 25:
-            monotone_feedback = "Slightly monotone — some variation present but adding more expressiveness would help keep the interviewer engaged."
-        elif pitch_variability_pct < 60:
-            monotone_feedback = "Good pitch variation — your voice sounds natural and engaging."
-        else:
-            monotone_feedback = "High pitch variation — make sure your tone stays controlled and professional."
+    return await transcribe_audio(audio_bytes, client=client)
 
-        # 6. Speaking rate feedback — onsets per second
-        if speaking_rate < 2.0:
-            rate_feedback = "Speaking too slowly — try to pick up the pace to sound more confident."
-        elif speaking_rate > 6.0:
-            rate_feedback = "Speaking too fast — slow down so the interviewer can follow you."
-        else:
-            rate_feedback = "Good speaking rate — easy to follow."
 
-        return {
-            "avg_pitch_hz": round(avg_pitch, 2),
-            "pitch_variation": round(pitch_variability, 2),
-            "pitch_variation_pct": round(pitch_variability_pct, 2),
-            "speaking_rate": round(speaking_rate, 2),
-            "avg_energy": round(avg_energy, 4),
-            "energy_variation": round(energy_variation, 4),
-            "pitch_feedback": pitch_feedback,
-            "tone_feedback": monotone_feedback,
-            "rate_feedback": rate_feedback,
-        }
+async def transcribe_audio_cached(audio_bytes: bytes, digest: str, pcm: Optional[PcmBuffer] = None) -> str:
+    """
+    transcribe_recording behind the content-hash cache, so re-submitting the
+    same recording does not pay for Whisper again.
+    """
+    params = {"model": OPENAI_WHISPER_MODEL, "prompt": WHISPER_PROMPT}
+    if pcm is not None and should_chunk(pcm.sample_count, VOICE_SAMPLE_RATE):
+        params["chunk_sec"] = STT_CHUNK_SECONDS
+    key = cache_key("transcript", digest, params)
+    return await cached_stage(key, lambda: transcribe_recording(audio_bytes, pcm=pcm))
+
+
+async def run_voice_analysis_cached(
+    audio_bytes: bytes,
+    digest: str,
+    on_stage: Optional[StageCallback] = None,
+    pcm: Optional[PcmBuffer] = None,
+) -> dict:
+    """
+    run_voice_analysis behind the content-hash cache. Error results are not
+    cached. A hit still emits "decoded" (with cached=True), so progress
+    clients see the same stage sequence either way.
+    """
+    key = cache_key("voice", digest, voice_analysis_params())
+    computed = False
+
+    async def _compute() -> dict:
+        nonlocal computed
+        computed = True
+        return await run_voice_analysis(audio_bytes, on_stage=on_stage, pcm=pcm)
+
+    result = await cached_stage(
+        key,
+        _compute,
+        should_store=lambda value: isinstance(value, dict) and "error" not in value,
+    )
+    if not computed:
+        details = {"cached": True}
+        if pcm is not None:
+            details["duration_sec"] = round(pcm.sample_count / VOICE_SAMPLE_RATE, 2)
+        _notify_stage(on_stage, "decoded", **details)
+    return dict(result)
+
+
+async def run_voice_analysis(
+    audio_bytes: bytes,
+    on_stage: Optional[StageCallback] = None,
+    pcm: Optional[PcmBuffer] = None,
+) -> dict:
+    """
+    Hand decoded PCM to the voice-analysis process pool for the CPU-bound
+    librosa work. Without a PCM buffer from streaming ingest, the upload is
+    decoded with ffmpeg on a worker thread first.
+    """
+    if pcm is not None:
+        _notify_stage(on_stage, "decoded", duration_sec=round(pcm.sample_count / VOICE_SAMPLE_RATE, 2))
+        return await analyze_voice_in_pool(pcm, VOICE_SAMPLE_RATE)
+
+    try:
+        y, sr = await asyncio.to_thread(decode_audio_to_pcm, audio_bytes)
+    except FFmpegNotAvailableError as e:
+        logger.warning(str(e))
+        return {"error": "ffmpeg_not_available", "detail": str(e)}
     except Exception as e:
         logger.error(f"Error analyzing voice tone: {e}")
         return {"error": str(e)}
+    _notify_stage(on_stage, "decoded", duration_sec=round(len(y) / sr, 2))
+    return await analyze_voice_in_pool(y, sr)
 
-print("DEBUG: Analysis started...", flush=True)
 
+async def generate_review(
+    client: AsyncOpenAI,
+    prompt: str,
+    on_stage: Optional[StageCallback] = None,
+) -> str:
+    """
+    Run the review completion. With a stage callback (and REVIEW_STREAMING on)
+    the completion is streamed: each category score ("review_score") and
+    finished feedback section ("review_section") is emitted, labelled and
+    formatted for display, as soon as it is complete, so the client sees
+    feedback within about a second instead of after the whole generation.
+    Text deltas are forwarded as "review_delta" only for a free-text reply;
+    fragments of the JSON reply are not readable on their own. Retries cover
+    opening the stream only; once events have been forwarded a failure is
+    not replayed.
+    """
+    messages = [{"role": "user", "content": prompt}]
+    if on_stage is None or not REVIEW_STREAMING:
+        response = await call_with_retries(
+            lambda: client.chat.completions.create(
+                model=OPENAI_CHAT_MODEL,
+                messages=messages,
+                response_format={"type": "json_object"},
+            ),
+            operation="interview review",
+        )
+        return response.choices[0].message.content
+
+    stream = await call_with_retries(
+        lambda: client.chat.completions.create(
+            model=OPENAI_CHAT_MODEL,
+            messages=messages,
+            response_format={"type": "json_object"},
+            stream=True,
+        ),
+        operation="interview review",
+    )
+    parser = ReviewStreamParser()
+    parts = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        parts.append(delta)
+        events = parser.feed(delta)
+        if parser.mode == "text":
+            _notify_stage(on_stage, "review_delta", text=delta)
+        for stage, details in events:
+            _notify_stage(on_stage, stage, **details)
+    for stage, details in parser.finish():
+        _notify_stage(on_stage, stage, **details)
+    return "".join(parts)
 
-# 2. Setup OpenAI client (Whisper + chat use OpenAI API directly)
-_openai_api_key = os.getenv("OPENAI_API_KEY") or os.getenv("OPEN_AI_API_KEY")
-llm_client = OpenAI(api_key=_openai_api_key) if _openai_api_key else None
-OPENAI_WHISPER_MODEL = "whisper-1"
-OPENAI_CHAT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
 async def analyze_interview(
     audio_bytes: bytes, 
@@ -192,39 +255,67 @@ async def analyze_interview(
     prompt_difficulty: str = "",
     prompt_good_signals: str = "",
     prompt_red_flags: str = "",
+    timeline_stats: Optional[dict] = None,
+    on_stage: Optional[StageCallback] = None,
+    pcm: Optional[PcmBuffer] = None,
+    checkpoint: Optional[StageCheckpoint] = None,
 ):
+    """
+    Transcribe, analyse the voice and review one interview. With a
+    checkpoint, stages it already holds are reused and each stage outcome is
+    recorded as it finishes, so a failed run can be retried without paying
+    for the stages that succeeded.
+    """
+    llm_client = get_openai_client()
     if not llm_client:
         return {
             "error": "analysis_unavailable",
             "detail": "Missing OPENAI_API_KEY or OPEN_AI_API_KEY.",
         }
     try:
-        # A. Transcribe audio via OpenAI Whisper API (no Groq)
-        audio_file = io.BytesIO(audio_bytes)
-        # Some OpenAI-compatible clients expect a name attribute on the file-like object.
-        audio_file.name = "interview.webm"  # type: ignore[attr-defined]
-
-        stt_result = llm_client.audio.transcriptions.create(
-            file=audio_file,
-            model=OPENAI_WHISPER_MODEL,
-            prompt=(
-                "Transcribe this interview audio clearly and accurately. "
-                "Focus on capturing the candidate's words verbatim, including "
-                "filler words and hesitations, as these are important for analysis."
-            ),
+        # A + B. Transcription is network-bound and voice analysis is CPU-bound;
+        # neither depends on the other, so run them side by side.
+        digest = audio_digest(audio_bytes)
+        if checkpoint is not None:
+            # A re-run transcript or voice analysis makes the old review stale;
+            # settled stages (done, or failed for good) are not run again.
+            for stage in ("transcript", "voice"):
+                if not checkpoint.is_settled(stage):
+                    checkpoint.invalidate(stage)
+
+        async def _transcribe_stage() -> str:
+            text = await transcribe_audio_cached(audio_bytes, digest, pcm=pcm)
+            _notify_stage(on_stage, "transcribed", characters=len(text or ""))
+            return text
+
+        async def _voice_stage() -> dict:
+            result = await run_voice_analysis_cached(audio_bytes, digest, on_stage=on_stage, pcm=pcm)
+            _notify_stage(on_stage, "voice_done", ok="error" not in result)
+            return result
+
+        # return_exceptions so one stage failing does not lose the other's result
+        # before it is checkpointed.
+        outcomes = await asyncio.gather(
+            run_stage(checkpoint, "transcript", _transcribe_stage),
+            run_stage(checkpoint, "voice", _voice_stage, failed=lambda value: "error" in value),
+            return_exceptions=True,
         )
-        transcript = stt_result.text
-
-        # B. Voice analysis from in-memory bytes
-        voice_analysis = analyze_voice_tone_from_bytes(audio_bytes)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        transcript, voice_analysis = outcomes
+        # The per-window series is stored with the posture/eye timelines, not in the scalar summary.
+        voice_analysis = dict(voice_analysis)
+        voice_timeline = voice_analysis.pop("timeline", None)
         print("\n===== VOICE TONE ANALYSIS =====", flush=True)
         print(f"Avg Pitch: {voice_analysis.get('avg_pitch_hz')} Hz — {voice_analysis.get('pitch_feedback')}", flush=True)
         print(f"Tone: {voice_analysis.get('tone_feedback')}", flush=True)
         print(f"Speaking Rate: {voice_analysis.get('speaking_rate')} — {voice_analysis.get('rate_feedback')}", flush=True)
+        print(f"Pauses: {voice_analysis.get('pause_count')} (longest {voice_analysis.get('longest_pause_sec')}s)", flush=True)
         print("================================\n", flush=True)
 
         # C. Process Vision Metrics
-        metrics = json.loads(vision_metrics)
+        metrics = _parse_vision_metrics(vision_metrics)
 
         # D. The LLM Review (The real magic)
         prompt = f"""
@@ -255,13 +346,18 @@ async def analyze_interview(
         
         --- INTERVIEW DATA ---
         Transcript: {transcript}
-        Posture Score: {metrics['postureGoodPct']}%
-        Eye Contact Score: {metrics['eyeGoodPct']}%
+        Posture Score: {_format_percent(metrics.get('postureGoodPct'))}
+        Eye Contact Score: {_format_percent(metrics.get('eyeGoodPct'))}
+
+        --- POSTURE / EYE CONTACT OVER TIME ---
+        Percentage of frames with good posture / eye contact, tracked through the answer:
+        {format_timeline_stats(timeline_stats)}
 
         --- VOICE TONE DATA ---
         Average Pitch: {voice_analysis.get('avg_pitch_hz')} Hz — {voice_analysis.get('pitch_feedback')}
         Tone Variation: {voice_analysis.get('tone_feedback')}
         Speaking Rate: {voice_analysis.get('speaking_rate')} — {voice_analysis.get('rate_feedback')}
+        Pauses: {voice_analysis.get('pause_count', 'N/A')} pauses of 0.3s or more, longest {voice_analysis.get('longest_pause_sec', 'N/A')}s, {voice_analysis.get('total_pause_sec', 'N/A')}s in total
 
         --- SCORING RUBRIC (100 points total) ---
         Score each category honestly based on the question type and difficulty.
@@ -290,86 +386,71 @@ async def analyze_interview(
         - Tone variation: {voice_analysis.get('tone_feedback')}
         - Speaking rate: {voice_analysis.get('rate_feedback')}
 
-        --- RESPONSE FORMAT (follow this exactly) ---
-
-        QUESTION: {prompt_text}
-        TYPE: {prompt_type}
-        DIFFICULTY: {prompt_difficulty}
-
-        CATEGORY SCORES:
-        - Communication Clarity: X/25
-        - Content & Substance: X/25
-        - Professionalism: X/20
-        - Body Language: X/15
-        - Vocal Delivery: X/15
-
-        TOTAL SCORE: X/100 (X/10)
+        --- RESPONSE FORMAT ---
+        Respond with a single JSON object and nothing else, with exactly these keys.
+        Scores are numbers; the four feedback keys are arrays of strings (no leading dashes).
 
-        WHAT YOU ARE DOING WELL (be specific, reference exact moments from the transcript):
-        - [Strength 1]
-        - [Strength 2]
+        {REVIEW_JSON_FORMAT}
 
-        WHAT YOU MUST IMPROVE (be direct and actionable, reference exact moments from the transcript):
-        - [Improvement 1 with specific example]
-        - [Improvement 2 with specific example]
-
-        HABITS TO KEEP:
-        - [Specific positive behavior to continue]
-
-        ACTION PLAN FOR NEXT INTERVIEW:
-        - [1-2 concrete things to practice before next interview]
+        Use "{prompt_text}" as question, "{prompt_type}" as type and "{prompt_difficulty}" as difficulty.
         """
         
-        llm_response = llm_client.chat.completions.create(
-            model=OPENAI_CHAT_MODEL,
-            messages=[{"role": "user", "content": prompt}]
+        review = await run_stage(
+            checkpoint, "review", lambda: generate_review(llm_client, prompt, on_stage=on_stage)
         )
-        review = llm_response.choices[0].message.content
+        _notify_stage(on_stage, "reviewed", characters=len(review or ""))
         print("\n===== INTERVIEW ANALYSIS =====", flush=True)
         print(f"TRANSCRIPT: {transcript}", flush=True)
         print(f"\nLLM REVIEW:\n{review}", flush=True)
         print("==============================\n", flush=True)
         
         #------- LLM SEPERATION -------#
-        question = prompt_text
-        type_ = prompt_type
-        difficulty = prompt_difficulty
-        
-        clarity_score = review.split("Communication Clarity: ")[1].split("/25")[0].strip()
-        content_score = review.split("Content & Substance: ")[1].split("/25")[0].strip()
-        professionalism_score = review.split("Professionalism: ")[1].split("/20")[0].strip()
-        body_language_score = review.split("Body Language: ")[1].split("/15")[0].strip()
-        vocal_delivery_score = review.split("Vocal Delivery: ")[1].split("/15")[0].strip()
-        total_score = review.split("TOTAL SCORE: ")[1].split("/100")[0].strip()
-        
-        doing_well = review.split("WHAT YOU ARE DOING WELL")[1].split("WHAT YOU MUST IMPROVE")[0].strip()
-        must_improve = review.split("WHAT YOU MUST IMPROVE")[1].split("HABITS TO KEEP")[0].strip()
-        habits_to_keep = review.split("HABITS TO KEEP")[1].split("ACTION PLAN FOR NEXT INTERVIEW")[0].strip()
-        action_plan = review.split("ACTION PLAN FOR NEXT INTERVIEW")[1].strip()
-        
+        # Never raises: an unparseable review still returns the transcript and
+        # voice analysis (with empty scores) instead of discarding them.
+        raw_review = review or ""
+        parsed_review, review_format = parse_review(raw_review)
+        if parsed_review is None:
+            logger.warning("Interview review could not be parsed; returning it unstructured.")
+            fields = {}
+        else:
+            fields = review_fields(parsed_review)
+            if review_format == "json":
+                review = render_review_text(parsed_review)
+
         return {
             "transcript": transcript,
             "vision_summary": metrics,
             "voice_analysis": voice_analysis,
+            "voice_timeline": voice_timeline,
             "llm_review": review,
-            "question": question,
-            "type": type_,
-            "difficulty": difficulty,
-            "clarity_score": clarity_score,
-            "content_score": content_score,
-            "professionalism_score": professionalism_score,
-            "body_language_score": body_language_score,
-            "vocal_delivery_score": vocal_delivery_score,
-            "total_score": total_score,
-            "doing_well": doing_well,
-            "must_improve": must_improve,
-            "habits_to_keep": habits_to_keep,
-            "action_plan": action_plan
+            "review_format": review_format,
+            "question": prompt_text,
+            "type": prompt_type,
+            "difficulty": prompt_difficulty,
+            "clarity_score": fields.get("clarity_score", ""),
+            "content_score": fields.get("content_score", ""),
+            "professionalism_score": fields.get("professionalism_score", ""),
+            "body_language_score": fields.get("body_language_score", ""),
+            "vocal_delivery_score": fields.get("vocal_delivery_score", ""),
+            "total_score": fields.get("total_score", ""),
+            "doing_well": fields.get("doing_well", ""),
+            "must_improve": fields.get("must_improve", ""),
+            "habits_to_keep": fields.get("habits_to_keep", ""),
+            "action_plan": fields.get("action_plan", ""),
         }
 
     except Exception as e:
         logger.error(f"Error during analysis: {e}")
-        return {
+        error = {
             "error": "analysis_unavailable",
             "detail": str(e),
         }
+        if checkpoint is not None:
+            if "review" not in checkpoint.stages and all(
+                checkpoint.is_settled(stage) for stage in ("transcript", "voice")
+            ):
+                # Failed while preparing the review, outside run_stage: record it, or
+                # the review would look retryable however often a retry fails this way.
+                checkpoint.record_failed("review", str(e) or type(e).__name__, retryable=is_transient_failure(e))
+            error["failed_stages"] = checkpoint.pending_stages()
+        return error
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger("uvicorn.error")
+
+# Memory tier size (entries) and optional on-disk tier. Leave the directory
+# unset to keep the cache purely in memory.
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "512"))
+ANALYSIS_CACHE_DIR = os.getenv("ANALYSIS_CACHE_DIR", "").strip()
+
+
+def audio_digest(audio_bytes: bytes) -> str:
+    return hashlib.sha256(audio_bytes).hexdigest()
+
+
+def cache_key(namespace: str, digest: str, params: Dict[str, Any]) -> str:
+    """
+    Key a cached stage result by audio content plus everything that affects
+    the output (model name, analysis parameters), so changing either misses.
+    """
+    material = json.dumps({"ns": namespace, "audio": digest, "params": params}, sort_keys=True)
+    return f"{namespace}-{hashlib.sha256(material.encode('utf-8')).hexdigest()}"
+
+
+class AnalysisCache:
+    """
+    Two-tier cache for per-recording stage outputs (transcripts, voice features):
+    a bounded in-memory LRU in front of an optional directory of JSON files.
+    """
+
+    def __init__(self, max_entries: int, directory: str = ""):
+        self.max_entries = max(1, max_entries)
+        self.directory = Path(directory) if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "disk_errors": 0,
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get_memory(self, key: str) -> Any:
+        with self._lock:
+            if key not in self._memory:
+                return None
+            self._memory.move_to_end(key)
+            self._counters["memory_hits"] += 1
+            return self._memory[key]
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def get_disk(self, key: str) -> Any:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            self._counters["disk_errors"] += 1
+            logger.warning("Analysis cache read failed for %s: %s", path, exc)
+            return None
+        self._counters["disk_hits"] += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self._remember(key, value)
+        self._counters["stores"] += 1
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(value, default=str), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            self._counters["disk_errors"] += 1
+            logger.warning("Analysis cache write failed for %s: %s", path, exc)
+
+    def record_miss(self) -> None:
+        self._counters["misses"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._memory)
+        lookups = self._counters["memory_hits"] + self._counters["disk_hits"] + self._counters["misses"]
+        hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+        return {
+            "memory_entries": entries,
+            "max_entries": self.max_entries,
+            "disk_dir": str(self.directory) if self.directory is not None else None,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            **self._counters,
+        }
+
+
+_CACHE = AnalysisCache(ANALYSIS_CACHE_MAX_ENTRIES, ANALYSIS_CACHE_DIR)
+
+
+def get_analysis_cache() -> AnalysisCache:
+    return _CACHE
+
+
+async def cached_stage(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    should_store: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """
+    Return the cached value for `key`, or await `compute()` and cache it.
+    Disk I/O runs on a worker thread. `should_store` can veto caching
+    (e.g. error payloads that should be retried next time).
+    """
+    cache = get_analysis_cache()
+    value = cache.get_memory(key)
+    if value is not None:
+        return value
+    if cache.directory is not None:
+        value = await asyncio.to_thread(cache.get_disk, key)
+        if value is not None:
+            return value
+
+    cache.record_miss()
+    value = await compute()
+    if value is not None and (should_store is None or should_store(value)):
+        if cache.directory is not None:
+            await asyncio.to_thread(cache.put, key, value)
+        else:
+            cache.put(key, value)
+    return value
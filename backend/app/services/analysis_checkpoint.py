@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.services.openai_client import is_retryable_error
+from app.services.results_store import load_stages, store_stages
+
+logger = logging.getLogger("uvicorn.error")
+
+# Pipeline stages in dependency order: the review needs both the transcript
+# and the voice analysis, which are independent of each other.
+ANALYSIS_STAGES = ("transcript", "voice", "review")
+STAGE_DEPENDENCIES = {"transcript": (), "voice": (), "review": ("transcript", "voice")}
+
+# Submission fields that are not persisted with the checkpoint because the
+# results store already keeps them as their own parts.
+_SUBMISSION_EXCLUDE = ("interview_timelines",)
+
+
+def is_transient_failure(exc: BaseException) -> bool:
+    """
+    Whether a stage that raised `exc` may succeed if run again: OpenAI
+    connection errors, timeouts, 429 and 5xx, or a voice/PDF worker that
+    died. Anything else fails the same way on the same upload.
+    """
+    if isinstance(exc, (BrokenProcessPool, TimeoutError, ConnectionError)):
+        return True
+    return isinstance(exc, Exception) and is_retryable_error(exc)
+
+
+class StageCheckpoint:
+    """
+    Per-result record of which analysis stages finished and what they
+    produced, written to the results store ("stages" part) after every
+    change. A retry loads it and re-runs only the stages that failed
+    transiently (or never ran), plus anything downstream of them. A stage
+    that failed permanently is settled: re-running it would fail again, so
+    its error value (if it returned one) is reused as is.
+    """
+
+    def __init__(self, result_id: str, submission: Dict[str, Any], stages: Optional[Dict[str, Any]] = None):
+        self.result_id = result_id
+        self.submission = {
+            key: value for key, value in submission.items() if key not in _SUBMISSION_EXCLUDE
+        }
+        self.stages: Dict[str, Dict[str, Any]] = dict(stages or {})
+        self.attempts = 0
+
+    @classmethod
+    def load(cls, result_id: str) -> Optional["StageCheckpoint"]:
+        payload = load_stages(result_id)
+        if not payload:
+            return None
+        checkpoint = cls(result_id, payload.get("submission") or {}, payload.get("stages"))
+        checkpoint.attempts = int(payload.get("attempts") or 0)
+        return checkpoint
+
+    def is_done(self, stage: str) -> bool:
+        return self.stages.get(stage, {}).get("status") == "done"
+
+    def value(self, stage: str) -> Any:
+        return self.stages[stage].get("value") if self.is_done(stage) else None
+
+    def is_settled(self, stage: str) -> bool:
+        """
+        Done, or failed in a way a retry would not fix.
+        """
+        record = self.stages.get(stage, {})
+        return record.get("status") == "done" or (
+            record.get("status") == "failed" and not record.get("retryable", True)
+        )
+
+    def pending_stages(self) -> List[str]:
+        return [stage for stage in ANALYSIS_STAGES if not self.is_done(stage)]
+
+    def retryable_stages(self) -> List[str]:
+        """
+        Stages a retry would run: those not settled, unless they need the
+        output of a stage that failed permanently without producing one.
+        """
+        def blocked(stage: str) -> bool:
+            return any(
+                self.is_settled(upstream) and "value" not in self.stages[upstream]
+                for upstream in STAGE_DEPENDENCIES[stage]
+            )
+
+        return [stage for stage in ANALYSIS_STAGES if not self.is_settled(stage) and not blocked(stage)]
+
+    def failed_stages(self) -> List[str]:
+        return [stage for stage in ANALYSIS_STAGES if self.stages.get(stage, {}).get("status") == "failed"]
+
+    def invalidate(self, stage: str) -> None:
+        """
+        Forget a stage and everything that depends on it.
+        """
+        self.stages.pop(stage, None)
+        for downstream, upstream in STAGE_DEPENDENCIES.items():
+            if stage in upstream:
+                self.invalidate(downstream)
+
+    def record_done(self, stage: str, value: Any) -> None:
+        self.stages[stage] = {"status": "done", "value": value, "at": time.time()}
+        self.save()
+
+    def record_failed(self, stage: str, error: str, retryable: bool, value: Any = None) -> None:
+        record = {"status": "failed", "error": error, "retryable": retryable, "at": time.time()}
+        if value is not None:
+            record["value"] = value
+        self.stages[stage] = record
+        self.save()
+
+    def begin_attempt(self) -> None:
+        self.attempts += 1
+        self.save()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Stage statuses (without the stored values) for API responses.
+        """
+        return {
+            "attempts": self.attempts,
+            "stages": {
+                stage: {
+                    key: item for key, item in self.stages.get(stage, {"status": "pending"}).items()
+                    if key != "value"
+                }
+                for stage in ANALYSIS_STAGES
+            },
+        }
+
+    def save(self) -> None:
+        store_stages(
+            self.result_id,
+            {"submission": self.submission, "stages": self.stages, "attempts": self.attempts},
+        )
+
+
+async def run_stage(
+    checkpoint: Optional[StageCheckpoint],
+    stage: str,
+    compute: Callable[[], Awaitable[Any]],
+    failed: Callable[[Any], bool] = lambda value: False,
+) -> Any:
+    """
+    Return the checkpointed value of `stage` if it is settled, else await
+    `compute()` and record the outcome. An exception marks the stage failed
+    and is re-raised; a retry runs the stage again only if the exception was
+    transient. A value for which `failed(value)` is true is an error the
+    stage handled itself (no speech, no ffmpeg, undecodable audio): it is
+    recorded as a permanent failure and returned as is.
+    """
+    if checkpoint is not None and checkpoint.is_settled(stage):
+        record = checkpoint.stages[stage]
+        if "value" not in record:
+            raise RuntimeError(f"'{stage}' stage failed permanently: {record.get('error')}")
+        logger.info("Reusing checkpointed '%s' stage for result %s", stage, checkpoint.result_id)
+        return record["value"]
+    try:
+        value = await compute()
+    except Exception as exc:
+        if checkpoint is not None:
+            checkpoint.record_failed(stage, str(exc) or type(exc).__name__, retryable=is_transient_failure(exc))
+        raise
+    if checkpoint is not None:
+        if failed(value):
+            error = value.get("error") if isinstance(value, dict) else None
+            checkpoint.record_failed(stage, str(error or "stage returned an error"), retryable=False, value=value)
+        else:
+            checkpoint.record_done(stage, value)
+    return value
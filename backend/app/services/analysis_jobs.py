@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger("uvicorn.error")
+
+# How many analyses run at once, and how many may wait behind them before
+# new submissions are rejected with 429.
+ANALYZE_JOB_CONCURRENCY = int(os.getenv("ANALYZE_JOB_CONCURRENCY", "2"))
+ANALYZE_JOB_QUEUE_SIZE = int(os.getenv("ANALYZE_JOB_QUEUE_SIZE", "16"))
+# Finished jobs are kept this long so clients can still poll for the result.
+ANALYZE_JOB_TTL_SECONDS = int(os.getenv("ANALYZE_JOB_TTL_SECONDS", "3600"))
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+# High-volume events (one per streamed review token) that the SSE stream
+# carries but the polled job summary leaves out.
+STREAM_ONLY_STAGES = ("review_delta",)
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when the analysis queue cannot accept another job."""
+
+
+class AnalysisJob:
+    """
+    One queued /analyze run plus the progress events it has emitted so far.
+    """
+
+    def __init__(self, runner: Callable[["AnalysisJob"], Awaitable[Dict[str, Any]]]):
+        self.id = uuid.uuid4().hex
+        self.status = "queued"
+        self.stage = "queued"
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self._runner = runner
+        self._changed = asyncio.Event()
+        self.emit("queued")
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def emit(self, stage: str, details: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record a progress event and wake any SSE subscribers.
+        """
+        self.stage = stage
+        self.updated_at = time.time()
+        self.events.append(
+            {
+                "seq": len(self.events),
+                "stage": stage,
+                "status": self.status,
+                "at": self.updated_at,
+                "details": dict(details or {}),
+            }
+        )
+        self._changed.set()
+
+    async def wait_for_event(self, seen: int) -> None:
+        while len(self.events) <= seen and not self.done:
+            self._changed.clear()
+            await self._changed.wait()
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "events": [
+                event["stage"] for event in self.events if event["stage"] not in STREAM_ONLY_STAGES
+            ],
+        }
+        if self.error:
+            payload["error"] = self.error
+        if include_result and self.result is not None:
+            payload["result"] = self.result
+        return payload
+
+
+class AnalysisJobQueue:
+    """
+    Bounded in-process queue drained by a fixed number of worker tasks.
+    """
+
+    def __init__(self, concurrency: int, max_queued: int, ttl_seconds: int):
+        self.concurrency = max(1, concurrency)
+        self.max_queued = max(1, max_queued)
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"analysis-job-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+
+    def submit(self, runner: Callable[[AnalysisJob], Awaitable[Dict[str, Any]]]) -> AnalysisJob:
+        """
+        Enqueue a job; raises JobQueueFullError when the backlog is full.
+        """
+        self.start()
+        self._prune()
+        job = AnalysisJob(runner)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as exc:
+            raise self._full_error() from exc
+        self._jobs[job.id] = job
+        return job
+
+    def check_capacity(self) -> None:
+        """
+        Raise JobQueueFullError if submit() would, so callers can refuse a
+        job before doing any work for it.
+        """
+        if self._queue is not None and self._queue.full():
+            raise self._full_error()
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "max_queued": self.max_queued,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "tracked_jobs": len(self._jobs),
+        }
+
+    def _full_error(self) -> JobQueueFullError:
+        return JobQueueFullError(f"Analysis queue is full ({self.max_queued} waiting). Retry shortly.")
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: AnalysisJob) -> None:
+        job.status = "running"
+        job.emit("started")
+        try:
+            job.result = await job._runner(job)
+            job.status = "succeeded"
+            job.emit("completed")
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "cancelled"
+            job.emit("failed", {"error": job.error})
+            raise
+        except Exception as exc:
+            logger.exception("Analysis job %s failed", job.id)
+            job.status = "failed"
+            job.error = str(exc)
+            job.emit("failed", {"error": job.error})
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.done and job.updated_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+_JOB_QUEUE = AnalysisJobQueue(
+    concurrency=ANALYZE_JOB_CONCURRENCY,
+    max_queued=ANALYZE_JOB_QUEUE_SIZE,
+    ttl_seconds=ANALYZE_JOB_TTL_SECONDS,
+)
+
+
+def get_job_queue() -> AnalysisJobQueue:
+    return _JOB_QUEUE
+
+
+async def iter_job_events(job: AnalysisJob) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield every event for a job (replaying ones already emitted) until it finishes.
+    """
+    seen = 0
+    while True:
+        while seen < len(job.events):
+            yield job.events[seen]
+            seen += 1
+        if job.done:
+            return
+        await job.wait_for_event(seen)
@@ -1,7 +1,14 @@
 import json
-from typing import Any, Dict, Tuple
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
-from app.services.results_store import store_latest_audio, store_latest_timelines
+from app.services.results_store import result_location, store_audio, store_timelines
+from app.services.voice_analysis import PcmBuffer, decode_stream_to_pcm, estimate_pcm_capacity
+from app.services.voice_pool import new_pcm_buffer
+
+logger = logging.getLogger("uvicorn.error")
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
 
 def parse_vision_metrics(raw: str) -> Dict[str, Any]:
     if not raw:
@@ -20,36 +27,118 @@ def parse_json_field(raw: str) -> Dict[str, Any]:
     except Exception:
         return {"parse_error": True, "raw": raw}
 
-async def read_upload_bytes(upload_file) -> Tuple[int, str, str, bytes]:
+async def read_upload_audio(upload_file) -> Tuple[int, str, str, bytearray, Optional[PcmBuffer]]:
     """
-    Returns (byte_count, filename, content_type, raw_bytes)
+    Read the upload as read_upload_bytes does while feeding each chunk to
+    ffmpeg as soon as it is read, so decoding to float32 PCM overlaps
+    reading the part instead of starting after it. (Starlette spools the
+    multipart body before the endpoint runs, so this overlaps reading the
+    spooled part, not the network transfer.)
+    Returns (byte_count, filename, content_type, raw_bytes, pcm_buffer);
+    pcm_buffer is None when decoding failed (the analysis retries from raw_bytes).
+    """
+    upload_size = getattr(upload_file, "size", None) or 0
+    data = bytearray(upload_size)
+    filled = 0
+    read_error: Optional[BaseException] = None
+
+    async def upload_chunks() -> AsyncIterator[bytes]:
+        nonlocal filled, read_error
+        while True:
+            try:
+                chunk = await upload_file.read(UPLOAD_CHUNK_BYTES)
+            except Exception as exc:
+                read_error = exc
+                raise
+            if not chunk:
+                return
+            data[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+            yield chunk
+
+    buffer = new_pcm_buffer(estimate_pcm_capacity(upload_size))
+    pcm: Optional[PcmBuffer] = buffer
+    chunks = upload_chunks()
+    try:
+        await decode_stream_to_pcm(chunks, buffer)
+    except Exception as exc:
+        buffer.close()
+        if read_error is not None:
+            # The upload itself could not be read: there is nothing to analyse.
+            raise read_error
+        logger.warning(f"Streaming audio decode failed: {exc}")
+        pcm = None
+        # ffmpeg missing or crashed early: the rest of the upload is still needed.
+        async for _ in chunks:
+            pass
+    del data[filled:]
+    return (filled, upload_file.filename, upload_file.content_type or "", data, pcm)
+
+
+async def read_upload_bytes(upload_file) -> Tuple[int, str, str, bytearray]:
     """
-    data = await upload_file.read()
-    return (len(data), upload_file.filename, upload_file.content_type or "", data)
+    Read the encoded upload into one buffer, preallocated from the size of
+    the multipart part so no chunk list is kept next to it. The buffer is
+    handed on as is (hashing, storage, ffmpeg and Whisper all take any
+    bytes-like object) rather than copied into bytes.
+    Returns (byte_count, filename, content_type, raw_bytes).
+    """
+    data = bytearray(getattr(upload_file, "size", None) or 0)
+    filled = 0
+    while True:
+        chunk = await upload_file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        # Grows the buffer if the part was larger than announced.
+        data[filled:filled + len(chunk)] = chunk
+        filled += len(chunk)
+    del data[filled:]
+    return (filled, upload_file.filename, upload_file.content_type or "", data)
+
+
+async def decode_upload_audio(raw_bytes) -> Optional[PcmBuffer]:
+    """
+    Stream an upload that was already read (read_upload_bytes) through
+    ffmpeg chunk by chunk, decoding to float32 PCM. Used by job-mode
+    analyses, which decode on the job worker. None when decoding failed
+    (the analysis retries from raw_bytes).
+    """
+    async def upload_chunks() -> AsyncIterator[memoryview]:
+        view = memoryview(raw_bytes)
+        for start in range(0, len(view), UPLOAD_CHUNK_BYTES):
+            yield view[start:start + UPLOAD_CHUNK_BYTES]
+
+    buffer = new_pcm_buffer(estimate_pcm_capacity(len(raw_bytes)))
+    try:
+        return await decode_stream_to_pcm(upload_chunks(), buffer)
+    except Exception as exc:
+        logger.warning(f"Streaming audio decode failed: {exc}")
+        buffer.close()
+        return None
 
 
-def save_upload_bytes(raw_bytes: bytes, original_filename: str) -> str:
+def save_upload_bytes(raw_bytes: bytes, original_filename: str, result_id: str) -> str:
     """
-    Store uploaded audio bytes in backend memory and return a logical handle.
+    Store uploaded audio bytes in the results store under a result id and return a logical handle.
     """
     metadata: Dict[str, Any] = {
         "filename": original_filename or "",
         "byte_count": len(raw_bytes),
         "raw_bytes": raw_bytes,
     }
-    store_latest_audio(metadata)
+    store_audio(result_id, metadata)
     # Return a logical (non-filesystem) identifier to keep the API shape.
-    return "in_memory:Interview-Audio"
+    return result_location(result_id, "Interview-Audio")
 
 
-def save_json_payload(payload: Dict[str, Any], output_name: str) -> str:
+def save_json_payload(payload: Dict[str, Any], output_name: str, result_id: str) -> str:
     """
-    Store an arbitrary JSON payload in backend memory and return a logical handle.
+    Store an arbitrary JSON payload in the results store and return a logical handle.
     """
     # For now we treat "results.json" as the canonical source for interview timelines.
     # Avoid overwriting timeline state for other logical JSON outputs.
     if output_name == "results.json":
         # Store timelines separately so they can be fetched without the full results object.
-        store_latest_timelines(payload)
+        store_timelines(result_id, payload)
 
-    return f"in_memory:{output_name}"
+    return result_location(result_id, output_name)
@@ -5,8 +5,9 @@ import re
 from typing import Any
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 
+from app.services.openai_client import call_with_retries, get_openai_client
 from app.services.prompt_store import normalize_difficulty, normalize_prompt_type
 
 load_dotenv()
@@ -15,11 +16,11 @@ logger = logging.getLogger("uvicorn.error")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
 
-def _openai_client() -> OpenAI:
-    api_key = os.getenv("OPENAI_API_KEY") or os.getenv("OPEN_AI_API_KEY")
-    if not api_key:
+def _openai_client() -> AsyncOpenAI:
+    client = get_openai_client()
+    if client is None:
         raise ValueError("Missing OPENAI_API_KEY or OPEN_AI_API_KEY for prompt generation.")
-    return OpenAI(api_key=api_key)
+    return client
 
 
 def _extract_json_object(raw_text: str) -> dict[str, Any]:
@@ -58,7 +59,7 @@ def _coerce_string_list(value: Any, fallback: list[str]) -> list[str]:
     return cleaned[:5] or fallback
 
 
-def generate_prompt_from_job_ad_with_openai(
+async def generate_prompt_from_job_ad_with_openai(
     *,
     job_url: str,
     job_title: str,
@@ -125,14 +126,17 @@ Job Ad Text (truncated):
     last_error: Exception | None = None
     for model_name in model_candidates:
         try:
-            response = client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.4,
-                response_format={"type": "json_object"},
+            response = await call_with_retries(
+                lambda: client.chat.completions.create(
+                    model=model_name,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    temperature=0.4,
+                    response_format={"type": "json_object"},
+                ),
+                operation=f"job-ad prompt ({model_name})",
             )
             content = response.choices[0].message.content if response.choices else ""
             chosen_model = model_name
@@ -141,13 +145,16 @@ Job Ad Text (truncated):
             last_error = exc
             logger.warning("OpenAI request failed for model '%s': %s", model_name, exc)
             try:
-                response = client.chat.completions.create(
-                    model=model_name,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    temperature=0.4,
+                response = await call_with_retries(
+                    lambda: client.chat.completions.create(
+                        model=model_name,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        temperature=0.4,
+                    ),
+                    operation=f"job-ad prompt ({model_name})",
                 )
                 content = response.choices[0].message.content if response.choices else ""
                 chosen_model = model_name
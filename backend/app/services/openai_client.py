@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+import openai
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+load_dotenv()
+logger = logging.getLogger("uvicorn.error")
+
+# One AsyncOpenAI client (and so one keep-alive connection pool) for the whole
+# app: Whisper, the interview review and job-ad prompt generation share it.
+OPENAI_CONNECT_TIMEOUT_SEC = float(os.getenv("OPENAI_CONNECT_TIMEOUT_SEC", "5"))
+# Whisper on a long chunk and a long review completion both need a generous read timeout.
+OPENAI_READ_TIMEOUT_SEC = float(os.getenv("OPENAI_READ_TIMEOUT_SEC", "120"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10"))
+OPENAI_KEEPALIVE_EXPIRY_SEC = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY_SEC", "60"))
+
+# Retries: at most OPENAI_MAX_RETRIES per call, with full-jitter exponential
+# backoff, and across all calls no more retries than OPENAI_RETRY_BUDGET_RATIO
+# of recent requests (plus a small floor), so an outage does not turn every
+# request into several.
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+OPENAI_RETRY_BUDGET_RATIO = float(os.getenv("OPENAI_RETRY_BUDGET_RATIO", "0.2"))
+OPENAI_RETRY_MIN_PER_SEC = float(os.getenv("OPENAI_RETRY_MIN_PER_SEC", "1"))
+OPENAI_RETRY_BASE_DELAY_SEC = 0.5
+OPENAI_RETRY_MAX_DELAY_SEC = 8.0
+_RETRY_BUDGET_WINDOW_SEC = 10.0
+
+_RETRYABLE_STATUS = {408, 409, 429}
+
+T = TypeVar("T")
+
+
+def openai_api_key() -> Optional[str]:
+    return os.getenv("OPENAI_API_KEY") or os.getenv("OPEN_AI_API_KEY")
+
+
+class RetryBudget:
+    """
+    Sliding-window retry budget shared by every OpenAI call: retries are
+    allowed while they stay under `ratio` of the requests seen in the last
+    `window` seconds, with a floor of `min_per_sec` so a quiet process can
+    still retry a one-off failure.
+    """
+
+    def __init__(self, ratio: float, min_per_sec: float, window: float = _RETRY_BUDGET_WINDOW_SEC):
+        self.ratio = ratio
+        self.min_per_sec = min_per_sec
+        self.window = window
+        self._requests: "deque[float]" = deque()
+        self._retries: "deque[float]" = deque()
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "retries_denied": 0}
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window
+        for events in (self._requests, self._retries):
+            while events and events[0] < cutoff:
+                events.popleft()
+
+    def record_request(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            self._requests.append(now)
+            self._counters["requests"] += 1
+
+    def try_spend(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            allowed = max(self.min_per_sec * self.window, self.ratio * len(self._requests))
+            if len(self._retries) >= allowed:
+                self._counters["retries_denied"] += 1
+                return False
+            self._retries.append(now)
+            self._counters["retries"] += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._trim(time.monotonic())
+            return {
+                "window_sec": self.window,
+                "window_requests": len(self._requests),
+                "window_retries": len(self._retries),
+                **self._counters,
+            }
+
+
+_RETRY_BUDGET = RetryBudget(OPENAI_RETRY_BUDGET_RATIO, OPENAI_RETRY_MIN_PER_SEC)
+_CLIENT: Optional[AsyncOpenAI] = None
+
+
+def _build_client(api_key: str) -> AsyncOpenAI:
+    timeout = httpx.Timeout(
+        OPENAI_READ_TIMEOUT_SEC,
+        connect=OPENAI_CONNECT_TIMEOUT_SEC,
+    )
+    http_client = openai.DefaultAsyncHttpxClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY_SEC,
+        ),
+    )
+    # SDK-level retries are off; call_with_retries applies the shared budget instead.
+    return AsyncOpenAI(api_key=api_key, http_client=http_client, timeout=timeout, max_retries=0)
+
+
+def get_openai_client() -> Optional[AsyncOpenAI]:
+    """
+    The app-wide AsyncOpenAI client, created on first use (normally by the
+    lifespan at startup). None when no API key is configured.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        api_key = openai_api_key()
+        if not api_key:
+            return None
+        _CLIENT = _build_client(api_key)
+    return _CLIENT
+
+
+def start_openai_client() -> Optional[AsyncOpenAI]:
+    client = get_openai_client()
+    if client is None:
+        logger.warning("OPENAI_API_KEY is not set; transcription and reviews are unavailable.")
+    return client
+
+
+async def close_openai_client() -> None:
+    """
+    Close the shared client's connection pool; called from the app lifespan on shutdown.
+    """
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.close()
+        _CLIENT = None
+
+
+def is_retryable_error(exc: Exception) -> bool:
+    """
+    Whether an OpenAI call that raised `exc` may succeed if made again.
+    """
+    if isinstance(exc, openai.APIConnectionError):
+        # Includes APITimeoutError.
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in _RETRYABLE_STATUS or exc.status_code >= 500
+    return False
+
+
+def _retry_delay(attempt: int, exc: Exception) -> float:
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(OPENAI_RETRY_MAX_DELAY_SEC, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    ceiling = min(OPENAI_RETRY_MAX_DELAY_SEC, OPENAI_RETRY_BASE_DELAY_SEC * (2 ** (attempt - 1)))
+    return random.uniform(0.0, ceiling)
+
+
+async def call_with_retries(call: Callable[[], Awaitable[T]], operation: str = "openai") -> T:
+    """
+    Await `call()` and retry transient failures (connection errors, timeouts,
+    429 and 5xx) with jittered backoff, while the shared budget allows.
+    `call` must build a fresh request each time (e.g. re-create upload buffers).
+    """
+    _RETRY_BUDGET.record_request()
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except Exception as exc:
+            attempt += 1
+            if not is_retryable_error(exc) or attempt > OPENAI_MAX_RETRIES or not _RETRY_BUDGET.try_spend():
+                raise
+            delay = _retry_delay(attempt, exc)
+            logger.warning(
+                "%s failed (%s); retry %s/%s in %.2fs",
+                operation, exc, attempt, OPENAI_MAX_RETRIES, delay,
+            )
+            await asyncio.sleep(delay)
+
+
+def openai_client_stats() -> Dict[str, Any]:
+    return {
+        "configured": openai_api_key() is not None,
+        "max_connections": OPENAI_MAX_CONNECTIONS,
+        "max_keepalive_connections": OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        "connect_timeout_sec": OPENAI_CONNECT_TIMEOUT_SEC,
+        "read_timeout_sec": OPENAI_READ_TIMEOUT_SEC,
+        "max_retries": OPENAI_MAX_RETRIES,
+        "retry_budget": _RETRY_BUDGET.stats(),
+    }
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import zipfile
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.services.pdf_pool import PDF_POOL_WORKERS, cached_interview_pdf
+from app.services.pdf_report import pdf_etag
+from app.services.results_store import load_results, load_timelines
+from app.services.timeline_arrays import TimelineSeries
+from app.services.timeline_downsample import TIMELINE_CHART_MAX_POINTS, downsampled_timeline
+
+logger = logging.getLogger("uvicorn.error")
+
+# Most result ids a single bulk export may ask for.
+PDF_EXPORT_MAX_RESULTS = int(os.getenv("PDF_EXPORT_MAX_RESULTS", "200"))
+# Reports of one export loaded and rendering at a time: enough to keep every
+# PDF worker busy with one more queued, without loading a whole cohort's
+# results up front.
+PDF_EXPORT_CONCURRENCY = int(os.getenv("PDF_EXPORT_CONCURRENCY", str(max(2, 2 * PDF_POOL_WORKERS))))
+
+ReportInputs = Tuple[str, Dict[str, Any], Optional[TimelineSeries], Optional[TimelineSeries]]
+
+
+def load_report_inputs(result_id: str) -> Optional[ReportInputs]:
+    """
+    What the report for `result_id` is rendered from: (result id, stored
+    results, eye and posture timelines downsampled for charting). None if
+    there are no results for it.
+    """
+    data = load_results(result_id)
+    if not data:
+        return None
+    timelines = load_timelines(result_id)
+    # Charts plot at most TIMELINE_CHART_MAX_POINTS points per series, however long the interview.
+    eye_timeline = downsampled_timeline(
+        result_id, "eye_timeline", timelines.get("eye_timeline", []), TIMELINE_CHART_MAX_POINTS
+    )
+    posture_timeline = downsampled_timeline(
+        result_id, "posture_timeline", timelines.get("posture_timeline", []), TIMELINE_CHART_MAX_POINTS
+    )
+    return result_id, data, eye_timeline, posture_timeline
+
+
+def report_filename(result_id: str) -> str:
+    return f"interview-{re.sub(r'[^A-Za-z0-9_.-]', '_', result_id)}.pdf"
+
+
+def unique_report_filenames(result_ids: List[str]) -> Dict[str, str]:
+    """
+    A distinct zip entry name per result id. Sanitizing is many-to-one
+    ("a/b" and "a_b" both give interview-a_b.pdf), so an id that had to be
+    sanitized gets a short hash of the raw id appended, and any name still
+    taken gets a counter.
+    """
+    names: Dict[str, str] = {}
+    used = set()
+    for result_id in result_ids:
+        name = report_filename(result_id)
+        if name != f"interview-{result_id}.pdf":
+            digest = hashlib.sha256(result_id.encode("utf-8")).hexdigest()[:8]
+            name = f"{name[:-len('.pdf')]}-{digest}.pdf"
+        candidate, counter = name, 1
+        while candidate in used:
+            counter += 1
+            candidate = f"{name[:-len('.pdf')]}-{counter}.pdf"
+        used.add(candidate)
+        names[result_id] = candidate
+    return names
+
+
+class _ZipChunks(io.RawIOBase):
+    """
+    Write-only, unseekable sink for zipfile. zipfile then writes each entry's
+    sizes in a data descriptor after it instead of seeking back, so whatever
+    it has written can be handed to the client and dropped as entries finish.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _export_one(result_id: str, semaphore: asyncio.Semaphore) -> Tuple[str, Optional[bytes], Optional[str]]:
+    async with semaphore:
+        try:
+            inputs = await asyncio.to_thread(load_report_inputs, result_id)
+            if inputs is None:
+                return result_id, None, "No results found."
+            report_result_id, data, eye_timeline, posture_timeline = inputs
+            etag = await asyncio.to_thread(pdf_etag, data, eye_timeline, posture_timeline)
+            pdf_bytes, _ = await cached_interview_pdf(report_result_id, etag, data, eye_timeline, posture_timeline)
+            return result_id, pdf_bytes, None
+        except Exception as exc:
+            logger.exception("Bulk PDF export failed for result %s", result_id)
+            return result_id, None, str(exc)
+
+
+async def stream_reports_zip(result_ids: List[str]) -> AsyncIterator[bytes]:
+    """
+    A zip of the reports for `result_ids`, yielded entry by entry in the
+    order the reports finish. Reports render on the PDF worker pool and go
+    through the same per-result cache as single downloads, so reports that
+    were already downloaded are not rendered again. Repeated ids are
+    exported once. The archive ends with manifest.json listing each
+    requested id with its file name (see unique_report_filenames) or the
+    error that kept it out.
+    """
+    result_ids = list(dict.fromkeys(result_ids))
+    filenames = unique_report_filenames(result_ids)
+    semaphore = asyncio.Semaphore(max(1, PDF_EXPORT_CONCURRENCY))
+    tasks = [asyncio.create_task(_export_one(result_id, semaphore)) for result_id in result_ids]
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    sink = _ZipChunks()
+    try:
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            # PDF content streams are already deflated; storing them keeps the event loop free.
+            for finished in asyncio.as_completed(tasks):
+                result_id, pdf_bytes, error = await finished
+                if pdf_bytes is None:
+                    outcomes[result_id] = {"result_id": result_id, "error": error}
+                    continue
+                filename = filenames[result_id]
+                archive.writestr(filename, pdf_bytes)
+                outcomes[result_id] = {"result_id": result_id, "file": filename, "bytes": len(pdf_bytes)}
+                yield sink.drain()
+            manifest = [outcomes[result_id] for result_id in result_ids]
+            archive.writestr("manifest.json", json.dumps({"reports": manifest}, indent=2))
+        yield sink.drain()
+    finally:
+        # Client went away mid-stream: drop the reports it will never receive.
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.pdf_report import build_interview_pdf
+from app.services.results_store import load_pdf, store_pdf
+from app.services.timeline_arrays import TimelineSeries
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _default_worker_count() -> int:
+    return max(1, min(2, (os.cpu_count() or 2) - 1))
+
+
+# Number of dedicated PDF rendering processes. 0 renders on a thread in the
+# API process instead (one report at a time; reportlab keeps module-level
+# font and layout caches).
+PDF_POOL_WORKERS = int(os.getenv("PDF_POOL_WORKERS", str(_default_worker_count())))
+
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_THREAD_RENDER_LOCK = threading.Lock()
+# Renders in progress per (result id, etag), so concurrent downloads of the
+# same report share one render.
+_IN_FLIGHT: Dict[Tuple[str, str], "asyncio.Future[bytes]"] = {}
+
+
+def _warm_worker() -> None:
+    """
+    Process initializer: render a small report once so reportlab's modules
+    and font metrics are loaded before the first download.
+    """
+    series = TimelineSeries([0.0, 1.0], [50.0, 60.0])
+    build_interview_pdf({"llm_review": "WARM UP"}, series, series)
+
+
+def _ping() -> bool:
+    return True
+
+
+def _log_ping_failure(future: Future) -> None:
+    # Runs on the executor's management thread once the warm-up ping settles.
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        logger.error("PDF rendering pool worker failed to start: %r", exc)
+
+
+def start_pdf_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Create the PDF rendering process pool (idempotent) and spawn its workers
+    so they warm up in the background.
+    """
+    global _PDF_POOL
+    if _PDF_POOL is not None or PDF_POOL_WORKERS <= 0:
+        return _PDF_POOL
+
+    _PDF_POOL = ProcessPoolExecutor(
+        max_workers=PDF_POOL_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_worker,
+    )
+    # Workers are spawned on demand; submit one no-op per slot to start them now.
+    # A worker that dies while warming up breaks the pool; log it rather than
+    # dropping the ping's exception (the next render then recreates the pool).
+    for _ in range(PDF_POOL_WORKERS):
+        _PDF_POOL.submit(_ping).add_done_callback(_log_ping_failure)
+    logger.info("PDF rendering pool started with %s workers", PDF_POOL_WORKERS)
+    return _PDF_POOL
+
+
+def _replace_broken_pool(broken: ProcessPoolExecutor) -> Optional[ProcessPoolExecutor]:
+    """
+    Discard a pool whose worker died (crash, OOM kill) and start a fresh one.
+    Callers that hit the same broken pool concurrently all get the one
+    replacement.
+    """
+    global _PDF_POOL
+    if _PDF_POOL is broken:
+        _PDF_POOL = None
+        broken.shutdown(wait=False, cancel_futures=True)
+        logger.warning("PDF rendering pool broke (a worker died); starting a new one")
+    return start_pdf_pool()
+
+
+def shutdown_pdf_pool() -> None:
+    global _PDF_POOL
+    if _PDF_POOL is None:
+        return
+    _PDF_POOL.shutdown(wait=True, cancel_futures=True)
+    _PDF_POOL = None
+
+
+def _render_on_thread(*args: Any) -> bytes:
+    with _THREAD_RENDER_LOCK:
+        return build_interview_pdf(*args)
+
+
+async def render_interview_pdf(
+    data: Dict[str, Any],
+    eye_timeline: Optional[TimelineSeries],
+    posture_timeline: Optional[TimelineSeries],
+) -> bytes:
+    """
+    Build the report on the process pool, keeping reportlab off the event
+    loop. Falls back to a worker thread when the pool is disabled. If the
+    pool is broken (a worker died) it is replaced and the render retried
+    once; a second failure is raised.
+    """
+    pool = start_pdf_pool()
+    if pool is None:
+        return await asyncio.to_thread(_render_on_thread, data, eye_timeline, posture_timeline)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, build_interview_pdf, data, eye_timeline, posture_timeline)
+    except BrokenProcessPool:
+        pool = _replace_broken_pool(pool)
+        return await loop.run_in_executor(pool, build_interview_pdf, data, eye_timeline, posture_timeline)
+
+
+async def cached_interview_pdf(
+    result_id: str,
+    etag: str,
+    data: Dict[str, Any],
+    eye_timeline: Optional[TimelineSeries],
+    posture_timeline: Optional[TimelineSeries],
+) -> Tuple[bytes, bool]:
+    """
+    The report for `result_id` as (pdf bytes, served from cache). The bytes
+    are stored in the results store next to the result, tagged with `etag`;
+    a stored PDF whose etag no longer matches the result is rendered again.
+    """
+    cached = await asyncio.to_thread(load_pdf, result_id)
+    if cached and cached.get("etag") == etag and cached.get("raw_bytes"):
+        return cached["raw_bytes"], True
+
+    key = (result_id, etag)
+    pending = _IN_FLIGHT.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending), False
+
+    future: "asyncio.Future[bytes]" = asyncio.get_running_loop().create_future()
+    _IN_FLIGHT[key] = future
+    try:
+        pdf_bytes = await render_interview_pdf(data, eye_timeline, posture_timeline)
+        store_pdf(result_id, {"etag": etag, "raw_bytes": pdf_bytes})
+        future.set_result(pdf_bytes)
+        return pdf_bytes, False
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        # Waiters re-raise it; mark it retrieved so an unawaited future does not warn.
+        future.exception()
+        raise
+    finally:
+        _IN_FLIGHT.pop(key, None)
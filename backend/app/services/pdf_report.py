@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from reportlab.graphics.shapes import Drawing, Group, Line, PolyLine, Polygon, Rect, String
+from reportlab.lib import colors
+from reportlab.platypus import Flowable, Paragraph
+from reportlab.lib.units import inch
+
+from app.services.pdf_template import REPORT_TEMPLATE, ReportTemplate
+from app.services.timeline_arrays import TimelineSeries, as_series
+
+# Bump when the report layout changes so cached PDFs (and client ETags) are
+# not reused for the old layout.
+PDF_REPORT_VERSION = "2"
+
+
+# Timeline chart geometry (points) and colours.
+CHART_WIDTH = 6.5 * inch
+CHART_HEIGHT = 2.3 * inch
+CHART_MARGIN_LEFT = 42
+CHART_MARGIN_RIGHT = 12
+CHART_MARGIN_BOTTOM = 30
+CHART_MARGIN_TOP = 24
+CHART_Y_MAX = 105.0
+CHART_TEXT_COLOR = colors.HexColor("#333333")
+CHART_AXIS_COLOR = colors.HexColor("#999999")
+CHART_GRID_COLOR = colors.HexColor("#e3e3e3")
+
+
+def _tick_step(span: float, target_ticks: int = 6) -> float:
+    """
+    A 1/2/2.5/5 x 10^n step giving about `target_ticks` ticks over `span`.
+    """
+    raw = span / target_ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for multiple in (1, 2, 2.5, 5, 10):
+        if raw <= multiple * magnitude:
+            return multiple * magnitude
+    return 10 * magnitude
+
+
+def generate_timeline_chart(data, title: str, color: str) -> Optional[Drawing]:
+    """
+    Draw a timeline as reportlab vector graphics (a Drawing flowable): the
+    series as a polyline over a translucent fill, with a 0-100% score axis
+    and a time axis in seconds. Coordinates are mapped with numpy in one
+    pass; pass downsampled series (TIMELINE_CHART_MAX_POINTS) for long
+    interviews. None if there is nothing to plot.
+    """
+    series = as_series(data)
+    if series is None or not len(series):
+        return None
+    times = series.timestamps.astype(np.float64)
+    scores = series.values.astype(np.float64)
+    if times.size == 1:
+        times = np.append(times, times[0])
+        scores = np.append(scores, scores[0])
+
+    left, bottom = CHART_MARGIN_LEFT, CHART_MARGIN_BOTTOM
+    plot_width = CHART_WIDTH - CHART_MARGIN_LEFT - CHART_MARGIN_RIGHT
+    plot_height = CHART_HEIGHT - CHART_MARGIN_BOTTOM - CHART_MARGIN_TOP
+    start, end = float(times.min()), float(times.max())
+    span = end - start if end > start else 1.0
+    line_color = colors.HexColor(color)
+
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    drawing.add(String(
+        CHART_WIDTH / 2, CHART_HEIGHT - 14, title,
+        fontName="Helvetica-Bold", fontSize=11, fillColor=CHART_TEXT_COLOR, textAnchor="middle",
+    ))
+
+    for score in range(0, 101, 20):
+        y = bottom + score / CHART_Y_MAX * plot_height
+        drawing.add(Line(left, y, left + plot_width, y, strokeColor=CHART_GRID_COLOR, strokeWidth=0.5))
+        drawing.add(String(left - 4, y - 2.5, str(score), fontSize=7, fillColor=CHART_TEXT_COLOR, textAnchor="end"))
+
+    step = _tick_step(span)
+    for tick in np.arange(math.ceil(start / step) * step, end + step * 1e-6, step):
+        x = left + (tick - start) / span * plot_width
+        drawing.add(Line(x, bottom, x, bottom + plot_height, strokeColor=CHART_GRID_COLOR, strokeWidth=0.5))
+        drawing.add(String(x, bottom - 10, f"{tick:g}", fontSize=7, fillColor=CHART_TEXT_COLOR, textAnchor="middle"))
+
+    xs = left + (times - start) / span * plot_width
+    ys = bottom + np.clip(scores, 0.0, CHART_Y_MAX) / CHART_Y_MAX * plot_height
+    points = np.column_stack((xs, ys)).ravel().tolist()
+    drawing.add(Polygon(
+        points + [float(xs[-1]), bottom, float(xs[0]), bottom],
+        fillColor=line_color, fillOpacity=0.15, strokeColor=None, strokeWidth=0,
+    ))
+    drawing.add(PolyLine(points, strokeColor=line_color, strokeWidth=1.5, strokeLineJoin=1))
+    drawing.add(Rect(left, bottom, plot_width, plot_height, fillColor=None, strokeColor=CHART_AXIS_COLOR, strokeWidth=0.75))
+
+    drawing.add(String(
+        left + plot_width / 2, 4, "Time (s)", fontSize=9, fillColor=CHART_TEXT_COLOR, textAnchor="middle",
+    ))
+    y_label = Group(String(0, 0, "Score (%)", fontSize=9, fillColor=CHART_TEXT_COLOR, textAnchor="middle"))
+    # Rotate 90 degrees counter-clockwise and place it left of the tick labels.
+    y_label.transform = (0, 1, -1, 0, 12, bottom + plot_height / 2)
+    drawing.add(y_label)
+    return drawing
+
+
+def build_report_story(
+    data: Dict[str, Any],
+    eye_timeline: Optional[TimelineSeries],
+    posture_timeline: Optional[TimelineSeries],
+    template: ReportTemplate = REPORT_TEMPLATE,
+) -> List[Flowable]:
+    """
+    The report's flowables for one stored result. Pure: reads `data` and the
+    timelines, never mutates them, and takes all styles and static furniture
+    from `template`.
+    """
+    story: List[Flowable] = list(template.header)
+
+    # Vision Scores
+    vision = data.get("vision_summary", {})
+    if vision:
+        story.append(Paragraph("Body Language Scores", template.heading_style))
+        story.append(Paragraph("Posture Score", template.label_style))
+        story.append(Paragraph(f"{vision.get('postureGoodPct', 'N/A')}%", template.value_style))
+        story.append(Paragraph("Eye Contact Score", template.label_style))
+        story.append(Paragraph(f"{vision.get('eyeGoodPct', 'N/A')}%", template.value_style))
+        timeline_stats = data.get("timeline_stats") or {}
+        threshold = timeline_stats.get("low_score_threshold", 0)
+        for name, label in (("posture_timeline", "Posture Over Time"), ("eye_timeline", "Eye Contact Over Time")):
+            item = timeline_stats.get(name)
+            if item:
+                story.append(Paragraph(label, template.label_style))
+                story.append(Paragraph(
+                    f"Average {item['mean']}%, below {threshold:g}% for {item['time_below_threshold_sec']}s "
+                    f"({item['pct_time_below_threshold']}% of the session), "
+                    f"longest low stretch {item['longest_low_streak_sec']}s",
+                    template.value_style,
+                ))
+        story.append(template.section_rule)
+
+    # Voice Analysis
+    voice = data.get("voice_analysis", {})
+    if voice and "error" not in voice:
+        story.append(Paragraph("Voice Analysis", template.heading_style))
+        story.append(Paragraph("Pitch", template.label_style))
+        story.append(Paragraph(f"{voice.get('avg_pitch_hz', 'N/A')} Hz — {voice.get('pitch_feedback', '')}", template.value_style))
+        story.append(Paragraph("Tone", template.label_style))
+        story.append(Paragraph(voice.get("tone_feedback", "N/A"), template.value_style))
+        story.append(Paragraph("Speaking Rate", template.label_style))
+        story.append(Paragraph(f"{voice.get('speaking_rate', 'N/A')} — {voice.get('rate_feedback', '')}", template.value_style))
+        story.append(template.section_rule)
+
+    eye_chart = generate_timeline_chart(eye_timeline, "Eye Contact Timeline", "#4f46e5")
+    posture_chart = generate_timeline_chart(posture_timeline, "Posture Timeline", "#10b981")
+
+    story.append(Paragraph("Timeline Charts", template.heading_style))
+    if eye_chart is not None:
+        story.append(eye_chart)
+        story.append(template.chart_gap)
+    if posture_chart is not None:
+        story.append(posture_chart)
+    story.append(template.section_rule)
+
+    # Transcript
+    transcript = data.get("transcription_analysis") or data.get("transcript_analysis", "")
+    if transcript:
+        story.append(Paragraph("Transcript", template.heading_style))
+        story.append(Paragraph(transcript, template.body_style))
+        story.append(template.section_rule)
+
+    # LLM Review
+    review = data.get("llm_review", "")
+    if review:
+        story.append(Paragraph("AI Recruiter Feedback", template.heading_style))
+        for line in review.split("\n"):
+            line = line.strip()
+            if not line:
+                story.append(template.review_gap)
+            elif line.isupper() or line.endswith(":"):
+                story.append(Paragraph(line, template.review_heading_style))
+            else:
+                story.append(Paragraph(line, template.body_style))
+
+    return story
+
+
+def build_interview_pdf(
+    data: Dict[str, Any],
+    eye_timeline: Optional[TimelineSeries],
+    posture_timeline: Optional[TimelineSeries],
+    template: ReportTemplate = REPORT_TEMPLATE,
+) -> bytes:
+    """
+    Render the interview report for one stored result. CPU-bound and
+    synchronous; callers run it on the PDF worker pool (app.services.pdf_pool).
+    """
+    pdf_buffer = io.BytesIO()
+    doc = template.new_document(pdf_buffer)
+    doc.build(build_report_story(data, eye_timeline, posture_timeline, template))
+    pdf_bytes = pdf_buffer.getvalue()
+    print(f"[PDF] PDF built successfully, size: {len(pdf_bytes)} bytes", flush=True)
+    return pdf_bytes
+
+
+def pdf_etag(
+    data: Dict[str, Any],
+    eye_timeline: Optional[TimelineSeries],
+    posture_timeline: Optional[TimelineSeries],
+) -> str:
+    """
+    Content hash of everything the report is rendered from: it changes
+    whenever the stored result (or its charted timelines) changes.
+    """
+    digest = hashlib.sha256(PDF_REPORT_VERSION.encode("ascii"))
+    digest.update(json.dumps(data, sort_keys=True, default=str).encode("utf-8"))
+    for series in (eye_timeline, posture_timeline):
+        if series is not None:
+            digest.update(series.timestamps.tobytes())
+            digest.update(series.values.tobytes())
+        digest.update(b"|")
+    return f'"{digest.hexdigest()[:32]}"'
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import io
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer
+
+REPORT_TITLE = "Interview Results Report"
+REPORT_PAGE_SIZE = letter
+REPORT_MARGIN_TOP = 0.75 * inch
+REPORT_MARGIN_BOTTOM = 0.75 * inch
+REPORT_ACCENT_COLOR = colors.HexColor("#4f46e5")
+REPORT_RULE_COLOR = colors.HexColor("#dddddd")
+
+
+class ReportTemplate:
+    """
+    Paragraph styles and static page furniture (title header, section rules,
+    gaps) shared by every interview report. Built once per process as
+    REPORT_TEMPLATE, when the PDF workers import this module.
+
+    The flowables are reused across reports and within one story. That is
+    safe because platypus re-wraps a flowable each time it lays it out, none
+    of them split, and a process renders one report at a time (see
+    app.services.pdf_pool). Reports use the standard Type 1 fonts, so there is
+    nothing to register; their metrics load on the worker's warm-up render.
+    """
+
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle("Title", parent=styles["Title"], fontSize=24, textColor=colors.HexColor("#1a1a2e"), spaceAfter=6)
+        self.heading_style = ParagraphStyle("Heading", parent=styles["Heading2"], fontSize=13, textColor=colors.HexColor("#16213e"), spaceBefore=14, spaceAfter=4)
+        self.body_style = ParagraphStyle("Body", parent=styles["Normal"], fontSize=10, leading=16, textColor=colors.HexColor("#333333"))
+        self.label_style = ParagraphStyle("Label", parent=styles["Normal"], fontSize=10, textColor=colors.HexColor("#666666"), spaceAfter=2)
+        self.value_style = ParagraphStyle("Value", parent=styles["Normal"], fontSize=11, textColor=colors.HexColor("#1a1a2e"), spaceBefore=0, spaceAfter=8)
+        # Uppercase / "Label:" lines of the LLM review.
+        self.review_heading_style = ParagraphStyle("Bold", parent=styles["Normal"], fontSize=10, fontName="Helvetica-Bold", spaceBefore=8, textColor=colors.HexColor("#16213e"))
+
+        self.header = (
+            Paragraph(REPORT_TITLE, self.title_style),
+            HRFlowable(width="100%", thickness=2, color=REPORT_ACCENT_COLOR),
+            Spacer(1, 12),
+        )
+        self.section_rule = HRFlowable(width="100%", thickness=0.5, color=REPORT_RULE_COLOR)
+        self.chart_gap = Spacer(1, 8)
+        self.review_gap = Spacer(1, 4)
+
+    def new_document(self, buffer: io.BytesIO) -> SimpleDocTemplate:
+        return SimpleDocTemplate(
+            buffer,
+            pagesize=REPORT_PAGE_SIZE,
+            topMargin=REPORT_MARGIN_TOP,
+            bottomMargin=REPORT_MARGIN_BOTTOM,
+        )
+
+
+REPORT_TEMPLATE = ReportTemplate()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+
+import librosa
+import numpy as np
+import scipy.fft
+
+# "pyin" is the accurate (probabilistic YIN + Viterbi) tracker; "yin" is a
+# vectorized YIN over strided frames that is much cheaper on long answers.
+PITCH_ENGINES = ("pyin", "yin")
+PITCH_ENGINE = os.getenv("PITCH_ENGINE", "pyin").strip().lower()
+if PITCH_ENGINE not in PITCH_ENGINES:
+    PITCH_ENGINE = "pyin"
+
+PITCH_FMIN = float(librosa.note_to_hz('C2'))
+PITCH_FMAX = float(librosa.note_to_hz('C7'))
+PITCH_FRAME_LENGTH = 2048
+PITCH_HOP_LENGTH = PITCH_FRAME_LENGTH // 4
+# Absolute threshold on the cumulative mean normalized difference; frames whose
+# best dip stays above it are treated as unvoiced.
+YIN_THRESHOLD = 0.15
+# Frames are transformed in blocks to bound FFT scratch memory on long clips.
+_YIN_BLOCK_FRAMES = 256
+
+
+def frame_signal(y: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    Centered, zero-padded frames of `y` as a (n_frames, frame_length) strided
+    view (same framing as librosa's center=True analyses, no copy of the frames).
+    """
+    padded = np.pad(y, frame_length // 2, mode="constant")
+    if padded.size < frame_length:
+        padded = np.pad(padded, (0, frame_length - padded.size), mode="constant")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, frame_length)
+    return windows[::hop_length]
+
+
+def yin_lag_range(sr: int, fmin: float = PITCH_FMIN, fmax: float = PITCH_FMAX,
+                  frame_length: int = PITCH_FRAME_LENGTH) -> tuple[int, int]:
+    """
+    Smallest and largest candidate periods (in samples) for the f0 search.
+    """
+    tau_min = max(1, int(np.floor(sr / fmax)))
+    tau_max = min(frame_length - 1, int(np.ceil(sr / fmin)))
+    return tau_min, tau_max
+
+
+def yin_fft_size(frame_length: int, tau_max: int) -> int:
+    """
+    FFT length for YIN's autocorrelation: long enough that the correlation of
+    a frame with its integration window does not wrap around.
+    """
+    win = frame_length - tau_max
+    return 1 << int(np.ceil(np.log2(frame_length + win)))
+
+
+def running_power(frames: np.ndarray) -> np.ndarray:
+    """
+    Per-frame running sum of squares with a leading zero column, so any
+    window energy is a difference of two columns. Accumulated in float64:
+    the differences cancel badly in single precision.
+    """
+    n_frames = frames.shape[0]
+    frames64 = frames.astype(np.float64, copy=False)
+    return np.concatenate(
+        [np.zeros((n_frames, 1)), np.cumsum(frames64 * frames64, axis=1)], axis=1
+    )
+
+
+def _yin_block(frames: np.ndarray, sr: int, tau_min: int, tau_max: int, threshold: float,
+               spectrum: np.ndarray | None = None, power: np.ndarray | None = None):
+    n_frames, frame_length = frames.shape
+    win = frame_length - tau_max
+    n_fft = yin_fft_size(frame_length, tau_max)
+    frames32 = frames.astype(np.float32, copy=False)
+
+    # r(tau) = sum_j x[j] * x[j + tau] over the integration window, via FFT.
+    # Single-precision transforms are about twice as fast and the CMND dips
+    # we threshold on are far above float32 rounding.
+    if spectrum is None:
+        spectrum = scipy.fft.rfft(frames32, n=n_fft, axis=1)
+    head = scipy.fft.rfft(frames32[:, :win], n=n_fft, axis=1)
+    acf = scipy.fft.irfft(spectrum * np.conj(head), n=n_fft, axis=1)[:, : tau_max + 1]
+
+    # Window energies E(tau) = sum x[tau:tau + win]^2 from a running sum of squares.
+    if power is None:
+        power = running_power(frames32)
+    lags = np.arange(tau_max + 1)
+    energy = power[:, lags + win] - power[:, lags]
+
+    diff = np.maximum(energy[:, :1] + energy - 2.0 * acf, 0.0)
+
+    # Cumulative mean normalized difference d'(tau).
+    cumulative = np.cumsum(diff[:, 1:], axis=1)
+    cmnd = np.ones_like(diff)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cmnd[:, 1:] = np.where(cumulative > 0, diff[:, 1:] * lags[1:] / cumulative, 1.0)
+
+    search = cmnd[:, tau_min : tau_max + 1]
+    # First local minimum below the threshold, else the global minimum (unvoiced).
+    local_min = np.zeros_like(search, dtype=bool)
+    local_min[:, 1:-1] = (search[:, 1:-1] <= search[:, :-2]) & (search[:, 1:-1] <= search[:, 2:])
+    candidates = local_min & (search < threshold)
+    voiced = candidates.any(axis=1)
+    best = np.where(voiced, candidates.argmax(axis=1), search.argmin(axis=1))
+
+    # Parabolic interpolation around the chosen lag for sub-sample precision.
+    idx = np.clip(best, 1, search.shape[1] - 2)
+    rows = np.arange(n_frames)
+    left, mid, right = search[rows, idx - 1], search[rows, idx], search[rows, idx + 1]
+    denom = left - 2.0 * mid + right
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / denom, 0.0)
+    shift = np.where(best == idx, np.clip(shift, -1.0, 1.0), 0.0)
+    period = tau_min + best + shift
+
+    with np.errstate(divide="ignore"):
+        f0 = np.where(period > 0, sr / period, np.nan)
+    silent = energy[:, 0] <= 1e-10
+    voiced &= ~silent
+    f0 = np.where(voiced, f0, np.nan)
+    return f0, voiced
+
+
+def yin_fast(
+    y: np.ndarray,
+    sr: int,
+    fmin: float = PITCH_FMIN,
+    fmax: float = PITCH_FMAX,
+    frame_length: int = PITCH_FRAME_LENGTH,
+    hop_length: int = PITCH_HOP_LENGTH,
+    threshold: float = YIN_THRESHOLD,
+    frames: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized YIN over strided frames. Returns (f0, voiced_flag) with NaN f0
+    for unvoiced frames, matching the shape of librosa.pyin's first two outputs.
+    Pass `frames` to reuse an existing (n_frames, frame_length) framing.
+    """
+    tau_min, tau_max = yin_lag_range(sr, fmin, fmax, frame_length)
+    if frames is None:
+        frames = frame_signal(np.asarray(y, dtype=np.float32), frame_length, hop_length)
+
+    f0_parts = []
+    voiced_parts = []
+    for start in range(0, frames.shape[0], _YIN_BLOCK_FRAMES):
+        f0_block, voiced_block = _yin_block(
+            frames[start : start + _YIN_BLOCK_FRAMES], sr, tau_min, tau_max, threshold
+        )
+        f0_parts.append(f0_block)
+        voiced_parts.append(voiced_block)
+    if not f0_parts:
+        return np.empty(0), np.empty(0, dtype=bool)
+    return np.concatenate(f0_parts), np.concatenate(voiced_parts)
+
+
+def estimate_pitch(y: np.ndarray, sr: int, engine: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Frame-wise fundamental frequency and voicing for `y` using the selected engine.
+    """
+    engine = (engine or PITCH_ENGINE).lower()
+    if engine == "yin":
+        return yin_fast(y, sr)
+    f0, voiced_flag, _ = librosa.pyin(
+        y,
+        sr=sr,
+        fmin=PITCH_FMIN,
+        fmax=PITCH_FMAX,
+        frame_length=PITCH_FRAME_LENGTH,
+    )
+    return f0, voiced_flag
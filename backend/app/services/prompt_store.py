@@ -5,7 +5,38 @@ from typing import Any, Optional
 
 
 PROMPTS_DIR = Path(__file__).resolve().parents[2] / "prompts"
-_PROMPTS_CACHE: list[dict[str, Any]] | None = None
+
+_PROMPT_TYPE_ALIASES = {
+    "all": "all",
+    "any": "all",
+    "default": "all",
+    "behavior": "behavioral",
+    "behaviour": "behavioral",
+    "behavioral": "behavioral",
+    "situation": "situational",
+    "situational": "situational",
+    "technical": "technical",
+    "tech": "technical",
+    "background": "general",
+    "general": "general",
+    "other": "general",
+}
+_DIFFICULTY_ALIASES = {
+    "all": "all",
+    "any": "all",
+    "default": "all",
+    "1": "easy",
+    "2": "medium",
+    "medium": "medium",
+    "3": "hard",
+    "hard": "hard",
+    "4": "expert",
+    "expert": "expert",
+    "5": "master",
+    "master": "master",
+    "easy": "easy",
+}
+_DIFFICULTY_SCORES = {1: "easy", 2: "medium", 3: "hard", 4: "expert", 5: "master"}
 
 
 def _coerce_prompt_list(payload: Any) -> list[dict[str, Any]]:
@@ -41,10 +72,45 @@ def _read_prompt_file(path: Path) -> list[dict[str, Any]]:
     return normalized
 
 
-def _load_prompts() -> list[dict[str, Any]]:
-    global _PROMPTS_CACHE
-    if _PROMPTS_CACHE is not None:
-        return _PROMPTS_CACHE
+class PromptCatalog:
+    """
+    Prompts normalized once at load and indexed by (type, difficulty), with
+    "all" as a wildcard on either axis. Each bucket is a tuple in catalog
+    order, so listing hands out the same immutable sequence on every call
+    and a random pick is a single index into it. The prompt dicts are shared
+    between buckets and callers; treat them as read-only.
+    """
+
+    def __init__(self, prompts: list[dict[str, Any]]):
+        buckets: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        for prompt in prompts:
+            row_type = normalize_prompt_type(str(prompt.get("type", "")))
+            row_difficulty = _difficulty_bucket(prompt.get("difficulty"))
+            for type_key in {"all", row_type}:
+                for difficulty_key in {"all", row_difficulty}:
+                    buckets.setdefault((type_key, difficulty_key), []).append(prompt)
+        self._buckets: dict[tuple[str, str], tuple[dict[str, Any], ...]] = {
+            key: tuple(rows) for key, rows in buckets.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.select("all", "all"))
+
+    def select(self, prompt_type: str = "all", difficulty: str = "all") -> tuple[dict[str, Any], ...]:
+        return self._buckets.get((normalize_prompt_type(prompt_type), normalize_difficulty(difficulty)), ())
+
+    def random(self, prompt_type: str = "all", difficulty: str = "all") -> Optional[dict[str, Any]]:
+        bucket = self.select(prompt_type, difficulty)
+        return random.choice(bucket) if bucket else None
+
+
+_CATALOG: PromptCatalog | None = None
+
+
+def _load_catalog() -> PromptCatalog:
+    global _CATALOG
+    if _CATALOG is not None:
+        return _CATALOG
 
     if not PROMPTS_DIR.exists():
         raise ValueError(f"Prompts directory not found: {PROMPTS_DIR}")
@@ -66,48 +132,18 @@ def _load_prompts() -> list[dict[str, Any]]:
             f"Directory checked: {PROMPTS_DIR}"
         )
 
-    _PROMPTS_CACHE = prompts
-    return _PROMPTS_CACHE
+    _CATALOG = PromptCatalog(prompts)
+    return _CATALOG
 
 
 def normalize_prompt_type(prompt_type: Optional[str]) -> str:
     raw = (prompt_type or "").strip().lower()
-    aliases = {
-        "all": "all",
-        "any": "all",
-        "default": "all",
-        "behavior": "behavioral",
-        "behaviour": "behavioral",
-        "behavioral": "behavioral",
-        "situation": "situational",
-        "situational": "situational",
-        "technical": "technical",
-        "tech": "technical",
-        "background": "general",
-        "general": "general",
-        "other": "general",
-    }
-    return aliases.get(raw, "all")
+    return _PROMPT_TYPE_ALIASES.get(raw, "all")
 
 
 def normalize_difficulty(difficulty: Optional[str]) -> str:
     raw = (difficulty or "").strip().lower()
-    aliases = {
-        "all": "all",
-        "any": "all",
-        "default": "all",
-        "1": "easy",
-        "2": "medium",
-        "medium": "medium",
-        "3": "hard",
-        "hard": "hard",
-        "4": "expert",
-        "expert": "expert",
-        "5": "master",
-        "master": "master",
-        "easy": "easy",
-    }
-    return aliases.get(raw, "all")
+    return _DIFFICULTY_ALIASES.get(raw, "all")
 
 
 def _difficulty_bucket(value: Any) -> str:
@@ -121,43 +157,15 @@ def _difficulty_bucket(value: Any) -> str:
     except (TypeError, ValueError):
         return "all"
 
-    if score == 1:
-        return "easy"
-    if score == 2:
-        return "medium"
-    if score == 3:
-        return "hard"
-    if score == 4:
-        return "expert"
-    if score == 5:
-        return "master"
-    return "all"
-
-
-def list_prompts(prompt_type: str = "all", difficulty: str = "all") -> list[dict[str, Any]]:
-    normalized_type = normalize_prompt_type(prompt_type)
-    normalized_difficulty = normalize_difficulty(difficulty)
-    prompts = _load_prompts()
-
-    def prompt_matches_type(prompt: dict[str, Any]) -> bool:
-        if normalized_type == "all":
-            return True
-        row_type = normalize_prompt_type(str(prompt.get("type", "")))
-        return row_type == normalized_type
-
-    return [
-        prompt
-        for prompt in prompts
-        if prompt_matches_type(prompt)
-        and (
-            normalized_difficulty == "all"
-            or _difficulty_bucket(prompt.get("difficulty")) == normalized_difficulty
-        )
-    ]
+    return _DIFFICULTY_SCORES.get(score, "all")
+
+
+def list_prompts(prompt_type: str = "all", difficulty: str = "all") -> tuple[dict[str, Any], ...]:
+    return _load_catalog().select(prompt_type, difficulty)
 
 
 def get_random_prompt(prompt_type: str = "all", difficulty: str = "all") -> dict[str, Any]:
-    filtered = list_prompts(prompt_type=prompt_type, difficulty=difficulty)
-    if not filtered:
+    prompt = _load_catalog().random(prompt_type, difficulty)
+    if prompt is None:
         raise ValueError("No prompts available for the selected filters.")
-    return random.choice(filtered)
+    return prompt
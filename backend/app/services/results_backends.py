@@ -0,0 +1,512 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.timeline_arrays import TimelineSeries, decode_timelines_blob, encode_timelines_blob
+
+logger = logging.getLogger("uvicorn.error")
+
+RESULT_PARTS = ("results", "audio", "timelines", "stages", "pdf")
+# Parts stored as a JSON metadata dict plus one raw byte string ("raw_bytes").
+_RAW_BYTES_PARTS = ("audio", "pdf")
+
+
+class ResultsBackend:
+    """
+    Storage interface behind results_store. A result id maps to up to five
+    parts: "results" (the combined analysis payload), "audio" (upload metadata
+    plus raw bytes), "timelines" (posture/eye series), "stages" (per-stage
+    checkpoints used to retry a failed analysis) and "pdf" (the rendered
+    report and its etag).
+    """
+
+    def put(self, result_id: str, part: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def get(self, result_id: str, part: str) -> Any:
+        raise NotImplementedError
+
+    def contains(self, result_id: str) -> bool:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def location(self, result_id: str, name: str) -> str:
+        """Logical handle (not a filesystem path) for `name` stored under a result id."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush pending writes and release resources."""
+
+
+def _estimate_bytes(value: Any) -> int:
+    """
+    Rough memory footprint of a stored part: raw byte length for audio and
+    timeline arrays, serialized JSON length for everything else.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, TimelineSeries):
+        return value.nbytes
+    if isinstance(value, dict):
+        binary = [
+            key for key, item in value.items()
+            if isinstance(item, (bytes, bytearray, memoryview, TimelineSeries))
+        ]
+        if binary:
+            rest = {key: item for key, item in value.items() if key not in binary}
+            return sum(_estimate_bytes(value[key]) for key in binary) + _estimate_bytes(rest)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class _ResultEntry:
+    __slots__ = ("parts", "sizes", "created_at", "accessed_at")
+
+    def __init__(self) -> None:
+        now = time.monotonic()
+        self.parts: Dict[str, Any] = {}
+        self.sizes: Dict[str, int] = {}
+        self.created_at = now
+        self.accessed_at = now
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self.sizes.values())
+
+
+class MemoryResultsBackend(ResultsBackend):
+    """
+    Process-local store with LRU ordering, TTL expiry and a byte budget.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, max_bytes: int):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _ResultEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions_lru": 0,
+            "evictions_ttl": 0,
+            "evictions_bytes": 0,
+        }
+
+    def put(self, result_id: str, part: str, value: Any) -> None:
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(result_id)
+            if entry is None:
+                entry = _ResultEntry()
+                self._entries[result_id] = entry
+            self._entries.move_to_end(result_id)
+
+            size = _estimate_bytes(value)
+            self._bytes += size - entry.sizes.get(part, 0)
+            entry.parts[part] = value
+            entry.sizes[part] = size
+            entry.accessed_at = time.monotonic()
+            self._enforce_bounds(keep=result_id)
+
+    def get(self, result_id: str, part: str) -> Any:
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(result_id)
+            if entry is None or part not in entry.parts:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(result_id)
+            entry.accessed_at = time.monotonic()
+            self._counters["hits"] += 1
+            return entry.parts[part]
+
+    def contains(self, result_id: str) -> bool:
+        with self._lock:
+            self._expire()
+            return result_id in self._entries
+
+    def location(self, result_id: str, name: str) -> str:
+        return f"in_memory:{result_id}/{name}"
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire()
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                **self._counters,
+            }
+
+    def _drop(self, result_id: str, reason: str) -> None:
+        entry = self._entries.pop(result_id)
+        self._bytes -= entry.nbytes
+        self._counters[f"evictions_{reason}"] += 1
+
+    def _expire(self) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [key for key, entry in self._entries.items() if entry.accessed_at < cutoff]
+        for key in expired:
+            self._drop(key, "ttl")
+
+    def _enforce_bounds(self, keep: str) -> None:
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)), "lru")
+        # Never evict the entry being written, even if it alone exceeds the budget.
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._drop(oldest, "bytes")
+
+
+class SQLiteResultsBackend(ResultsBackend):
+    """
+    SQLite (WAL mode) store shared by every uvicorn worker on the host.
+
+    Result payloads live in the small `results` table; audio bytes and
+    timelines (as float32 arrays) go to `blobs` so metadata queries never
+    touch them.
+    Writes are applied to a pending overlay immediately (so the writing
+    process reads its own writes) and flushed in batches by a background
+    writer thread, keeping disk I/O off the request path.
+    """
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS results (
+            result_id TEXT PRIMARY KEY,
+            payload TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS results_updated_at ON results(updated_at)",
+        """
+        CREATE TABLE IF NOT EXISTS blobs (
+            result_id TEXT NOT NULL,
+            part TEXT NOT NULL,
+            meta TEXT,
+            data BLOB,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (result_id, part)
+        )
+        """,
+    )
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int,
+        batch_size: int = 64,
+        flush_interval: float = 0.2,
+        max_attempts: int = 5,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_attempts = max(1, max_attempts)
+        self._local = threading.local()
+        self._pending: Dict[Tuple[str, str], Any] = {}
+        self._pending_lock = threading.Lock()
+        # Items are (result_id, part, value, written_at, attempts); None stops the writer.
+        self._queue: "queue.Queue[Optional[Tuple[str, str, Any, float, int]]]" = queue.Queue()
+        self._counters = {
+            "writes_queued": 0,
+            "writes_flushed": 0,
+            "batches": 0,
+            "evictions_ttl": 0,
+            "write_errors": 0,
+            "writes_retried": 0,
+            "writes_dropped": 0,
+        }
+
+        conn = self._connect()
+        for statement in self._SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+
+        self._writer = threading.Thread(target=self._writer_loop, name="results-sqlite-writer", daemon=True)
+        self._writer.start()
+
+    # -- connections -------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -- public API --------------------------------------------------------
+
+    def put(self, result_id: str, part: str, value: Any) -> None:
+        with self._pending_lock:
+            self._pending[(result_id, part)] = value
+        self._counters["writes_queued"] += 1
+        self._queue.put((result_id, part, value, time.time(), 0))
+
+    def get(self, result_id: str, part: str) -> Any:
+        with self._pending_lock:
+            if (result_id, part) in self._pending:
+                return self._pending[(result_id, part)]
+
+        conn = self._connect()
+        if part == "results":
+            row = conn.execute(
+                "SELECT payload, updated_at FROM results WHERE result_id = ?", (result_id,)
+            ).fetchone()
+            if row is None or self._expired(row[1]):
+                return None
+            return json.loads(row[0]) if row[0] else None
+
+        row = conn.execute(
+            "SELECT meta, data, updated_at FROM blobs WHERE result_id = ? AND part = ?",
+            (result_id, part),
+        ).fetchone()
+        if row is None or self._expired(row[2]):
+            return None
+        return self._decode_blob(part, row[0], row[1])
+
+    def contains(self, result_id: str) -> bool:
+        with self._pending_lock:
+            if any(key[0] == result_id for key in self._pending):
+                return True
+        row = self._connect().execute(
+            "SELECT updated_at FROM results WHERE result_id = ?", (result_id,)
+        ).fetchone()
+        if row is not None:
+            return not self._expired(row[0])
+        row = self._connect().execute(
+            "SELECT MAX(updated_at) FROM blobs WHERE result_id = ?", (result_id,)
+        ).fetchone()
+        return row is not None and row[0] is not None and not self._expired(row[0])
+
+    def location(self, result_id: str, name: str) -> str:
+        return f"sqlite:{self.path}:{result_id}/{name}"
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        entries, payload_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM results"
+        ).fetchone()
+        blob_bytes = conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(data)) + SUM(COALESCE(LENGTH(meta), 0)), 0) FROM blobs"
+        ).fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": payload_bytes + blob_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "pending_writes": self._queue.qsize(),
+            **self._counters,
+        }
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """
+        Block until every write queued so far has been attempted. Waits on the
+        writer thread, so never call it from a request path.
+        """
+        marker = threading.Event()
+        self._queue.put(("", "__flush__", marker, 0.0, 0))
+        marker.wait(timeout)
+
+    def close(self) -> None:
+        if not self._writer.is_alive():
+            return
+        self._queue.put(None)
+        self._writer.join(timeout=10.0)
+
+    # -- background writer -------------------------------------------------
+
+    def _writer_loop(self) -> None:
+        conn = self._connect()
+        last_expiry = 0.0
+        failures = 0
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch: List[Tuple[str, str, Any, float, int]] = []
+            markers: List[threading.Event] = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stopping = True
+                elif item[1] == "__flush__":
+                    markers.append(item[2])
+                    # Flush requests are served right away instead of waiting for the window.
+                    deadline = time.monotonic()
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                if batch:
+                    failures = 0 if self._write_batch(conn, batch, requeue=not stopping) else failures + 1
+                if self.ttl_seconds > 0 and time.monotonic() - last_expiry > 60:
+                    self._expire(conn)
+                    last_expiry = time.monotonic()
+            except Exception:
+                # Keep the writer alive: if this thread dies, no later write is ever persisted.
+                logger.exception("Results write-behind writer error")
+            finally:
+                for marker in markers:
+                    marker.set()
+            if failures and not stopping:
+                # Back off while the database keeps failing (locked, disk full, ...).
+                time.sleep(min(self.flush_interval * 2 ** failures, 5.0))
+        conn.close()
+
+    def _encode_row(self, part: str, value: Any) -> Tuple[Any, ...]:
+        if part == "results":
+            return (json.dumps(value, default=str),)
+        return self._encode_blob(part, value)
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple[str, str, Any, float, int]], requeue: bool = True) -> bool:
+        """
+        Commit one batch. Rows that cannot be encoded are dropped (retrying
+        would fail the same way); if the transaction fails the remaining rows
+        are queued again, up to `max_attempts` times each. Returns False when
+        the transaction failed.
+        """
+        rows = []
+        for item in batch:
+            result_id, part, value = item[:3]
+            try:
+                rows.append((item, self._encode_row(part, value)))
+            except Exception as exc:
+                self._counters["write_errors"] += 1
+                self._counters["writes_dropped"] += 1
+                logger.error("Dropping results write %s/%s that cannot be encoded: %s", result_id, part, exc)
+                self._clear_pending(result_id, part, value)
+
+        try:
+            with conn:
+                for (result_id, part, _, written_at, _), encoded in rows:
+                    if part == "results":
+                        conn.execute(
+                            """
+                            INSERT INTO results (result_id, payload, created_at, updated_at)
+                            VALUES (?, ?, ?, ?)
+                            ON CONFLICT(result_id) DO UPDATE SET
+                                payload = excluded.payload,
+                                updated_at = excluded.updated_at
+                            """,
+                            (result_id, encoded[0], written_at, written_at),
+                        )
+                    else:
+                        meta, data = encoded
+                        conn.execute(
+                            """
+                            INSERT INTO blobs (result_id, part, meta, data, updated_at)
+                            VALUES (?, ?, ?, ?, ?)
+                            ON CONFLICT(result_id, part) DO UPDATE SET
+                                meta = excluded.meta,
+                                data = excluded.data,
+                                updated_at = excluded.updated_at
+                            """,
+                            (result_id, part, meta, data, written_at),
+                        )
+        except sqlite3.Error as exc:
+            self._counters["write_errors"] += 1
+            logger.error("Results write-behind batch failed (%s rows): %s", len(rows), exc)
+            self._retry_later([item for item, _ in rows], requeue)
+            return False
+
+        self._counters["writes_flushed"] += len(rows)
+        self._counters["batches"] += 1
+        for (result_id, part, value, _, _), _ in rows:
+            self._clear_pending(result_id, part, value)
+        return True
+
+    def _retry_later(self, items: List[Tuple[str, str, Any, float, int]], requeue: bool) -> None:
+        for result_id, part, value, written_at, attempts in items:
+            with self._pending_lock:
+                superseded = self._pending.get((result_id, part)) is not value
+            if superseded:
+                # A newer write of this part is already queued behind us.
+                continue
+            if not requeue or attempts + 1 >= self.max_attempts:
+                self._counters["writes_dropped"] += 1
+                logger.error("Giving up on results write %s/%s after %s attempts", result_id, part, attempts + 1)
+                self._clear_pending(result_id, part, value)
+                continue
+            self._counters["writes_retried"] += 1
+            self._queue.put((result_id, part, value, written_at, attempts + 1))
+
+    def _clear_pending(self, result_id: str, part: str, value: Any) -> None:
+        with self._pending_lock:
+            # Only clear the overlay if no newer write replaced it meanwhile.
+            if self._pending.get((result_id, part)) is value:
+                del self._pending[(result_id, part)]
+
+    def _expire(self, conn: sqlite3.Connection) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        try:
+            with conn:
+                expired = conn.execute("DELETE FROM results WHERE updated_at < ?", (cutoff,)).rowcount
+                conn.execute(
+                    "DELETE FROM blobs WHERE result_id NOT IN (SELECT result_id FROM results) AND updated_at < ?",
+                    (cutoff,),
+                )
+            self._counters["evictions_ttl"] += max(0, expired)
+        except sqlite3.Error as exc:
+            logger.warning("Results TTL sweep failed: %s", exc)
+
+    def _expired(self, updated_at: float) -> bool:
+        return self.ttl_seconds > 0 and updated_at < time.time() - self.ttl_seconds
+
+    # -- blob encoding -----------------------------------------------------
+
+    @staticmethod
+    def _encode_blob(part: str, value: Any) -> Tuple[Optional[str], Optional[bytes]]:
+        if part in _RAW_BYTES_PARTS and isinstance(value, dict):
+            meta = {key: item for key, item in value.items() if key != "raw_bytes"}
+            raw = value.get("raw_bytes")
+            return json.dumps(meta, default=str), bytes(raw) if raw is not None else None
+        if part == "timelines" and isinstance(value, dict):
+            return encode_timelines_blob(value)
+        return None, json.dumps(value, default=str).encode("utf-8")
+
+    @staticmethod
+    def _decode_blob(part: str, meta: Optional[str], data: Optional[bytes]) -> Any:
+        if part in _RAW_BYTES_PARTS:
+            value = json.loads(meta) if meta else {}
+            if data is not None:
+                value["raw_bytes"] = bytes(data)
+            return value
+        if part == "timelines":
+            return decode_timelines_blob(meta, data)
+        return json.loads(data.decode("utf-8")) if data else None
@@ -1,61 +1,175 @@
 from __future__ import annotations
 
+import os
+import uuid
+from pathlib import Path
 from typing import Any, Dict, Optional
 
+from app.services.results_backends import (
+    MemoryResultsBackend,
+    ResultsBackend,
+    SQLiteResultsBackend,
+)
+
+
+# Bounds for the results store. For the memory backend whichever limit is hit
+# first evicts the least recently used result; SQLite only applies the TTL.
+RESULTS_MAX_ENTRIES = int(os.getenv("RESULTS_MAX_ENTRIES", "256"))
+RESULTS_TTL_SECONDS = int(os.getenv("RESULTS_TTL_SECONDS", str(6 * 60 * 60)))
+RESULTS_MAX_BYTES = int(os.getenv("RESULTS_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Which storage backend holds results: "memory" (process-local LRU) or
+# "sqlite" (shared by every worker on the host, survives restarts).
+RESULTS_BACKEND = os.getenv("RESULTS_BACKEND", "memory").strip().lower()
+RESULTS_SQLITE_PATH = os.getenv(
+    "RESULTS_SQLITE_PATH",
+    str(Path(__file__).resolve().parents[2] / "data" / "results.sqlite3"),
+)
+RESULTS_WRITE_BATCH_SIZE = int(os.getenv("RESULTS_WRITE_BATCH_SIZE", "64"))
+RESULTS_WRITE_FLUSH_SECONDS = float(os.getenv("RESULTS_WRITE_FLUSH_SECONDS", "0.2"))
+# Times a write is attempted before the write-behind writer gives up on it.
+RESULTS_WRITE_MAX_ATTEMPTS = int(os.getenv("RESULTS_WRITE_MAX_ATTEMPTS", "5"))
+
+
+def _create_backend() -> ResultsBackend:
+    if RESULTS_BACKEND == "sqlite":
+        return SQLiteResultsBackend(
+            RESULTS_SQLITE_PATH,
+            ttl_seconds=RESULTS_TTL_SECONDS,
+            batch_size=RESULTS_WRITE_BATCH_SIZE,
+            flush_interval=RESULTS_WRITE_FLUSH_SECONDS,
+            max_attempts=RESULTS_WRITE_MAX_ATTEMPTS,
+        )
+    if RESULTS_BACKEND != "memory":
+        raise ValueError(f"Unknown RESULTS_BACKEND '{RESULTS_BACKEND}' (expected 'memory' or 'sqlite').")
+    return MemoryResultsBackend(
+        max_entries=RESULTS_MAX_ENTRIES,
+        ttl_seconds=RESULTS_TTL_SECONDS,
+        max_bytes=RESULTS_MAX_BYTES,
+    )
+
+
+_STORE: Optional[ResultsBackend] = None
+
+
+def get_results_backend() -> ResultsBackend:
+    global _STORE
+    if _STORE is None:
+        _STORE = _create_backend()
+    return _STORE
+
+
+def close_results_store() -> None:
+    """
+    Flush pending write-behind batches; called from the app lifespan on shutdown.
+    """
+    global _STORE
+    if _STORE is not None:
+        _STORE.close()
+        _STORE = None
+
+
+def new_result_id() -> str:
+    return uuid.uuid4().hex
 
-# In-memory storage for the most recent analysis session.
-_LATEST_RESULTS: Optional[Dict[str, Any]] = None
-_LATEST_AUDIO: Optional[Dict[str, Any]] = None
-_LATEST_TIMELINES: Optional[Dict[str, Any]] = None
 
+def result_exists(result_id: str) -> bool:
+    return get_results_backend().contains(result_id)
 
-def store_latest_results(payload: Dict[str, Any]) -> None:
+
+def store_results(result_id: str, payload: Dict[str, Any]) -> None:
     """
-    Store the most recent full interview analysis payload in memory.
+    Store the full interview analysis payload for a result id.
     """
-    global _LATEST_RESULTS
-    _LATEST_RESULTS = dict(payload)
+    get_results_backend().put(result_id, "results", dict(payload))
 
 
-def load_latest_results() -> Dict[str, Any]:
+def load_results(result_id: str) -> Dict[str, Any]:
     """
-    Return the most recent full interview analysis payload, or an empty dict.
+    Return the full interview analysis payload for a result id, or an empty dict.
     """
-    return dict(_LATEST_RESULTS) if isinstance(_LATEST_RESULTS, dict) else {}
+    payload = get_results_backend().get(result_id, "results") if result_id else None
+    return dict(payload) if isinstance(payload, dict) else {}
 
 
-def store_latest_audio(metadata: Dict[str, Any]) -> None:
+def store_audio(result_id: str, metadata: Dict[str, Any]) -> None:
     """
-    Store metadata (and optionally raw bytes) for the most recent uploaded audio.
+    Store metadata (and optionally raw bytes) for a result's uploaded audio.
     """
-    global _LATEST_AUDIO
-    _LATEST_AUDIO = dict(metadata)
+    get_results_backend().put(result_id, "audio", dict(metadata))
 
 
-def load_latest_audio() -> Optional[Dict[str, Any]]:
+def load_audio(result_id: str) -> Optional[Dict[str, Any]]:
     """
-    Return metadata for the most recent uploaded audio, or None.
+    Return metadata for a result's uploaded audio, or None.
     """
-    return dict(_LATEST_AUDIO) if isinstance(_LATEST_AUDIO, dict) else None
+    metadata = get_results_backend().get(result_id, "audio") if result_id else None
+    return dict(metadata) if isinstance(metadata, dict) else None
 
 
-def store_latest_timelines(timelines: Dict[str, Any]) -> None:
+def store_timelines(result_id: str, timelines: Dict[str, Any]) -> None:
     """
-    Store the most recent interview timelines (posture/eye).
+    Store the interview timelines (posture/eye) for a result id.
     """
-    global _LATEST_TIMELINES
-    _LATEST_TIMELINES = dict(timelines)
+    get_results_backend().put(result_id, "timelines", dict(timelines))
 
 
-def load_latest_timelines() -> Dict[str, Any]:
+def load_timelines(result_id: str) -> Dict[str, Any]:
     """
-    Return the most recent interview timelines.
-    Falls back to timelines nested inside the latest results payload.
+    Return the interview timelines for a result id.
+    Falls back to timelines nested inside that result's payload.
     """
-    if isinstance(_LATEST_TIMELINES, dict):
-        return dict(_LATEST_TIMELINES)
+    if not result_id:
+        return {}
+    timelines = get_results_backend().get(result_id, "timelines")
+    if isinstance(timelines, dict):
+        return dict(timelines)
 
-    results = load_latest_results()
+    results = load_results(result_id)
     nested = results.get("interview_timelines")
     return dict(nested) if isinstance(nested, dict) else {}
 
+
+def store_stages(result_id: str, checkpoint: Dict[str, Any]) -> None:
+    """
+    Store the per-stage analysis checkpoint (submission + finished stages) for a result id.
+    """
+    get_results_backend().put(result_id, "stages", dict(checkpoint))
+
+
+def load_stages(result_id: str) -> Dict[str, Any]:
+    """
+    Return the per-stage analysis checkpoint for a result id, or an empty dict.
+    """
+    checkpoint = get_results_backend().get(result_id, "stages")
+    return dict(checkpoint) if isinstance(checkpoint, dict) else {}
+
+
+def store_pdf(result_id: str, report: Dict[str, Any]) -> None:
+    """
+    Store a rendered PDF report ({"etag", "raw_bytes"}) for a result id.
+    """
+    get_results_backend().put(result_id, "pdf", dict(report))
+
+
+def load_pdf(result_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the stored PDF report for a result id, or None.
+    """
+    report = get_results_backend().get(result_id, "pdf")
+    return dict(report) if isinstance(report, dict) else None
+
+
+def result_location(result_id: str, name: str) -> str:
+    """
+    Logical handle for `name` stored under a result id, naming the active
+    backend (e.g. "in_memory:<id>/results.json").
+    """
+    return get_results_backend().location(result_id, name)
+
+
+def results_store_stats() -> Dict[str, Any]:
+    """
+    Counters for sizing the box: entries, bytes held, hits/misses and evictions.
+    """
+    return get_results_backend().stats()
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError, field_validator, model_validator
+
+# Category scores of the review, in the order the prompt asks for them:
+# (result field, label in the text layout, maximum points).
+REVIEW_SCORE_FIELDS: Tuple[Tuple[str, str, int], ...] = (
+    ("clarity_score", "Communication Clarity", 25),
+    ("content_score", "Content & Substance", 25),
+    ("professionalism_score", "Professionalism", 20),
+    ("body_language_score", "Body Language", 15),
+    ("vocal_delivery_score", "Vocal Delivery", 15),
+    ("total_score", "TOTAL SCORE", 100),
+)
+_CATEGORY_FIELDS = tuple(field for field, _, _ in REVIEW_SCORE_FIELDS if field != "total_score")
+_SCORE_MAX = {field: maximum for field, _, maximum in REVIEW_SCORE_FIELDS}
+_SCORE_LABELS = {field: label for field, label, _ in REVIEW_SCORE_FIELDS}
+
+# Feedback sections and their heading in the text layout.
+REVIEW_SECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("doing_well", "WHAT YOU ARE DOING WELL"),
+    ("must_improve", "WHAT YOU MUST IMPROVE"),
+    ("habits_to_keep", "HABITS TO KEEP"),
+    ("action_plan", "ACTION PLAN FOR NEXT INTERVIEW"),
+)
+_SECTION_FIELDS = tuple(section for section, _ in REVIEW_SECTIONS)
+_SECTION_HEADINGS = dict(REVIEW_SECTIONS)
+
+# The JSON object the review prompt asks for (sent with response_format=json_object).
+REVIEW_JSON_FORMAT = """{
+  "question": "<the question asked>",
+  "type": "<question type>",
+  "difficulty": "<difficulty>",
+  "clarity_score": <0-25>,
+  "content_score": <0-25>,
+  "professionalism_score": <0-20>,
+  "body_language_score": <0-15>,
+  "vocal_delivery_score": <0-15>,
+  "total_score": <0-100, the sum of the five category scores>,
+  "doing_well": ["<specific strength, referencing exact moments from the transcript>", ...],
+  "must_improve": ["<direct, actionable improvement with a specific example from the transcript>", ...],
+  "habits_to_keep": ["<specific positive behaviour to continue>", ...],
+  "action_plan": ["<1-2 concrete things to practice before the next interview>", ...]
+}"""
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_SCORE_LINE_PATTERNS = tuple(
+    (field, re.compile(rf"{re.escape(label)}\s*:\s*\**\s*(-?\d+(?:\.\d+)?)\s*\**\s*/\s*{maximum}\b", re.IGNORECASE))
+    for field, label, maximum in REVIEW_SCORE_FIELDS
+)
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+
+def coerce_score(field: str, value: Any) -> Optional[float]:
+    """
+    A score as a number clamped to [0, max]; accepts 18, "18" or "18/25".
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if not isinstance(value, (int, float)):
+        match = _NUMBER.search(str(value))
+        if not match:
+            return None
+        value = float(match.group())
+    return min(max(float(value), 0.0), float(_SCORE_MAX[field]))
+
+
+def coerce_items(value: Any) -> List[str]:
+    """
+    Feedback items as a list of strings, without bullets or blank entries.
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.splitlines()
+    if not isinstance(value, list):
+        value = [value]
+    items = (_BULLET.sub("", str(item)).strip() for item in value)
+    return [item for item in items if item]
+
+
+class InterviewReview(BaseModel):
+    """
+    The structured interview review. Validation is lenient on purpose: scores
+    given as "18/25" or out of range are coerced and clamped, sections given
+    as one block of text are split into items, and missing fields stay empty
+    rather than failing the whole review.
+    """
+
+    question: str = ""
+    type: str = ""
+    difficulty: str = ""
+    clarity_score: Optional[float] = None
+    content_score: Optional[float] = None
+    professionalism_score: Optional[float] = None
+    body_language_score: Optional[float] = None
+    vocal_delivery_score: Optional[float] = None
+    total_score: Optional[float] = None
+    doing_well: List[str] = []
+    must_improve: List[str] = []
+    habits_to_keep: List[str] = []
+    action_plan: List[str] = []
+
+    @field_validator("question", "type", "difficulty", mode="before")
+    @classmethod
+    def _text(cls, value: Any) -> str:
+        return "" if value is None else str(value).strip()
+
+    @field_validator(*_SCORE_MAX, mode="before")
+    @classmethod
+    def _score(cls, value: Any, info) -> Optional[float]:
+        return coerce_score(info.field_name, value)
+
+    @field_validator(*_SECTION_FIELDS, mode="before")
+    @classmethod
+    def _items(cls, value: Any) -> List[str]:
+        return coerce_items(value)
+
+    @model_validator(mode="after")
+    def _fill_total(self) -> "InterviewReview":
+        categories = [getattr(self, field) for field in _CATEGORY_FIELDS]
+        if self.total_score is None and all(score is not None for score in categories):
+            self.total_score = float(sum(categories))
+        return self
+
+    def has_content(self) -> bool:
+        return any(getattr(self, field) is not None for field in _SCORE_MAX) or any(
+            getattr(self, section) for section in _SECTION_FIELDS
+        )
+
+
+def format_score(value: Optional[float]) -> str:
+    if value is None:
+        return ""
+    return str(int(value)) if float(value).is_integer() else f"{value:g}"
+
+
+def format_section(items: List[str]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+
+def review_fields(review: InterviewReview) -> Dict[str, str]:
+    """
+    The flat result fields analyze_interview returns: scores as strings
+    ("18"), sections as "- item" lines, as the text-layout parse produced.
+    """
+    fields = {"question": review.question, "type": review.type, "difficulty": review.difficulty}
+    for field in _SCORE_MAX:
+        fields[field] = format_score(getattr(review, field))
+    for section in _SECTION_FIELDS:
+        fields[section] = format_section(getattr(review, section))
+    return fields
+
+
+def render_review_text(review: InterviewReview) -> str:
+    """
+    Render a structured review in the text layout the results page and the
+    PDF report display as `llm_review`.
+    """
+    lines = [
+        f"QUESTION: {review.question}",
+        f"TYPE: {review.type}",
+        f"DIFFICULTY: {review.difficulty}",
+        "",
+        "CATEGORY SCORES:",
+    ]
+    for field, label, maximum in REVIEW_SCORE_FIELDS[:-1]:
+        lines.append(f"- {label}: {format_score(getattr(review, field)) or 'N/A'}/{maximum}")
+    total = review.total_score
+    lines.append("")
+    lines.append(
+        f"TOTAL SCORE: {format_score(total)}/100 ({format_score(round(total / 10, 1))}/10)"
+        if total is not None
+        else "TOTAL SCORE: N/A/100"
+    )
+    for section, heading in REVIEW_SECTIONS:
+        lines.extend(["", f"{heading}:", format_section(getattr(review, section))])
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def _json_payload(text: str) -> Optional[dict]:
+    start = text.find("{")
+    if start < 0:
+        return None
+    try:
+        payload, _ = json.JSONDecoder().raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def parse_review(text: str) -> Tuple[Optional[InterviewReview], str]:
+    """
+    Parse a review completion. JSON (optionally wrapped in prose or a code
+    fence) is validated against InterviewReview; anything else goes through
+    the single-pass text-layout parser. Returns (review, "json" | "text"),
+    or (None, "unparsed") when neither finds any scores or sections; this
+    never raises, so a malformed review never discards the transcript and
+    voice analysis it was generated from.
+    """
+    text = text or ""
+    payload = _json_payload(text)
+    if payload is not None:
+        try:
+            review = InterviewReview.model_validate(payload)
+            if review.has_content():
+                return review, "json"
+        except ValidationError:
+            pass
+    parser = ReviewStreamParser(mode="text")
+    parser.feed(text)
+    parser.finish()
+    review = parser.review()
+    return (review, "text") if review.has_content() else (None, "unparsed")
+
+
+class ReviewStreamParser:
+    """
+    Incremental parser for the streamed review. Feed it each text delta as it
+    arrives; it returns the events that became known with that delta:
+
+    - ("review_score", {"field", "label", "value", "max"}) once a score is complete,
+    - ("review_section", {"section", "heading", "text"}) once a feedback section is.
+
+    JSON output (the first non-blank character is "{") is scanned for each
+    key and its value decoded as soon as it is complete; free text is parsed
+    line by line in the layout of render_review_text. Values use the same
+    formatting as review_fields, so the frontend can render them early and
+    trust them when the final result arrives.
+    """
+
+    def __init__(self, mode: Optional[str] = None):
+        self.mode = mode
+        self._values: Dict[str, Any] = {}
+        self._text = ""
+        self._pending = ""
+        self._section: Optional[str] = None
+        self._section_lines: List[str] = []
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, delta: str) -> List[Tuple[str, Dict[str, Any]]]:
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        if self.mode is None:
+            self._text += delta
+            stripped = self._text.lstrip()
+            if not stripped:
+                return events
+            self.mode = "json" if stripped[0] in "{`" else "text"
+            delta, self._text = self._text, ""
+        if self.mode == "json":
+            self._text += delta
+            self._scan_json(events, final=False)
+            return events
+
+        self._pending += delta
+        if "\n" in self._pending:
+            *lines, self._pending = self._pending.split("\n")
+            for line in lines:
+                self._line(line, events)
+        return events
+
+    def finish(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Flush the last partial line / value and close the open section.
+        """
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        if self.mode == "json":
+            self._scan_json(events, final=True)
+            return events
+        if self._pending:
+            self._line(self._pending, events)
+            self._pending = ""
+        self._close_section(events)
+        return events
+
+    def review(self) -> InterviewReview:
+        return InterviewReview.model_validate(self._values)
+
+    def _emit(self, field: str, value: Any, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        if field in self._values:
+            return
+        # The model's own coercions, so events match the final fields.
+        if field in _SCORE_MAX:
+            self._values[field] = coerce_score(field, value)
+        elif field in _SECTION_FIELDS:
+            self._values[field] = coerce_items(value)
+        else:
+            self._values[field] = "" if value is None else str(value).strip()
+        if field in _SCORE_MAX:
+            if self._values[field] is not None:
+                events.append(("review_score", {
+                    "field": field,
+                    "label": _SCORE_LABELS[field],
+                    "value": format_score(self._values[field]),
+                    "max": _SCORE_MAX[field],
+                }))
+        elif field in _SECTION_FIELDS:
+            events.append(("review_section", {
+                "section": field,
+                "heading": _SECTION_HEADINGS[field],
+                "text": format_section(self._values[field]),
+            }))
+
+    def _scan_json(self, events: List[Tuple[str, Dict[str, Any]]], final: bool) -> None:
+        for field in (*_SCORE_MAX, *_SECTION_FIELDS, "question", "type", "difficulty"):
+            if field in self._values:
+                continue
+            key = self._text.find(f'"{field}"')
+            if key < 0:
+                continue
+            colon = self._text.find(":", key + len(field) + 2)
+            if colon < 0:
+                continue
+            start = colon + 1
+            while start < len(self._text) and self._text[start].isspace():
+                start += 1
+            try:
+                value, end = self._decoder.raw_decode(self._text, start)
+            except json.JSONDecodeError:
+                continue
+            # A number at the very end of the buffer may still be growing ("1" of "18").
+            if end >= len(self._text) and not final and not isinstance(value, (str, list, dict)):
+                continue
+            self._emit(field, value, events)
+
+    def _line(self, line: str, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        upper = line.upper()
+        for section, heading in REVIEW_SECTIONS:
+            position = upper.find(heading)
+            if position >= 0 and section not in self._values and section != self._section:
+                self._close_section(events)
+                self._section = section
+                # Keep text after the heading unless it is just "(instructions):".
+                rest = line[position + len(heading):].strip()
+                rest = re.sub(r"^\(.*?\)", "", rest).lstrip(":* ").strip()
+                self._section_lines = [rest] if rest else []
+                return
+        if self._section is not None:
+            self._section_lines.append(line)
+            return
+        for field, pattern in _SCORE_LINE_PATTERNS:
+            if field not in self._values:
+                match = pattern.search(line)
+                if match:
+                    self._emit(field, match.group(1), events)
+                    return
+        for field in ("question", "type", "difficulty"):
+            prefix = f"{field.upper()}:"
+            if field not in self._values and line.strip().upper().startswith(prefix):
+                self._values[field] = line.strip()[len(prefix):].strip()
+                return
+
+    def _close_section(self, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        if self._section is None:
+            return
+        self._emit(self._section, self._section_lines, events)
+        self._section = None
+        self._section_lines = []
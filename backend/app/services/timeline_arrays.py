@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import math
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Binary timeline encoding, used for the optional `interview_timelines_bin`
+# upload and for timelines in the SQLite results store. All little-endian:
+#   magic b"TLN1", uint32 series count, then per series:
+#   uint32 name length, UTF-8 name, uint32 point count n,
+#   n float32 timestamps (seconds), n float32 values.
+TIMELINE_BINARY_MAGIC = b"TLN1"
+TIMELINE_DTYPE = np.dtype("<f4")
+# Decimal places kept when series are serialized back to JSON; float32
+# widened to float64 would otherwise print as 0.10000000149011612.
+TIMELINE_JSON_DECIMALS = 4
+
+_U32 = struct.Struct("<I")
+
+
+class TimelineSeries:
+    """
+    One timeline (posture, eye contact, ...) as two float32 arrays:
+    timestamps in seconds and the value at each timestamp.
+    """
+
+    __slots__ = ("timestamps", "values")
+
+    def __init__(self, timestamps: Any, values: Any):
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=TIMELINE_DTYPE)
+        self.values = np.ascontiguousarray(values, dtype=TIMELINE_DTYPE)
+        if self.timestamps.shape != self.values.shape or self.timestamps.ndim != 1:
+            raise ValueError("Timeline timestamps and values must be 1-D arrays of equal length.")
+
+    def __len__(self) -> int:
+        return int(self.timestamps.size)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.timestamps.nbytes + self.values.nbytes)
+
+    @classmethod
+    def from_points(cls, points: Iterable[Any]) -> "TimelineSeries":
+        """
+        Convert the frontend's point list in one pass: {"timestamp", "percentage"}
+        dicts (or {"timeSec", "score"}), or [timestamp, value] pairs. Points
+        without a finite numeric value are dropped.
+        """
+        points = list(points or ())
+        try:
+            # Fast path: the frontend's well-formed {"timestamp", "percentage"} points.
+            timestamps = np.array([point["timestamp"] for point in points], dtype=np.float64)
+            values = np.array([point["percentage"] for point in points], dtype=np.float64)
+        except (KeyError, TypeError, ValueError):
+            return cls._from_mixed_points(points)
+        finite = np.isfinite(timestamps) & np.isfinite(values)
+        return cls(timestamps[finite], values[finite])
+
+    @classmethod
+    def _from_mixed_points(cls, points: List[Any]) -> "TimelineSeries":
+        timestamps: List[float] = []
+        values: List[float] = []
+        for index, point in enumerate(points):
+            if isinstance(point, dict):
+                timestamp = point.get("timestamp", point.get("timeSec", index))
+                value = point.get("percentage", point.get("score"))
+            elif isinstance(point, (list, tuple)) and len(point) >= 2:
+                timestamp, value = point[0], point[1]
+            else:
+                continue
+            try:
+                timestamp = float(index if timestamp is None else timestamp)
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if not (math.isfinite(timestamp) and math.isfinite(value)):
+                continue
+            timestamps.append(timestamp)
+            values.append(value)
+        return cls(timestamps, values)
+
+    def to_pairs(self) -> List[List[float]]:
+        """
+        [[timestamp, value], ...] for JSON responses.
+        """
+        stacked = np.empty((len(self), 2), dtype=np.float64)
+        stacked[:, 0] = self.timestamps
+        stacked[:, 1] = self.values
+        return np.round(stacked, TIMELINE_JSON_DECIMALS).tolist()
+
+
+def timelines_from_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert every point-list entry of a parsed `interview_timelines` payload
+    to a TimelineSeries; other entries (e.g. the voice timeline) are kept as is.
+    """
+    if not isinstance(payload, dict):
+        return {}
+    return {
+        key: TimelineSeries.from_points(value) if isinstance(value, list) else value
+        for key, value in payload.items()
+    }
+
+
+def as_series(value: Any) -> Optional[TimelineSeries]:
+    """
+    A stored timeline as a TimelineSeries; point lists stored before timelines
+    were kept as arrays are converted on read.
+    """
+    if isinstance(value, TimelineSeries):
+        return value
+    if isinstance(value, list):
+        return TimelineSeries.from_points(value)
+    return None
+
+
+def timeline_pairs(value: Any) -> List[List[float]]:
+    series = as_series(value)
+    return series.to_pairs() if series is not None else []
+
+
+def timelines_to_json(timelines: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON-safe copy of a timelines dict: every series as [timestamp, value] pairs.
+    """
+    if not isinstance(timelines, dict):
+        return {}
+    return {
+        key: value.to_pairs() if isinstance(value, TimelineSeries) else value
+        for key, value in timelines.items()
+    }
+
+
+def encode_timelines_binary(series: Dict[str, TimelineSeries]) -> bytes:
+    parts = [TIMELINE_BINARY_MAGIC, _U32.pack(len(series))]
+    for name, timeline in series.items():
+        encoded = name.encode("utf-8")
+        parts.extend((
+            _U32.pack(len(encoded)),
+            encoded,
+            _U32.pack(len(timeline)),
+            timeline.timestamps.tobytes(),
+            timeline.values.tobytes(),
+        ))
+    return b"".join(parts)
+
+
+def decode_timelines_binary(data: bytes) -> Dict[str, TimelineSeries]:
+    """
+    Parse the binary encoding; raises ValueError if it is malformed.
+    Non-finite points (NaN/inf, which JSON responses cannot carry) are dropped.
+    """
+    view = memoryview(data)
+    if bytes(view[:4]) != TIMELINE_BINARY_MAGIC:
+        raise ValueError("Not a binary timeline payload (bad magic).")
+    offset = 4
+
+    def read_u32() -> int:
+        nonlocal offset
+        if offset + 4 > len(view):
+            raise ValueError("Truncated binary timeline payload.")
+        (number,) = _U32.unpack_from(view, offset)
+        offset += 4
+        return number
+
+    series: Dict[str, TimelineSeries] = {}
+    for _ in range(read_u32()):
+        name_length = read_u32()
+        name = bytes(view[offset : offset + name_length]).decode("utf-8")
+        offset += name_length
+        count = read_u32()
+        end = offset + 2 * count * TIMELINE_DTYPE.itemsize
+        if end > len(view):
+            raise ValueError(f"Truncated binary timeline payload in series '{name}'.")
+        arrays = np.frombuffer(view[offset:end], dtype=TIMELINE_DTYPE).reshape(2, count)
+        # Boolean indexing copies, so nothing keeps a reference into `data`.
+        finite = np.isfinite(arrays).all(axis=0)
+        series[name] = TimelineSeries(arrays[0][finite], arrays[1][finite])
+        offset = end
+    return series
+
+
+def encode_timelines_blob(timelines: Dict[str, Any]) -> Tuple[str, bytes]:
+    """
+    Split a timelines dict for storage: series go into the binary encoding,
+    everything else (e.g. the voice timeline) into a JSON metadata string.
+    """
+    series = {}
+    rest = {}
+    for key, value in timelines.items():
+        converted = as_series(value)
+        if converted is not None:
+            series[key] = converted
+        else:
+            rest[key] = value
+    return json.dumps(rest, default=str), encode_timelines_binary(series)
+
+
+def decode_timelines_blob(meta: Optional[str], data: Optional[bytes]) -> Dict[str, Any]:
+    timelines: Dict[str, Any] = json.loads(meta) if meta else {}
+    if data:
+        if bytes(data[:4]) == TIMELINE_BINARY_MAGIC:
+            timelines.update(decode_timelines_binary(data))
+        else:
+            # Rows written before timelines were stored as arrays hold plain JSON.
+            timelines.update(timelines_from_payload(json.loads(bytes(data).decode("utf-8"))))
+    return timelines
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.services.timeline_arrays import TimelineSeries, as_series
+
+# The largest `max_points` a timeline request may ask for. Requests without
+# `max_points` get the full series.
+TIMELINE_MAX_POINTS_LIMIT = int(os.getenv("TIMELINE_MAX_POINTS_LIMIT", "10000"))
+# Points plotted per PDF chart (about one per horizontal pixel at 150 dpi).
+TIMELINE_CHART_MAX_POINTS = int(os.getenv("TIMELINE_CHART_MAX_POINTS", "800"))
+# Downsampled series kept per process, keyed by (result, series, resolution).
+TIMELINE_DOWNSAMPLE_CACHE_ENTRIES = int(os.getenv("TIMELINE_DOWNSAMPLE_CACHE_ENTRIES", "512"))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indices of the points Largest-Triangle-Three-Buckets keeps out of (x, y).
+
+    The first and last points are always kept; the points between them are
+    split into `max_points - 2` buckets and from each bucket the point forming
+    the largest triangle with the previously kept point and the average of the
+    next bucket is chosen. Bucket bounds and averages are computed up front;
+    only the per-bucket argmax runs in a loop, since each choice depends on the
+    previous one.
+    """
+    count = int(x.size)
+    if max_points >= count:
+        return np.arange(count)
+    if max_points < 3:
+        return np.array([0, count - 1][:max(max_points, 0)], dtype=np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    buckets = max_points - 2
+    edges = np.linspace(1, count - 1, buckets + 1).astype(np.int64)
+    sizes = np.diff(edges)
+    # Average of each bucket, then of the bucket after it (the last point for the last bucket).
+    next_x = np.append((np.add.reduceat(x[: count - 1], edges[:-1]) / sizes)[1:], x[-1])
+    next_y = np.append((np.add.reduceat(y[: count - 1], edges[:-1]) / sizes)[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = count - 1
+    anchor = 0
+    for bucket in range(buckets):
+        start, end = edges[bucket], edges[bucket + 1]
+        anchor_x, anchor_y = x[anchor], y[anchor]
+        # Twice the triangle area; the constant factor does not change the argmax.
+        areas = np.abs(
+            (anchor_x - next_x[bucket]) * (y[start:end] - anchor_y)
+            - (anchor_x - x[start:end]) * (next_y[bucket] - anchor_y)
+        )
+        anchor = start + int(np.argmax(areas))
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def downsample(series: TimelineSeries, max_points: int) -> TimelineSeries:
+    """
+    `series` reduced to at most `max_points` points with LTTB; series that
+    already fit are returned as is.
+    """
+    if len(series) <= max_points:
+        return series
+    keep = lttb_indices(series.timestamps, series.values, max_points)
+    return TimelineSeries(series.timestamps[keep], series.values[keep])
+
+
+class DownsampleCache:
+    """
+    Process-local LRU of downsampled series. Posture/eye timelines never change
+    once a result is stored, so entries need no invalidation; the point count
+    is part of the key anyway in case a series is ever replaced.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, int, int], TimelineSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, result_id: Optional[str], name: str, value: Any, max_points: int) -> Optional[TimelineSeries]:
+        series = as_series(value)
+        if series is None:
+            return None
+        if len(series) <= max_points:
+            return series
+        if not result_id or self.max_entries <= 0:
+            return downsample(series, max_points)
+
+        key = (result_id, name, max_points, len(series))
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        reduced = downsample(series, max_points)
+        with self._lock:
+            self._entries[key] = reduced
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return reduced
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_CACHE = DownsampleCache(TIMELINE_DOWNSAMPLE_CACHE_ENTRIES)
+
+
+def downsampled_timeline(
+    result_id: Optional[str],
+    name: str,
+    value: Any,
+    max_points: int,
+) -> Optional[TimelineSeries]:
+    """
+    A stored timeline (`value`, named `name` within result `result_id`)
+    downsampled to at most `max_points` points, cached per
+    (result, series, resolution). None if `value` is not a timeline.
+    """
+    return _CACHE.get(result_id, name, value, max_points)
+
+
+def downsample_cache_stats() -> Dict[str, Any]:
+    return _CACHE.stats()
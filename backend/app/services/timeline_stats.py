@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.services.timeline_arrays import as_series
+
+# Timeline values are the percentage (0-100) of frames with good posture /
+# eye contact. Points under this threshold count as "low" for the
+# time-below-threshold and longest-low-streak statistics.
+TIMELINE_LOW_SCORE_THRESHOLD = float(os.getenv("TIMELINE_LOW_SCORE_THRESHOLD", "60"))
+TIMELINE_STATS_PERCENTILES = (10, 25, 50, 75, 90)
+TIMELINE_STATS_SERIES = ("posture_timeline", "eye_timeline")
+
+
+def _round(value: float, digits: int = 2) -> float:
+    return round(float(value), digits)
+
+
+def series_stats(value: Any, threshold: float = TIMELINE_LOW_SCORE_THRESHOLD) -> Optional[Dict[str, Any]]:
+    """
+    Aggregate statistics of one timeline, in a single vectorized pass over
+    its arrays. Each point is held until the next one, so durations are
+    measured in seconds rather than points. None for an empty series.
+    """
+    series = as_series(value)
+    if series is None or not len(series):
+        return None
+    timestamps = series.timestamps.astype(np.float64)
+    values = series.values.astype(np.float64)
+    held = np.diff(timestamps, append=timestamps[-1]).clip(min=0)
+    elapsed = np.concatenate(([0.0], np.cumsum(held)))
+    duration = float(elapsed[-1])
+
+    low = values < threshold
+    # Runs of low points: +1 where a run starts, -1 one past where it ends.
+    edges = np.diff(np.concatenate(([0], low.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    streaks = elapsed[ends] - elapsed[starts]
+    longest = int(np.argmax(streaks)) if streaks.size else None
+    time_below = float(held[low].sum())
+
+    return {
+        "points": int(values.size),
+        "duration_sec": _round(duration),
+        "mean": _round(values.mean()),
+        "min": _round(values.min()),
+        "max": _round(values.max()),
+        "std": _round(values.std()),
+        "percentiles": {
+            f"p{percentile}": _round(score)
+            for percentile, score in zip(TIMELINE_STATS_PERCENTILES, np.percentile(values, TIMELINE_STATS_PERCENTILES))
+        },
+        "final": _round(values[-1]),
+        "time_below_threshold_sec": _round(time_below),
+        "pct_time_below_threshold": _round(100 * time_below / duration) if duration > 0 else 0.0,
+        "low_streaks": int(starts.size),
+        "longest_low_streak_sec": _round(streaks[longest]) if longest is not None else 0.0,
+        "longest_low_streak_start_sec": _round(timestamps[starts[longest]]) if longest is not None else None,
+    }
+
+
+def compute_timeline_stats(timelines: Dict[str, Any], threshold: float = TIMELINE_LOW_SCORE_THRESHOLD) -> Dict[str, Any]:
+    """
+    Statistics for the posture and eye-contact timelines of one submission,
+    computed once at ingest and stored with the result.
+    """
+    timelines = timelines if isinstance(timelines, dict) else {}
+    stats: Dict[str, Any] = {"low_score_threshold": threshold}
+    for name in TIMELINE_STATS_SERIES:
+        stats[name] = series_stats(timelines.get(name), threshold)
+    return stats
+
+
+def format_timeline_stats(stats: Optional[Dict[str, Any]]) -> str:
+    """
+    The statistics as prompt lines, one per timeline.
+    """
+    if not isinstance(stats, dict):
+        return "No timeline data."
+    threshold = stats.get("low_score_threshold", TIMELINE_LOW_SCORE_THRESHOLD)
+    lines = []
+    for name, label in (("posture_timeline", "Posture"), ("eye_timeline", "Eye Contact")):
+        item = stats.get(name)
+        if not item:
+            lines.append(f"{label}: no timeline data.")
+            continue
+        percentiles = item["percentiles"]
+        lines.append(
+            f"{label}: mean {item['mean']}%, median {percentiles['p50']}% "
+            f"(10th-90th percentile {percentiles['p10']}-{percentiles['p90']}%), "
+            f"below {threshold:g}% for {item['time_below_threshold_sec']}s "
+            f"({item['pct_time_below_threshold']}% of {item['duration_sec']}s), "
+            f"longest low stretch {item['longest_low_streak_sec']}s"
+        )
+    return "\n        ".join(lines)
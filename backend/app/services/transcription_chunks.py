@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import os
+from typing import Awaitable, Callable, List, Tuple
+
+import numpy as np
+import soundfile
+
+from app.services.voice_features import speech_intervals
+
+logger = logging.getLogger("uvicorn.error")
+
+# Chunked speech-to-text for long answers: recordings longer than
+# STT_CHUNK_MIN_DURATION_SEC are cut into ~STT_CHUNK_SECONDS pieces at
+# silences and transcribed STT_MAX_CONCURRENCY at a time. 0 seconds turns
+# chunking off (the whole upload goes to Whisper in one request).
+STT_CHUNK_SECONDS = float(os.getenv("STT_CHUNK_SECONDS", "60"))
+STT_CHUNK_MIN_DURATION_SEC = float(os.getenv("STT_CHUNK_MIN_DURATION_SEC", "90"))
+STT_MAX_CONCURRENCY = max(1, int(os.getenv("STT_MAX_CONCURRENCY", "4")))
+# Hard cap per chunk when speech runs on with no usable silence; FLAC at
+# 16 kHz keeps this far below Whisper's 25 MB upload limit.
+STT_CHUNK_MAX_SECONDS = 600.0
+
+# Transcribes one encoded chunk: (audio_bytes, filename) -> text.
+TranscribeChunk = Callable[[bytes, str], Awaitable[str]]
+
+
+def should_chunk(n_samples: int, sr: int) -> bool:
+    return STT_CHUNK_SECONDS > 0 and n_samples / sr > STT_CHUNK_MIN_DURATION_SEC
+
+
+def plan_chunks(
+    intervals: np.ndarray,
+    n_samples: int,
+    sr: int,
+    target_sec: float = STT_CHUNK_SECONDS,
+    max_sec: float = STT_CHUNK_MAX_SECONDS,
+) -> List[Tuple[int, int]]:
+    """
+    Contiguous [start, end) sample ranges covering the whole recording, each
+    about `target_sec` long. Cuts go in the middle of the silence between two
+    speech intervals so no word is split; a single run of speech longer than
+    `max_sec` is split evenly as a last resort.
+    """
+    target = int(target_sec * sr)
+    bounds = [0]
+    for (_, prev_end), (next_start, next_end) in zip(intervals[:-1], intervals[1:]):
+        if next_end - bounds[-1] > target:
+            bounds.append(int(prev_end + next_start) // 2)
+    bounds.append(n_samples)
+
+    limit = int(max_sec * sr)
+    chunks: List[Tuple[int, int]] = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        pieces = max(1, int(np.ceil((end - start) / limit)))
+        edges = np.linspace(start, end, pieces + 1).astype(np.int64)
+        chunks.extend((int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a)
+    return chunks
+
+
+def encode_flac(samples: np.ndarray, sr: int) -> bytes:
+    buffer = io.BytesIO()
+    soundfile.write(buffer, samples, sr, format="FLAC", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+async def transcribe_in_chunks(
+    y: np.ndarray,
+    sr: int,
+    transcribe_chunk: TranscribeChunk,
+    max_concurrency: int = STT_MAX_CONCURRENCY,
+) -> str:
+    """
+    Split decoded PCM at silences, transcribe the pieces concurrently (at most
+    `max_concurrency` requests in flight) and join the texts in order.
+    Each chunk is encoded only once it holds a slot, so at most
+    `max_concurrency` encoded chunks are in memory.
+    """
+    intervals = await asyncio.to_thread(speech_intervals, y)
+    chunks = plan_chunks(intervals, len(y), sr)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _one(index: int, start: int, end: int) -> str:
+        async with semaphore:
+            audio = await asyncio.to_thread(encode_flac, y[start:end], sr)
+            text = await transcribe_chunk(audio, f"chunk-{index:03d}.flac")
+            return (text or "").strip()
+
+    texts = await asyncio.gather(*(_one(i, start, end) for i, (start, end) in enumerate(chunks)))
+    logger.info("Transcribed %s chunks of ~%ss", len(chunks), STT_CHUNK_SECONDS)
+    return " ".join(text for text in texts if text)
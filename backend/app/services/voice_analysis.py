@@ -0,0 +1,477 @@
+import asyncio
+import logging
+import os
+import subprocess
+import shutil
+import threading
+from typing import AsyncIterator, BinaryIO, Optional
+
+import numpy as np
+
+from app.services.pitch import PITCH_ENGINE, PITCH_FRAME_LENGTH
+from app.services.voice_features import SILENCE_TOP_DB, VoiceFrameFeatures, extract_frame_features
+
+logger = logging.getLogger("uvicorn.error")
+
+VOICE_SAMPLE_RATE = 16000
+# ffmpeg emits little-endian float32 samples with `-f f32le`.
+PCM_DTYPE = np.dtype("<f4")
+# Silences between speech segments at least this long are reported as pauses;
+# shorter gaps are ordinary breaks between words.
+MIN_PAUSE_SEC = 0.3
+# Window size for the per-answer voice timeline (pitch/energy/speaking rate
+# over time). 0 turns the timeline off.
+VOICE_TIMELINE_WINDOW_SEC = float(os.getenv("VOICE_TIMELINE_WINDOW_SEC", "1.0"))
+
+
+def voice_analysis_params(pitch_engine: Optional[str] = None) -> dict:
+    """
+    Everything that changes analyze_voice_tone_from_pcm output for the same audio.
+    Cached voice results are keyed on this, so extend it when the analysis changes.
+    """
+    return {
+        "sample_rate": VOICE_SAMPLE_RATE,
+        "silence_top_db": SILENCE_TOP_DB,
+        "segments": "speech_mask",
+        "pitch": f"{pitch_engine or PITCH_ENGINE}:C2-C7:frame_length={PITCH_FRAME_LENGTH}",
+        "onsets": "onset_detect",
+        "energy": "rms",
+        "min_pause_sec": MIN_PAUSE_SEC,
+        "timeline_window_sec": VOICE_TIMELINE_WINDOW_SEC,
+    }
+
+
+_FFMPEG_NOT_FOUND = (
+    "ffmpeg not found. Either add ffmpeg to PATH, set FFMPEG_PATH to the full path "
+    "to ffmpeg.exe, or install `imageio-ffmpeg` so the backend can use a bundled ffmpeg."
+)
+
+
+# Rough WebM/Opus bitrate used to pre-size PCM buffers from the encoded size;
+# underestimating only costs a buffer doubling.
+_ESTIMATED_ENCODED_BYTES_PER_SEC = 4000
+
+
+def estimate_pcm_capacity(encoded_bytes: int) -> int:
+    """
+    Bytes of f32le PCM to preallocate for an upload of `encoded_bytes`.
+    """
+    seconds = max(10.0, encoded_bytes / _ESTIMATED_ENCODED_BYTES_PER_SEC)
+    return int(seconds * VOICE_SAMPLE_RATE * PCM_DTYPE.itemsize)
+
+
+class FFmpegNotAvailableError(RuntimeError):
+    """Raised when no ffmpeg executable can be located."""
+
+
+def _resolve_ffmpeg() -> str | None:
+    """
+    Resolve path to an ffmpeg executable.
+    Priority:
+    - FFMPEG_PATH env var (full path)
+    - PATH lookup
+    - `imageio_ffmpeg` bundled binary (pip install imageio-ffmpeg)
+    """
+    ffmpeg_env = os.getenv("FFMPEG_PATH", "").strip()
+    if ffmpeg_env and os.path.isfile(ffmpeg_env):
+        return ffmpeg_env
+
+    converter_path = shutil.which("ffmpeg") or shutil.which("avconv")
+    if converter_path:
+        return converter_path
+
+    try:
+        import imageio_ffmpeg  # type: ignore
+
+        candidate = imageio_ffmpeg.get_ffmpeg_exe()
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    except Exception:
+        return None
+
+    return None
+
+
+class PcmBuffer:
+    """
+    Growable byte buffer that decoded f32le PCM is written into as it arrives.
+    Capacity doubles when exceeded; samples() returns a float32 view of the
+    filled region without copying.
+    """
+
+    def __init__(self, capacity_bytes: int):
+        self._raw = self._allocate(max(PCM_DTYPE.itemsize, int(capacity_bytes)))
+        self._size = 0
+
+    def _allocate(self, nbytes: int) -> np.ndarray:
+        return np.empty(nbytes, dtype=np.uint8)
+
+    def _grow(self, capacity: int) -> None:
+        grown = self._allocate(capacity)
+        grown[: self._size] = self._raw[: self._size]
+        self._raw = grown
+
+    def _release(self) -> None:
+        self._raw = np.empty(0, dtype=np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return self._size
+
+    @property
+    def sample_count(self) -> int:
+        return self._size // PCM_DTYPE.itemsize
+
+    def _reserve(self, end: int) -> None:
+        if end > self._raw.size:
+            capacity = self._raw.size
+            while capacity < end:
+                capacity *= 2
+            self._grow(capacity)
+
+    def append(self, data: bytes) -> None:
+        end = self._size + len(data)
+        self._reserve(end)
+        self._raw[self._size:end] = np.frombuffer(data, dtype=np.uint8)
+        self._size = end
+
+    def fill_from(self, stream: BinaryIO, chunk_bytes: int = 1 << 16) -> None:
+        """
+        readinto() from a binary stream until EOF, with no intermediate bytes objects.
+        """
+        while True:
+            self._reserve(self._size + chunk_bytes)
+            read = stream.readinto(memoryview(self._raw)[self._size : self._size + chunk_bytes])
+            if not read:
+                return
+            self._size += read
+
+    def samples(self) -> np.ndarray:
+        return self._raw[: self.sample_count * PCM_DTYPE.itemsize].view(PCM_DTYPE)
+
+    def close(self) -> None:
+        self._release()
+        self._size = 0
+
+
+def _ffmpeg_pcm_args(ffmpeg_path: str) -> list[str]:
+    return [
+        ffmpeg_path,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        "pipe:0",
+        "-ac",
+        "1",
+        "-ar",
+        str(VOICE_SAMPLE_RATE),
+        "-f",
+        "f32le",
+        "pipe:1",
+    ]
+
+
+def _webm_to_pcm_via_ffmpeg(ffmpeg_path: str, webm_bytes: bytes, buffer: PcmBuffer) -> PcmBuffer:
+    """
+    Convert WebM/Opus bytes to raw f32le PCM at VOICE_SAMPLE_RATE using ffmpeg
+    via stdin/stdout pipes, reading stdout directly into `buffer`.
+    No WAV container, no filesystem access.
+    """
+    if not webm_bytes:
+        raise ValueError("Empty audio upload (0 bytes).")
+
+    proc = subprocess.Popen(
+        _ffmpeg_pcm_args(ffmpeg_path),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    stderr_chunks: list[bytes] = []
+
+    def feed_stdin() -> None:
+        try:
+            proc.stdin.write(webm_bytes)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    def drain_stderr() -> None:
+        stderr_chunks.append(proc.stderr.read())
+
+    # stdin and stderr are serviced on helper threads so the pipes cannot deadlock.
+    helpers = [threading.Thread(target=feed_stdin, daemon=True), threading.Thread(target=drain_stderr, daemon=True)]
+    for helper in helpers:
+        helper.start()
+    try:
+        buffer.fill_from(proc.stdout)
+    finally:
+        for helper in helpers:
+            helper.join()
+        proc.stdout.close()
+        proc.stderr.close()
+        returncode = proc.wait()
+
+    if returncode != 0 or buffer.sample_count == 0:
+        stderr = b"".join(stderr_chunks).decode("utf-8", errors="replace")[:800]
+        raise RuntimeError(f"ffmpeg conversion failed (code={returncode}). {stderr}")
+    return buffer
+
+
+async def decode_stream_to_pcm(chunks: AsyncIterator[bytes], buffer: PcmBuffer) -> PcmBuffer:
+    """
+    Pipe encoded audio chunks into one ffmpeg process (spawned per call)
+    while reading raw f32le PCM from its stdout straight into `buffer`.
+    Every chunk is consumed even if ffmpeg exits early, so a caller that
+    also keeps the chunks as they pass (read_upload_audio) still gets the
+    whole upload. ffmpeg is killed and reaped if feeding or draining fails.
+    """
+    ffmpeg_path = _resolve_ffmpeg()
+    if not ffmpeg_path:
+        async for _ in chunks:
+            pass
+        raise FFmpegNotAvailableError(_FFMPEG_NOT_FOUND)
+
+    proc = await asyncio.create_subprocess_exec(
+        *_ffmpeg_pcm_args(ffmpeg_path),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def feed_stdin() -> int:
+        fed = 0
+        stdin_open = True
+        async for chunk in chunks:
+            fed += len(chunk)
+            if not stdin_open or not chunk:
+                continue
+            try:
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                stdin_open = False
+        if stdin_open:
+            proc.stdin.close()
+        return fed
+
+    async def drain_stdout() -> None:
+        while True:
+            data = await proc.stdout.read(1 << 16)
+            if not data:
+                return
+            buffer.append(data)
+
+    try:
+        fed, _, stderr = await asyncio.gather(feed_stdin(), drain_stdout(), proc.stderr.read())
+        returncode = await proc.wait()
+    finally:
+        # Client disconnect, a failed read or cancellation: do not leave ffmpeg behind.
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+    if fed == 0:
+        raise ValueError("Empty audio upload (0 bytes).")
+    if returncode != 0 or buffer.sample_count == 0:
+        detail = (stderr or b"").decode("utf-8", errors="replace")[:800]
+        raise RuntimeError(f"ffmpeg conversion failed (code={returncode}). {detail}")
+    return buffer
+
+
+def decode_audio_to_pcm(webm_bytes: bytes) -> tuple[np.ndarray, int]:
+    """
+    Decode in-memory WebM audio bytes to mono float32 PCM at VOICE_SAMPLE_RATE.
+    Raises RuntimeError when ffmpeg is unavailable or the conversion fails.
+    """
+    ffmpeg_path = _resolve_ffmpeg()
+    if not ffmpeg_path:
+        raise FFmpegNotAvailableError(_FFMPEG_NOT_FOUND)
+
+    buffer = PcmBuffer(estimate_pcm_capacity(len(webm_bytes)))
+    _webm_to_pcm_via_ffmpeg(ffmpeg_path, webm_bytes, buffer)
+    # ffmpeg already resampled to the target rate; hand out a float32 view, no copy.
+    return buffer.samples(), VOICE_SAMPLE_RATE
+
+
+def analyze_voice_tone_from_bytes(webm_bytes: bytes) -> dict:
+    """
+    Analyze voice tone directly from in-memory WebM audio bytes.
+    No filesystem I/O is performed.
+    """
+    try:
+        y, sr = decode_audio_to_pcm(webm_bytes)
+    except FFmpegNotAvailableError as e:
+        logger.warning(str(e))
+        return {"error": "ffmpeg_not_available", "detail": str(e)}
+    except Exception as e:
+        logger.error(f"Error analyzing voice tone: {e}")
+        return {"error": str(e)}
+    return analyze_voice_tone_from_pcm(y, sr)
+
+
+def pause_stats(intervals: np.ndarray, sr: int, min_pause_sec: float = MIN_PAUSE_SEC) -> dict:
+    """
+    Pause count and durations from the gaps between consecutive speech
+    intervals. Gaps shorter than `min_pause_sec` (between words) are ignored;
+    leading and trailing silence is not a pause.
+    """
+    if len(intervals) > 1:
+        gaps = (intervals[1:, 0] - intervals[:-1, 1]) / sr
+    else:
+        gaps = np.zeros(0)
+    pauses = gaps[gaps >= min_pause_sec]
+    return {
+        "pause_count": int(len(pauses)),
+        "pause_durations_sec": [round(float(p), 2) for p in pauses],
+        "avg_pause_sec": round(float(np.mean(pauses)), 2) if len(pauses) else 0.0,
+        "longest_pause_sec": round(float(np.max(pauses)), 2) if len(pauses) else 0.0,
+        "total_pause_sec": round(float(np.sum(pauses)), 2),
+    }
+
+
+def _round_or_none(value: float, digits: int):
+    return round(float(value), digits) if np.isfinite(value) else None
+
+
+def voice_timeline(features: VoiceFrameFeatures, onset_frames: np.ndarray, window_sec: float) -> dict:
+    """
+    Pitch, energy and speaking rate averaged over fixed windows, as
+    [timestamp_sec, value] pairs (the format /results timelines use).
+    Timestamps are window starts; pitch is None for windows with no voiced frames.
+    """
+    sr, hop = features.sr, features.hop_length
+    duration = features.n_samples / sr
+    n_windows = max(1, int(np.ceil(duration / window_sec)))
+    n_frames = len(features.rms)
+
+    # Window of each frame (frame i is centered on sample i * hop), in one pass.
+    window_of = np.minimum((np.arange(n_frames) * hop / sr / window_sec).astype(np.int64), n_windows - 1)
+    frames_per_window = np.bincount(window_of, minlength=n_windows)
+
+    energy = np.bincount(window_of, weights=features.rms, minlength=n_windows)
+    energy = energy / np.maximum(frames_per_window, 1)
+
+    voiced = features.voiced_flag & np.isfinite(features.f0)
+    pitch_sum = np.bincount(window_of[voiced], weights=features.f0[voiced], minlength=n_windows)
+    pitch_count = np.bincount(window_of[voiced], minlength=n_windows)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pitch = np.where(pitch_count > 0, pitch_sum / pitch_count, np.nan)
+
+    starts = np.arange(n_windows) * window_sec
+    window_lengths = np.minimum(window_sec, duration - starts)
+    onsets_per_window = np.bincount(window_of[onset_frames], minlength=n_windows)
+    rate = onsets_per_window / np.maximum(window_lengths, 1e-9)
+
+    timestamps = [round(float(t), 2) for t in starts]
+    return {
+        "window_sec": window_sec,
+        "pitch_hz": [[t, _round_or_none(v, 2)] for t, v in zip(timestamps, pitch)],
+        "energy": [[t, round(float(v), 4)] for t, v in zip(timestamps, energy)],
+        "speaking_rate": [[t, round(float(v), 2)] for t, v in zip(timestamps, rate)],
+    }
+
+
+def analyze_voice_tone_from_pcm(
+    y: np.ndarray,
+    sr: int,
+    pitch_engine: Optional[str] = None,
+    timeline_window_sec: Optional[float] = None,
+) -> dict:
+    """
+    Analyze voice tone from decoded mono PCM samples.
+    `pitch_engine` overrides PITCH_ENGINE ("pyin" accurate, "yin" fast).
+    `timeline_window_sec` overrides VOICE_TIMELINE_WINDOW_SEC; when positive
+    the result carries a "timeline" entry (see voice_timeline).
+    """
+    try:
+        # Frame once; the speech/silence mask, pitch, onset strength and RMS all
+        # come from the shared frames. Silence is masked out rather than cut
+        # and stitched, so there is no copy and no artificial onsets at seams.
+        features = extract_frame_features(y, sr, pitch_engine=pitch_engine, top_db=SILENCE_TOP_DB)
+        speech = features.speech_mask
+        speech_samples = features.speech_samples()
+
+        if speech_samples < sr * 0.5:  # Less than 0.5 seconds of speech
+            return {"error": "Not enough speech detected"}
+
+        # 1. Pitch Analysis — speech frames only (no silence)
+        f0, voiced_flag = features.f0, features.voiced_flag
+        voiced_f0 = f0[voiced_flag & ~np.isnan(f0)]
+
+        avg_pitch = float(np.mean(voiced_f0)) if len(voiced_f0) > 0 else 0.0
+        pitch_variability = float(np.std(voiced_f0)) if len(voiced_f0) > 0 else 0.0
+
+        # Normalize pitch variability as % of mean for fairer comparison
+        pitch_variability_pct = (pitch_variability / avg_pitch * 100) if avg_pitch > 0 else 0
+
+        # 2. Speaking Rate — use onset detection (much more accurate than ZCR)
+        onset_frames = features.onset_frames()
+        onset_frames = onset_frames[speech[onset_frames]]
+        duration_voiced = speech_samples / sr
+        speaking_rate = len(onset_frames) / duration_voiced if duration_voiced > 0 else 0
+
+        # 3. Energy
+        rms = features.rms[speech]
+        avg_energy = float(np.mean(rms))
+        energy_variation = float(np.std(rms))
+
+        # 3b. Pacing — gaps between speech segments
+        pauses = pause_stats(features.speech_intervals(), sr)
+
+        # 3c. Optional time-resolved view on the same frames
+        if timeline_window_sec is None:
+            timeline_window_sec = VOICE_TIMELINE_WINDOW_SEC
+        timeline = None
+        if timeline_window_sec > 0:
+            timeline = voice_timeline(features, onset_frames, timeline_window_sec)
+
+        # 4. Pitch feedback — use gender-neutral ranges
+        if avg_pitch < 85:
+            pitch_feedback = "Very low pitch — may sound flat or disengaged."
+        elif avg_pitch < 180:
+            pitch_feedback = "Low-normal pitch — sounds calm and authoritative."
+        elif avg_pitch < 300:
+            pitch_feedback = "Normal pitch range — good for conversation."
+        else:
+            pitch_feedback = "High pitch — may sound nervous or anxious."
+
+        # 5. Monotone feedback — use % variability for accuracy
+        if pitch_variability_pct < 10:
+            monotone_feedback = "Very monotone — your pitch barely changes, which can disengage interviewers. Practice varying your tone when emphasizing key points."
+        elif pitch_variability_pct < 25:
+            monotone_feedback = "Slightly monotone — some variation present but adding more expressiveness would help keep the interviewer engaged."
+        elif pitch_variability_pct < 60:
+            monotone_feedback = "Good pitch variation — your voice sounds natural and engaging."
+        else:
+            monotone_feedback = "High pitch variation — make sure your tone stays controlled and professional."
+
+        # 6. Speaking rate feedback — onsets per second
+        if speaking_rate < 2.0:
+            rate_feedback = "Speaking too slowly — try to pick up the pace to sound more confident."
+        elif speaking_rate > 6.0:
+            rate_feedback = "Speaking too fast — slow down so the interviewer can follow you."
+        else:
+            rate_feedback = "Good speaking rate — easy to follow."
+
+        result = {
+            "avg_pitch_hz": round(avg_pitch, 2),
+            "pitch_variation": round(pitch_variability, 2),
+            "pitch_variation_pct": round(pitch_variability_pct, 2),
+            "speaking_rate": round(speaking_rate, 2),
+            "avg_energy": round(avg_energy, 4),
+            "energy_variation": round(energy_variation, 4),
+            "pitch_feedback": pitch_feedback,
+            "tone_feedback": monotone_feedback,
+            "rate_feedback": rate_feedback,
+            **pauses,
+        }
+        if timeline is not None:
+            result["timeline"] = timeline
+        return result
+    except Exception as e:
+        logger.error(f"Error analyzing voice tone: {e}")
+        return {"error": str(e)}
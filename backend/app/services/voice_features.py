@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional
+
+import librosa
+import numpy as np
+import scipy.fft
+
+from app.services.pitch import (
+    PITCH_ENGINE,
+    PITCH_FRAME_LENGTH,
+    PITCH_HOP_LENGTH,
+    YIN_THRESHOLD,
+    _yin_block,
+    estimate_pitch,
+    frame_signal,
+    running_power,
+    yin_fft_size,
+    yin_lag_range,
+)
+
+# One framing for every frame-level feature. These match librosa's defaults
+# for onset_strength / feature.rms, so the derived fields line up with the
+# values the separate librosa calls produced.
+FEATURE_FRAME_LENGTH = PITCH_FRAME_LENGTH
+FEATURE_HOP_LENGTH = PITCH_HOP_LENGTH
+ONSET_N_MELS = 128
+ONSET_TOP_DB = 80.0
+# Frames quieter than this many dB below the loudest frame count as silence
+# (the same rule and default as librosa.effects.split).
+SILENCE_TOP_DB = 30
+# Frames are transformed in blocks to bound FFT scratch memory on long clips.
+_FEATURE_BLOCK_FRAMES = 256
+# pyin has a fixed per-call cost (~80 ms) on top of ~0.17 s per second of
+# audio, so speech intervals closer than this are tracked as one span and
+# the silent frames inside it are masked afterwards.
+_PYIN_SPAN_MERGE_SEC = 0.5
+
+
+@lru_cache(maxsize=4)
+def _mel_basis(sr: int, n_fft: int) -> np.ndarray:
+    # Transposed to (n_bins, n_mels) so a block of power spectra is one matmul.
+    return np.ascontiguousarray(librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=ONSET_N_MELS).T)
+
+
+def _hann_bins(spectrum: np.ndarray, step: int) -> np.ndarray:
+    """
+    Hann-windowed DFT of each frame, derived from the spectrum of the
+    unwindowed (possibly zero-padded) frame instead of a second FFT.
+
+    Every `step`-th bin of the padded transform is the frame-length DFT X[k],
+    and a periodic Hann window is a three-tap filter in frequency:
+    0.5 * X[k] - 0.25 * (X[k - 1] + X[k + 1]).
+    """
+    quarter = spectrum[:, ::step] * 0.25
+    windowed = quarter * 2.0
+    windowed[:, 1:] -= quarter[:, :-1]
+    windowed[:, :-1] -= quarter[:, 1:]
+    # X[-1] and X[N/2 + 1] wrap to the conjugates of X[1] and X[N/2 - 1].
+    windowed[:, 0] -= np.conj(quarter[:, 1])
+    windowed[:, -1] -= np.conj(quarter[:, -2])
+    return windowed
+
+
+def _onset_envelope(mel_power: np.ndarray) -> np.ndarray:
+    """
+    librosa.onset.onset_strength from a precomputed (n_frames, n_mels) mel
+    power spectrogram: dB, positive first difference, mean over bands, and
+    the same lag/centering shift.
+    """
+    n_frames = mel_power.shape[0]
+    mel_db = 10.0 * np.log10(np.maximum(mel_power, 1e-10))
+    mel_db = np.maximum(mel_db, mel_db.max() - ONSET_TOP_DB)
+    flux = np.maximum(0.0, mel_db[1:] - mel_db[:-1]).mean(axis=1)
+    shift = 1 + FEATURE_FRAME_LENGTH // (2 * FEATURE_HOP_LENGTH)
+    return np.concatenate([np.zeros(shift), flux])[:n_frames]
+
+
+def nonsilent_frames(rms: np.ndarray, top_db: float = SILENCE_TOP_DB) -> np.ndarray:
+    """
+    librosa.effects.split's silence test applied to precomputed RMS frames:
+    a frame is speech when it is within `top_db` of the loudest frame.
+    """
+    if rms.size == 0:
+        return np.zeros(0, dtype=bool)
+    db = 20.0 * np.log10(np.maximum(rms, 1e-5)) - 20.0 * np.log10(max(float(rms.max()), 1e-5))
+    return db > -top_db
+
+
+def frame_rms(y: np.ndarray) -> np.ndarray:
+    """
+    RMS of each frame on the shared frame grid, without the spectral work of
+    extract_frame_features. Enough to find speech intervals.
+    """
+    frames = frame_signal(np.asarray(y, dtype=np.float32), FEATURE_FRAME_LENGTH, FEATURE_HOP_LENGTH)
+    rms = np.empty(frames.shape[0])
+    for start in range(0, frames.shape[0], _FEATURE_BLOCK_FRAMES):
+        block = frames[start : start + _FEATURE_BLOCK_FRAMES].astype(np.float64)
+        rms[start : start + len(block)] = np.sqrt(np.einsum("ij,ij->i", block, block) / FEATURE_FRAME_LENGTH)
+    return rms
+
+
+def speech_intervals(y: np.ndarray, top_db: float = SILENCE_TOP_DB) -> np.ndarray:
+    """
+    [start, end) sample intervals of speech in `y`, as librosa.effects.split
+    (and the voice analysis speech mask) would find them.
+    """
+    return mask_to_intervals(nonsilent_frames(frame_rms(y), top_db), FEATURE_HOP_LENGTH, len(y))
+
+
+def mask_to_intervals(mask: np.ndarray, hop_length: int, n_samples: int) -> np.ndarray:
+    """
+    (n, 2) array of [start, end) sample intervals covering each run of True
+    frames, matching the intervals librosa.effects.split returns.
+    """
+    padded = np.concatenate([[False], mask, [False]]).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded)) * hop_length
+    return np.minimum(edges, n_samples).reshape(-1, 2)
+
+
+class VoiceFrameFeatures:
+    """
+    Frame-level features for one signal, all on the same hop grid.
+    `speech_mask` marks non-silent frames; pitch is only reported inside it.
+    """
+
+    def __init__(
+        self,
+        sr: int,
+        n_samples: int,
+        rms: np.ndarray,
+        onset_envelope: np.ndarray,
+        speech_mask: np.ndarray,
+        f0: np.ndarray,
+        voiced_flag: np.ndarray,
+    ):
+        self.sr = sr
+        self.n_samples = n_samples
+        self.hop_length = FEATURE_HOP_LENGTH
+        self.rms = rms
+        self.onset_envelope = onset_envelope
+        self.speech_mask = speech_mask
+        self.f0 = f0
+        self.voiced_flag = voiced_flag
+
+    def speech_intervals(self) -> np.ndarray:
+        return mask_to_intervals(self.speech_mask, self.hop_length, self.n_samples)
+
+    def speech_samples(self) -> int:
+        intervals = self.speech_intervals()
+        return int(np.sum(intervals[:, 1] - intervals[:, 0]))
+
+    def onset_frames(self) -> np.ndarray:
+        """
+        Onset frame indices, peak-picked exactly as librosa.onset.onset_detect does.
+        """
+        return librosa.onset.onset_detect(
+            onset_envelope=self.onset_envelope,
+            sr=self.sr,
+            hop_length=self.hop_length,
+        )
+
+    def onset_times(self) -> np.ndarray:
+        return librosa.frames_to_time(self.onset_frames(), sr=self.sr, hop_length=self.hop_length)
+
+
+def merge_close_intervals(intervals: np.ndarray, max_gap: int) -> np.ndarray:
+    """
+    Join consecutive [start, end) intervals separated by fewer than `max_gap` samples.
+    """
+    if len(intervals) < 2:
+        return intervals
+    breaks = (intervals[1:, 0] - intervals[:-1, 1]) >= max_gap
+    starts = intervals[np.concatenate([[True], breaks]), 0]
+    ends = intervals[np.concatenate([breaks, [True]]), 1]
+    return np.stack([starts, ends], axis=1)
+
+
+def _pitch_by_interval(
+    y: np.ndarray, sr: int, intervals: np.ndarray, n_frames: int, engine: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run a pitch engine that frames internally (pyin) on each speech span as
+    a view of `y`, and scatter the results onto the shared frame grid.
+    Intervals start on hop boundaries, so local frame j is global frame
+    start // hop + j.
+    """
+    f0 = np.full(n_frames, np.nan)
+    voiced_flag = np.zeros(n_frames, dtype=bool)
+    spans = merge_close_intervals(intervals, int(_PYIN_SPAN_MERGE_SEC * sr))
+    for start, end in spans:
+        segment_f0, segment_voiced = estimate_pitch(y[start:end], sr, engine=engine)
+        first = int(start) // FEATURE_HOP_LENGTH
+        count = min(len(segment_f0), n_frames - first)
+        f0[first : first + count] = segment_f0[:count]
+        voiced_flag[first : first + count] = segment_voiced[:count]
+    return f0, voiced_flag
+
+
+def extract_frame_features(
+    y: np.ndarray,
+    sr: int,
+    pitch_engine: Optional[str] = None,
+    top_db: float = SILENCE_TOP_DB,
+) -> VoiceFrameFeatures:
+    """
+    Frame `y` once and derive RMS, onset strength, the speech/silence mask
+    and pitch from the shared frames. Each block of frames gets a single FFT:
+    with the "yin" engine it feeds both the YIN autocorrelation and the mel
+    spectrogram, and the running sum of squares feeds both YIN's window
+    energies and RMS. pyin frames the signal internally, so it runs on each
+    speech interval as a view of `y`; its own framing and autocorrelation
+    are ~1-2% of its cost next to Viterbi decoding, so with the default pyin
+    engine the shared pass saves no measurable CPU. Silence is never cut out
+    and stitched back together, so the signal is not copied and no onsets
+    appear at seams.
+    """
+    engine = (pitch_engine or PITCH_ENGINE).lower()
+    y = np.asarray(y, dtype=np.float32)
+    frames = frame_signal(y, FEATURE_FRAME_LENGTH, FEATURE_HOP_LENGTH)
+    n_frames = frames.shape[0]
+
+    use_yin = engine == "yin"
+    if use_yin:
+        tau_min, tau_max = yin_lag_range(sr)
+        n_fft = yin_fft_size(FEATURE_FRAME_LENGTH, tau_max)
+    else:
+        n_fft = FEATURE_FRAME_LENGTH
+    step = n_fft // FEATURE_FRAME_LENGTH
+    mel_basis = _mel_basis(sr, FEATURE_FRAME_LENGTH)
+
+    rms = np.empty(n_frames)
+    mel_power = np.empty((n_frames, ONSET_N_MELS))
+    f0_parts = []
+    voiced_parts = []
+    for start in range(0, n_frames, _FEATURE_BLOCK_FRAMES):
+        stop = min(start + _FEATURE_BLOCK_FRAMES, n_frames)
+        block = np.ascontiguousarray(frames[start:stop])
+        spectrum = scipy.fft.rfft(block, n=n_fft, axis=1)
+        power = running_power(block)
+
+        rms[start:stop] = np.sqrt(power[:, -1] / FEATURE_FRAME_LENGTH)
+        windowed = _hann_bins(spectrum, step)
+        mel_power[start:stop] = (windowed.real ** 2 + windowed.imag ** 2) @ mel_basis
+
+        if use_yin:
+            f0_block, voiced_block = _yin_block(
+                block, sr, tau_min, tau_max, YIN_THRESHOLD, spectrum=spectrum, power=power
+            )
+            f0_parts.append(f0_block)
+            voiced_parts.append(voiced_block)
+
+    speech_mask = nonsilent_frames(rms, top_db)
+    if use_yin:
+        f0 = np.concatenate(f0_parts)
+        voiced_flag = np.concatenate(voiced_parts) & speech_mask
+        f0[~voiced_flag] = np.nan
+    else:
+        intervals = mask_to_intervals(speech_mask, FEATURE_HOP_LENGTH, y.size)
+        f0, voiced_flag = _pitch_by_interval(y, sr, intervals, n_frames, engine)
+        voiced_flag &= speech_mask
+        f0[~voiced_flag] = np.nan
+
+    return VoiceFrameFeatures(
+        sr, y.size, rms, _onset_envelope(mel_power), speech_mask, f0, voiced_flag
+    )
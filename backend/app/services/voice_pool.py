@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+
+from app.services.voice_analysis import PcmBuffer, analyze_voice_tone_from_pcm
+from app.services.voice_features import extract_frame_features
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _default_worker_count() -> int:
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+# Number of dedicated voice-analysis processes. 0 runs analysis on a thread
+# in the API process instead (useful for debugging or tiny deployments).
+VOICE_POOL_WORKERS = int(os.getenv("VOICE_POOL_WORKERS", str(_default_worker_count())))
+
+_VOICE_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _warm_worker() -> None:
+    """
+    Process initializer: import librosa/numba once and run the feature pass
+    (configured pitch engine plus onset peak picking) on a short synthetic
+    tone so the JIT-compiled kernels are ready before the first real
+    interview lands on this worker.
+    """
+    sr = 16000
+    t = np.arange(sr, dtype=np.float32) / sr
+    tone = (0.5 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+    extract_frame_features(tone, sr).onset_times()
+
+
+def _ping() -> bool:
+    return True
+
+
+def _log_ping_failure(future: Future) -> None:
+    # Runs on the executor's management thread once the warm-up ping settles.
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Voice analysis pool worker failed to start: %r", exc)
+
+
+def _analyze_shared_pcm(shm_name: str, length: int, sr: int) -> Dict[str, Any]:
+    """
+    Worker entrypoint: attach to the parent's shared-memory block and analyze
+    the float32 samples in place (no pickled audio crosses the process boundary).
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        y = np.ndarray((length,), dtype=np.float32, buffer=shm.buf)
+        try:
+            return analyze_voice_tone_from_pcm(y, sr)
+        finally:
+            # Drop the view before closing, otherwise the buffer stays exported.
+            del y
+    finally:
+        shm.close()
+
+
+class SharedPcmBuffer(PcmBuffer):
+    """
+    PcmBuffer backed by a SharedMemory block, so the decoder writes samples
+    where the pool workers will read them and no hand-off copy is needed.
+    """
+
+    def __init__(self, capacity_bytes: int):
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        super().__init__(capacity_bytes)
+
+    @property
+    def shm_name(self) -> str:
+        return self._shm.name
+
+    def _allocate(self, nbytes: int) -> np.ndarray:
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        return np.ndarray((nbytes,), dtype=np.uint8, buffer=self._shm.buf)
+
+    def _grow(self, capacity: int) -> None:
+        previous = self._shm
+        super()._grow(capacity)
+        # The old view is gone once _raw is replaced, so the block can be freed.
+        _close_shared(previous)
+
+    def _release(self) -> None:
+        super()._release()
+        if self._shm is not None:
+            _close_shared(self._shm)
+            self._shm = None
+
+
+def _close_shared(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # A caller still holds a numpy view; the mapping is freed once it is collected.
+        pass
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def new_pcm_buffer(capacity_bytes: int) -> PcmBuffer:
+    """
+    Allocate a decode buffer: shared memory when the pool is enabled,
+    plain process memory otherwise.
+    """
+    if VOICE_POOL_WORKERS > 0:
+        return SharedPcmBuffer(capacity_bytes)
+    return PcmBuffer(capacity_bytes)
+
+
+def start_voice_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Create the voice-analysis process pool (idempotent) and spawn its workers
+    so they warm up in the background.
+    """
+    global _VOICE_POOL
+    if _VOICE_POOL is not None or VOICE_POOL_WORKERS <= 0:
+        return _VOICE_POOL
+
+    _VOICE_POOL = ProcessPoolExecutor(
+        max_workers=VOICE_POOL_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_worker,
+    )
+    # Workers are spawned on demand; submit one no-op per slot to start them now.
+    # A worker that dies while warming up breaks the pool; log it rather than
+    # dropping the ping's exception (the next job then recreates the pool).
+    for _ in range(VOICE_POOL_WORKERS):
+        _VOICE_POOL.submit(_ping).add_done_callback(_log_ping_failure)
+    logger.info("Voice analysis pool started with %s workers", VOICE_POOL_WORKERS)
+    return _VOICE_POOL
+
+
+def _replace_broken_pool(broken: ProcessPoolExecutor) -> Optional[ProcessPoolExecutor]:
+    """
+    Discard a pool whose worker died (crash, OOM kill) and start a fresh one.
+    Callers that hit the same broken pool concurrently all get the one
+    replacement.
+    """
+    global _VOICE_POOL
+    if _VOICE_POOL is broken:
+        _VOICE_POOL = None
+        broken.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Voice analysis pool broke (a worker died); starting a new one")
+    return start_voice_pool()
+
+
+def shutdown_voice_pool() -> None:
+    global _VOICE_POOL
+    if _VOICE_POOL is None:
+        return
+    _VOICE_POOL.shutdown(wait=True, cancel_futures=True)
+    _VOICE_POOL = None
+
+
+async def _run_in_pool(pool: ProcessPoolExecutor, fn: Callable[..., Dict[str, Any]], *args: Any) -> Dict[str, Any]:
+    """
+    Run `fn` on the pool; if the pool turns out to be broken, replace it and
+    retry once. A second failure (e.g. the same input killing the new
+    worker too) is raised to the caller.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        pool = _replace_broken_pool(pool)
+        return await loop.run_in_executor(pool, fn, *args)
+
+
+async def analyze_voice_in_pool(pcm: Union[np.ndarray, PcmBuffer], sr: int) -> Dict[str, Any]:
+    """
+    Run voice tone analysis for decoded PCM on the process pool.
+    A SharedPcmBuffer is handed to the worker by name with no copy; plain
+    arrays are copied into a temporary shared block first.
+    Falls back to a worker thread when the pool is disabled.
+    """
+    pool = start_voice_pool()
+    if pool is None:
+        y = pcm.samples() if isinstance(pcm, PcmBuffer) else pcm
+        return await asyncio.to_thread(analyze_voice_tone_from_pcm, y, sr)
+
+    if isinstance(pcm, SharedPcmBuffer):
+        return await _run_in_pool(pool, _analyze_shared_pcm, pcm.shm_name, pcm.sample_count, sr)
+
+    y = pcm.samples() if isinstance(pcm, PcmBuffer) else pcm
+
+    samples = np.ascontiguousarray(y, dtype=np.float32)
+    if samples.size == 0:
+        return analyze_voice_tone_from_pcm(samples, sr)
+
+    shm = shared_memory.SharedMemory(create=True, size=samples.nbytes)
+    try:
+        shared = np.ndarray(samples.shape, dtype=np.float32, buffer=shm.buf)
+        shared[:] = samples
+        del shared
+        return await _run_in_pool(pool, _analyze_shared_pcm, shm.name, samples.size, sr)
+    finally:
+        shm.close()
+        shm.unlink()
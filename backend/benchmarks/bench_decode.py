@@ -0,0 +1,111 @@
+"""
+Decode-stage benchmark: WAV container + librosa.load (previous path) versus
+raw f32le from ffmpeg read straight into a preallocated float32 buffer
+(current path).
+
+Synthetic speech-like WebM/Opus clips are generated with ffmpeg, then each
+decoder is timed and its peak allocation measured with tracemalloc (this
+counts preallocated-but-untouched buffer capacity, so it overstates RSS for
+the f32le path).
+
+Run from backend/:
+    python -m benchmarks.bench_decode
+    python -m benchmarks.bench_decode --durations 30 120 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import librosa
+import numpy as np
+
+from app.services.voice_analysis import VOICE_SAMPLE_RATE, _resolve_ffmpeg, decode_audio_to_pcm
+
+
+def make_clip(ffmpeg_path: str, seconds: int) -> bytes:
+    """
+    Encode a pitch-modulated, amplitude-gated tone as WebM/Opus, roughly
+    what MediaRecorder produces for a spoken answer.
+    """
+    source = f"sine=frequency=160:duration={seconds}:sample_rate=48000"
+    filters = "vibrato=f=4:d=0.3,apulsator=hz=1.5:amount=0.9,volume=0.5"
+    proc = subprocess.run(
+        [
+            ffmpeg_path, "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", source,
+            "-af", filters,
+            "-c:a", "libopus", "-b:a", "32k",
+            "-f", "webm", "pipe:1",
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return proc.stdout
+
+
+def legacy_decode(ffmpeg_path: str, webm_bytes: bytes) -> np.ndarray:
+    """The pre-f32le path: ffmpeg -> WAV bytes -> BytesIO -> librosa.load."""
+    proc = subprocess.run(
+        [
+            ffmpeg_path, "-hide_banner", "-loglevel", "error",
+            "-i", "pipe:0", "-ac", "1", "-ar", str(VOICE_SAMPLE_RATE),
+            "-f", "wav", "pipe:1",
+        ],
+        input=webm_bytes,
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    y, _ = librosa.load(io.BytesIO(proc.stdout), sr=VOICE_SAMPLE_RATE)
+    return y
+
+
+def current_decode(ffmpeg_path: str, webm_bytes: bytes) -> np.ndarray:
+    y, _ = decode_audio_to_pcm(webm_bytes)
+    return y
+
+
+def measure(fn, *args, repeat: int) -> tuple[float, float, int]:
+    timings = []
+    peak = 0
+    samples = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        y = fn(*args)
+        timings.append(time.perf_counter() - started)
+        _, run_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak = max(peak, run_peak)
+        samples = len(y)
+        del y
+    return statistics.median(timings), peak / (1024 * 1024), samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--durations", type=int, nargs="+", default=[30, 120, 600], help="clip lengths in seconds")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ffmpeg_path = _resolve_ffmpeg()
+    if not ffmpeg_path:
+        raise SystemExit("ffmpeg is required for this benchmark.")
+
+    # Warm up librosa/soundfile imports so they are not billed to the first clip.
+    legacy_decode(ffmpeg_path, make_clip(ffmpeg_path, 1))
+
+    print(f"{'clip':>6} {'decoder':<22} {'median s':>9} {'peak alloc MiB':>15} {'samples':>10}")
+    for seconds in args.durations:
+        clip = make_clip(ffmpeg_path, seconds)
+        for name, fn in (("wav+librosa.load", legacy_decode), ("f32le+readinto", current_decode)):
+            elapsed, peak_mib, samples = measure(fn, ffmpeg_path, clip, repeat=args.repeat)
+            print(f"{seconds:>5}s {name:<22} {elapsed:>9.3f} {peak_mib:>15.1f} {samples:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Timeline downsampling benchmark (app.services.timeline_downsample).
+
+For sessions of the given lengths at 30 fps it reports:
+- LTTB time: a plain-Python reference vs the numpy version (and that both
+  keep the same points),
+- /results/posture_timeline payload size at full resolution vs max_points,
+- per-request serving: full pairs vs downsampling on a cache miss vs a hit,
+- PDF chart drawing time for all points vs TIMELINE_CHART_MAX_POINTS.
+
+Run from backend/:
+    python -m benchmarks.bench_downsample
+    python -m benchmarks.bench_downsample --minutes 5 30 60 --max-points 1000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+
+from app.services.pdf_report import generate_timeline_chart
+from app.services.timeline_arrays import TimelineSeries
+from app.services.timeline_downsample import (
+    TIMELINE_CHART_MAX_POINTS,
+    DownsampleCache,
+    downsample,
+    lttb_indices,
+)
+
+
+def reference_lttb(x: list, y: list, threshold: int) -> list:
+    """
+    Straightforward per-point LTTB, as usually written.
+    """
+    count = len(x)
+    every = (count - 2) / (threshold - 2)
+    selected = [0]
+    anchor = 0
+    for bucket in range(threshold - 2):
+        avg_start = int((bucket + 1) * every) + 1
+        avg_end = min(int((bucket + 2) * every) + 1, count)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        best_area = -1.0
+        best = start
+        for index in range(start, end):
+            area = abs((x[anchor] - avg_x) * (y[index] - y[anchor]) - (x[anchor] - x[index]) * (avg_y - y[anchor]))
+            if area > best_area:
+                best_area = area
+                best = index
+        selected.append(best)
+        anchor = best
+    selected.append(count - 1)
+    return selected
+
+
+def make_series(minutes: float, fps: int, rng: np.random.Generator) -> TimelineSeries:
+    count = int(minutes * 60 * fps)
+    timestamps = np.arange(count) / fps
+    values = np.clip(70 + np.cumsum(rng.normal(0, 0.5, count)), 0, 100).round()
+    return TimelineSeries(timestamps, values)
+
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[5, 30])
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--max-points", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    for minutes in args.minutes:
+        series = make_series(minutes, args.fps, rng)
+        x = series.timestamps.astype(np.float64)
+        y = series.values.astype(np.float64)
+        x_list, y_list = x.tolist(), y.tolist()
+
+        fast = lttb_indices(series.timestamps, series.values, args.max_points)
+        reference = reference_lttb(x_list, y_list, args.max_points)
+        matching = float(np.mean(fast == np.asarray(reference)))
+
+        print(f"\n{minutes:g} min at {args.fps} fps: {len(series)} points -> max_points {args.max_points}")
+        print(
+            f"  LTTB ms      reference {median_ms(lambda: reference_lttb(x_list, y_list, args.max_points), 1):>8.2f}"
+            f"   numpy {median_ms(lambda: lttb_indices(series.timestamps, series.values, args.max_points), args.repeat):>7.2f}"
+            f"   (same points {matching:.1%})"
+        )
+
+        full_body = json.dumps({"ok": True, "posture_timeline": series.to_pairs()})
+        reduced_body = json.dumps({"ok": True, "posture_timeline": downsample(series, args.max_points).to_pairs()})
+        print(f"  payload      full {len(full_body) / 1024:>9.0f} KiB   downsampled {len(reduced_body) / 1024:>7.0f} KiB")
+
+        def serve_miss():
+            cache = DownsampleCache(8)
+            return json.dumps({"ok": True, "posture_timeline": cache.get("r", "posture_timeline", series, args.max_points).to_pairs()})
+
+        warm = DownsampleCache(8)
+        warm.get("r", "posture_timeline", series, args.max_points)
+
+        def serve_hit():
+            return json.dumps({"ok": True, "posture_timeline": warm.get("r", "posture_timeline", series, args.max_points).to_pairs()})
+
+        print(
+            f"  serve ms     full {median_ms(lambda: json.dumps({'ok': True, 'posture_timeline': series.to_pairs()}), args.repeat):>9.2f}"
+            f"   miss {median_ms(serve_miss, args.repeat):>7.2f}   hit {median_ms(serve_hit, args.repeat):>7.2f}"
+        )
+
+        chart_points = downsample(series, TIMELINE_CHART_MAX_POINTS)
+        print(
+            f"  PDF chart ms full {median_ms(lambda: generate_timeline_chart(series, 'Posture', '#10b981'), 3):>9.1f}"
+            f"   {TIMELINE_CHART_MAX_POINTS} points {median_ms(lambda: generate_timeline_chart(chart_points, 'Posture', '#10b981'), 3):>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Frame-feature benchmark: pitch, onset detection and RMS as three separate
+librosa/pitch calls (each re-framing and re-transforming the signal, the
+previous path) versus the single shared pass in app.services.voice_features.
+
+For each pitch engine, the configured default (PITCH_ENGINE, pyin unless
+set) first, it reports median CPU time per clip for both paths, how much of
+the separate pass is the pitch tracker itself, and the largest deviation of
+the derived voice fields (onset count, mean/std RMS, mean f0) between the
+two paths.
+
+With pyin the saving is small: pyin spends nearly all of its time in Viterbi
+decoding, which shared framing cannot remove (its own framing and
+autocorrelation are about 1-2% of the call), so only the onset and RMS work
+is saved. With yin the tracker's FFTs and window energies are shared too.
+
+Run from backend/:
+    python -m benchmarks.bench_features
+    python -m benchmarks.bench_features --durations 30 120 --engines yin
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import librosa
+import numpy as np
+
+from app.services.pitch import PITCH_ENGINE, PITCH_ENGINES, estimate_pitch
+from app.services.voice_analysis import VOICE_SAMPLE_RATE
+from app.services.voice_features import extract_frame_features
+
+
+def make_clip(sr: int, seconds: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Harmonic tone with vibrato, gated into ~2 syllables/s, over light noise.
+    """
+    t = np.arange(sr * seconds) / sr
+    f0 = 150.0 * 2 ** (2.0 * np.sin(2 * np.pi * 0.5 * t) / 12)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum((0.6 / k) * np.sin(k * phase) for k in range(1, 6))
+    y = y * (np.sin(2 * np.pi * 2.0 * t) > -0.2) + 0.02 * rng.standard_normal(t.size)
+    return (0.4 * y / np.max(np.abs(y))).astype(np.float32)
+
+
+def separate_pass(y: np.ndarray, sr: int, engine: str) -> tuple[dict, float]:
+    started = time.process_time()
+    f0, voiced_flag = estimate_pitch(y, sr, engine=engine)
+    pitch_s = time.process_time() - started
+    onsets = librosa.onset.onset_detect(y=y, sr=sr, units='time')
+    rms = librosa.feature.rms(y=y)
+    return summarize(f0, voiced_flag, onsets, rms), pitch_s
+
+
+def shared_pass(y: np.ndarray, sr: int, engine: str) -> dict:
+    features = extract_frame_features(y, sr, pitch_engine=engine)
+    return summarize(features.f0, features.voiced_flag, features.onset_times(), features.rms)
+
+
+def summarize(f0, voiced_flag, onsets, rms) -> dict:
+    voiced_f0 = f0[voiced_flag & ~np.isnan(f0)]
+    return {
+        "onsets": len(onsets),
+        "avg_energy": float(np.mean(rms)),
+        "energy_variation": float(np.std(rms)),
+        "avg_pitch_hz": float(np.mean(voiced_f0)) if len(voiced_f0) else 0.0,
+    }
+
+
+def cpu_time(fn, *args, repeat: int) -> tuple[float, object]:
+    timings = []
+    result = {}
+    for _ in range(repeat):
+        started = time.process_time()
+        result = fn(*args)
+        timings.append(time.process_time() - started)
+    return statistics.median(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--durations", type=int, nargs="+", default=[30, 120, 300], help="clip lengths in seconds")
+    default_engines = [PITCH_ENGINE] + [engine for engine in PITCH_ENGINES if engine != PITCH_ENGINE]
+    parser.add_argument("--engines", nargs="+", default=default_engines, choices=PITCH_ENGINES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sr = VOICE_SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    # JIT-compile numba kernels (pyin, peak picking) before timing anything.
+    warm = make_clip(sr, 1, rng)
+    for engine in args.engines:
+        separate_pass(warm, sr, engine)
+        shared_pass(warm, sr, engine)
+
+    print(f"default engine: {PITCH_ENGINE}")
+    print(
+        f"{'clip':>6} {'engine':<6} {'separate cpu s':>15} {'of it pitch':>12} {'shared cpu s':>13} {'saved':>7}"
+        "  max field deviation"
+    )
+    for seconds in args.durations:
+        y = make_clip(sr, seconds, rng)
+        for engine in args.engines:
+            # pyin is slow; one run per long clip is plenty to see the difference.
+            repeat = 1 if engine == "pyin" and seconds > 60 else args.repeat
+            separate_s, (expected, pitch_s) = cpu_time(separate_pass, y, sr, engine, repeat=repeat)
+            shared_s, actual = cpu_time(shared_pass, y, sr, engine, repeat=repeat)
+            deviation = ", ".join(
+                f"{key}={abs(actual[key] - expected[key]):.2g}" for key in expected
+            )
+            saved = (separate_s - shared_s) / separate_s * 100 if separate_s else 0.0
+            pitch_share = pitch_s / separate_s * 100 if separate_s else 0.0
+            print(
+                f"{seconds:>5}s {engine:<6} {separate_s:>15.3f} {pitch_share:>11.0f}% {shared_s:>13.3f} "
+                f"{saved:>6.1f}%  {deviation}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+PDF report benchmark: rendering on the event loop (the old endpoint) against
+the PDF worker pool, and the cost of a repeat download.
+
+While reports render it runs a probe task that wakes every 5 ms and records
+how late it was, i.e. how long any other request would have stalled. It
+then times, for one result:
+- a cold render on the pool,
+- a repeat download served from the results store (same etag),
+- computing the etag itself (what a 304 revalidation costs).
+
+Run from backend/:
+    python -m benchmarks.bench_pdf
+    python -m benchmarks.bench_pdf --reports 8 --minutes 30
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import numpy as np
+
+from app.services import pdf_pool
+from app.services.pdf_report import build_interview_pdf, pdf_etag
+from app.services.review_parser import parse_review, render_review_text
+from app.services.timeline_arrays import TimelineSeries
+from app.services.timeline_downsample import TIMELINE_CHART_MAX_POINTS, downsample
+from app.services.timeline_stats import compute_timeline_stats
+from benchmarks.bench_review_stream import SAMPLE_JSON_REVIEW
+
+TRANSCRIPT_SENTENCE = (
+    "In my last role our team disagreed about whether to ship a feature before the load tests were finished, "
+    "so I set up a short meeting, laid out the risks and we agreed on a staged rollout. "
+)
+
+
+def sample_report(result_id: str, minutes: float, rng: np.random.Generator):
+    """
+    A stored result shaped like /analyze's combined results, plus its
+    posture/eye timelines downsampled for charting as the endpoint does.
+    """
+    count = int(minutes * 60 * 30)
+    timestamps = np.arange(count) / 30
+    timelines = {
+        name: TimelineSeries(timestamps, np.clip(70 + np.cumsum(rng.normal(0, 0.5, count)), 0, 100))
+        for name in ("posture_timeline", "eye_timeline")
+    }
+    review, _ = parse_review(SAMPLE_JSON_REVIEW)
+    data = {
+        "result_id": result_id,
+        "vision_summary": {"postureGoodPct": 81, "eyeGoodPct": 67},
+        "timeline_stats": compute_timeline_stats(timelines),
+        "voice_analysis": {
+            "avg_pitch_hz": 171.4,
+            "pitch_feedback": "Natural, comfortable range.",
+            "tone_feedback": "Good variation; you sound engaged.",
+            "speaking_rate": 2.6,
+            "rate_feedback": "Comfortable pace.",
+        },
+        "transcription_analysis": TRANSCRIPT_SENTENCE * 12,
+        "llm_review": render_review_text(review),
+    }
+    eye = downsample(timelines["eye_timeline"], TIMELINE_CHART_MAX_POINTS)
+    posture = downsample(timelines["posture_timeline"], TIMELINE_CHART_MAX_POINTS)
+    return data, eye, posture
+
+
+async def measure_stall(render, reports) -> tuple:
+    """
+    Run `render` for every report while a 5 ms probe measures loop lateness.
+    Returns (wall seconds, max probe lateness in ms).
+    """
+    lateness = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            expected = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            lateness.append(max(0.0, time.perf_counter() - expected))
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(0.02)
+    started = time.perf_counter()
+    await asyncio.gather(*(render(*report) for report in reports))
+    wall = time.perf_counter() - started
+    done.set()
+    await probe_task
+    return wall, max(lateness) * 1000
+
+
+async def run(args) -> None:
+    rng = np.random.default_rng(0)
+    reports = [sample_report(f"bench-{index}", args.minutes, rng) for index in range(args.reports)]
+
+    async def inline(data, eye, posture):
+        # What the old async endpoint did: build on the event loop.
+        return build_interview_pdf(data, eye, posture)
+
+    pdf_pool.start_pdf_pool()
+    # Let the workers finish their warm-up render before timing.
+    await pdf_pool.render_interview_pdf(*reports[0])
+
+    print(f"{args.reports} reports, {args.minutes:g} min timelines, {pdf_pool.PDF_POOL_WORKERS} pool workers")
+    wall, stall = await measure_stall(inline, reports)
+    print(f"  on the event loop   wall {wall * 1000:>8.0f} ms   max loop stall {stall:>8.1f} ms")
+    wall, stall = await measure_stall(pdf_pool.render_interview_pdf, reports)
+    print(f"  on the PDF pool     wall {wall * 1000:>8.0f} ms   max loop stall {stall:>8.1f} ms")
+
+    data, eye, posture = reports[0]
+    etag = pdf_etag(data, eye, posture)
+    started = time.perf_counter()
+    _, cached = await pdf_pool.cached_interview_pdf("bench-0", etag, data, eye, posture)
+    cold = time.perf_counter() - started
+    repeat = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        _, cached = await pdf_pool.cached_interview_pdf("bench-0", etag, data, eye, posture)
+        repeat.append(time.perf_counter() - started)
+    assert cached
+    etag_times = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        pdf_etag(data, eye, posture)
+        etag_times.append(time.perf_counter() - started)
+    print(
+        f"  one result          cold {cold * 1000:>8.1f} ms   repeat {statistics.median(repeat) * 1000:>6.3f} ms"
+        f"   etag (304) {statistics.median(etag_times) * 1000:>6.3f} ms"
+    )
+    pdf_pool.shutdown_pdf_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=4)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
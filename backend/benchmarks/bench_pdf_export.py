@@ -0,0 +1,98 @@
+"""
+Bulk PDF export benchmark (app.services.pdf_export): a cohort's reports as
+one request per report, one after another (what clients did before), against
+the streamed zip export, cold and with every report already cached.
+
+Results are seeded into the in-process results store. For the export it also
+reports the time to the first zip chunk and the largest chunk, i.e. how much
+of the archive is ever held at once, and checks the archive reads back.
+
+Run from backend/:
+    python -m benchmarks.bench_pdf_export
+    python -m benchmarks.bench_pdf_export --reports 24 --minutes 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import time
+import zipfile
+
+import numpy as np
+
+from app.services import pdf_pool
+from app.services.pdf_export import PDF_EXPORT_CONCURRENCY, load_report_inputs, stream_reports_zip
+from app.services.pdf_report import pdf_etag
+from app.services.results_store import store_results, store_timelines
+from benchmarks.bench_pdf import sample_report
+
+
+def seed(prefix: str, count: int, minutes: float, rng: np.random.Generator) -> list:
+    result_ids = []
+    for index in range(count):
+        result_id = f"{prefix}-{index}"
+        data, eye, posture = sample_report(result_id, minutes, rng)
+        store_results(result_id, data)
+        store_timelines(result_id, {"eye_timeline": eye, "posture_timeline": posture})
+        result_ids.append(result_id)
+    return result_ids
+
+
+async def one_by_one(result_ids: list) -> float:
+    started = time.perf_counter()
+    for result_id in result_ids:
+        report_result_id, data, eye, posture = load_report_inputs(result_id)
+        await pdf_pool.cached_interview_pdf(report_result_id, pdf_etag(data, eye, posture), data, eye, posture)
+    return time.perf_counter() - started
+
+
+async def bulk(result_ids: list) -> tuple:
+    started = time.perf_counter()
+    first_chunk = None
+    largest = 0
+    archive = io.BytesIO()
+    async for chunk in stream_reports_zip(result_ids):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+        largest = max(largest, len(chunk))
+        archive.write(chunk)
+    wall = time.perf_counter() - started
+    with zipfile.ZipFile(archive) as reader:
+        assert reader.testzip() is None
+        assert len(reader.namelist()) == len(result_ids) + 1
+    return wall, first_chunk, largest, archive.tell()
+
+
+async def run(args) -> None:
+    rng = np.random.default_rng(0)
+    sequential_ids = seed("seq", args.reports, args.minutes, rng)
+    bulk_ids = seed("bulk", args.reports, args.minutes, rng)
+
+    pdf_pool.start_pdf_pool()
+    # Let the workers finish their warm-up render before timing.
+    await pdf_pool.render_interview_pdf(*sample_report("warm", 1, rng))
+
+    print(
+        f"{args.reports} reports, {args.minutes:g} min timelines, "
+        f"{pdf_pool.PDF_POOL_WORKERS} pool workers, export concurrency {PDF_EXPORT_CONCURRENCY}"
+    )
+    print(f"  one request each   wall {await one_by_one(sequential_ids) * 1000:>8.0f} ms")
+    for label in ("bulk zip, cold", "bulk zip, cached"):
+        wall, first_chunk, largest, size = await bulk(bulk_ids)
+        print(
+            f"  {label:<18} wall {wall * 1000:>8.0f} ms   first chunk {first_chunk * 1000:>6.0f} ms"
+            f"   largest chunk {largest / 1024:>5.0f} KiB of {size / 1024:>6.0f} KiB"
+        )
+    pdf_pool.shutdown_pdf_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=12)
+    parser.add_argument("--minutes", type=float, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Report template benchmark (app.services.pdf_template): generates a batch of
+interview reports in one process, as a PDF worker does, with
+- a fresh ReportTemplate per report (the old behaviour: style sheet, six
+  paragraph styles and the header rebuilt on every download, plus one more
+  style per review heading line, which is not reproduced here), and
+- the shared REPORT_TEMPLATE built once at import.
+
+For each it reports per-report latency (p50/p95/max) of the whole render and
+of building the story alone, and, in a second pass under tracemalloc, the
+per-report peak allocation and the memory still held after the batch
+(once garbage is collected).
+
+Run from backend/:
+    python -m benchmarks.bench_pdf_reports
+    python -m benchmarks.bench_pdf_reports --reports 100 --minutes 2 30
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import io
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.services.pdf_report import build_interview_pdf, build_report_story
+from app.services.pdf_template import REPORT_TEMPLATE, ReportTemplate
+from benchmarks.bench_pdf import sample_report
+
+
+def percentile_ms(timings: list, percentile: float) -> float:
+    return float(np.percentile(timings, percentile)) * 1000
+
+
+def render(report, template_for) -> None:
+    data, eye, posture = report
+    # build_interview_pdf logs one line per report; keep the table readable.
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_interview_pdf(data, eye, posture, template_for())
+
+
+def time_batch(reports, template_for) -> tuple:
+    story_times, render_times = [], []
+    for data, eye, posture in reports:
+        started = time.perf_counter()
+        build_report_story(data, eye, posture, template_for())
+        story_times.append(time.perf_counter() - started)
+    for report in reports:
+        started = time.perf_counter()
+        render(report, template_for)
+        render_times.append(time.perf_counter() - started)
+    return story_times, render_times
+
+
+def allocation_batch(reports, template_for) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    peaks = []
+    for report in reports:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        render(report, template_for)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peaks, held - baseline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=100)
+    parser.add_argument("--minutes", type=float, nargs=2, default=[2, 30], metavar=("MIN", "MAX"))
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    reports = [
+        sample_report(f"bench-{index}", float(rng.uniform(*args.minutes)), rng)
+        for index in range(args.reports)
+    ]
+    # Load reportlab's fonts and caches first, as the worker warm-up does.
+    render(reports[0], lambda: REPORT_TEMPLATE)
+
+    started = time.perf_counter()
+    for _ in range(20):
+        ReportTemplate()
+    template_ms = (time.perf_counter() - started) / 20 * 1000
+    print(f"{args.reports} reports, {args.minutes[0]:g}-{args.minutes[1]:g} min sessions; building one ReportTemplate {template_ms:.2f} ms")
+
+    for label, template_for in (("per-report template", ReportTemplate), ("shared template", lambda: REPORT_TEMPLATE)):
+        story_times, render_times = time_batch(reports, template_for)
+        peaks, held = allocation_batch(reports, template_for)
+        print(f"  {label}")
+        print(
+            f"    render ms   p50 {percentile_ms(render_times, 50):>7.2f}   p95 {percentile_ms(render_times, 95):>7.2f}"
+            f"   max {max(render_times) * 1000:>7.2f}   total {sum(render_times) * 1000:>8.0f}"
+        )
+        print(
+            f"    story ms    p50 {percentile_ms(story_times, 50):>7.3f}   p95 {percentile_ms(story_times, 95):>7.3f}"
+            f"   max {max(story_times) * 1000:>7.3f}"
+        )
+        print(
+            f"    peak alloc  p50 {statistics.median(peaks) / 1024:>6.0f} KiB   max {max(peaks) / 1024:>6.0f} KiB"
+            f"   held after batch {held / 1024:>6.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Pitch-engine benchmark: librosa.pyin (default) versus the vectorized YIN in
+app.services.pitch.
+
+Accuracy is measured on synthetic signals with a known f0 track (steady and
+vibrato harmonic tones, amplitude-gated "syllables", and added noise):
+median absolute error in cents over frames both engines call voiced, and the
+fraction of frames where the voicing decisions agree. Speed is the median
+wall time over clips of increasing length.
+
+Run from backend/:
+    python -m benchmarks.bench_pitch
+    python -m benchmarks.bench_pitch --durations 10 60 --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.services.pitch import PITCH_ENGINES, PITCH_HOP_LENGTH, estimate_pitch
+from app.services.voice_analysis import VOICE_SAMPLE_RATE
+
+
+def harmonic_signal(f0_track: np.ndarray, sr: int, harmonics: int = 5) -> np.ndarray:
+    phase = 2 * np.pi * np.cumsum(f0_track) / sr
+    y = sum((0.6 / k) * np.sin(k * phase) for k in range(1, harmonics + 1))
+    return (0.5 * y / np.max(np.abs(y))).astype(np.float32)
+
+
+def make_cases(sr: int, seconds: float, rng: np.random.Generator) -> dict:
+    n = int(sr * seconds)
+    t = np.arange(n) / sr
+    vibrato = 150.0 * 2 ** (2.0 * np.sin(2 * np.pi * 0.5 * t) / 12)  # +-2 semitones
+    gate = (np.sin(2 * np.pi * 2.0 * t) > -0.2).astype(np.float32)  # ~2 syllables/s
+    cases = {
+        "steady 120Hz": (np.full(n, 120.0), None),
+        "vibrato 150Hz": (vibrato, None),
+        "gated syllables": (vibrato, gate),
+        "vibrato + noise": (vibrato, "noise"),
+    }
+    signals = {}
+    for name, (track, shaping) in cases.items():
+        y = harmonic_signal(track, sr)
+        if isinstance(shaping, np.ndarray):
+            y = y * shaping
+        elif shaping == "noise":
+            y = y + 0.05 * rng.standard_normal(n).astype(np.float32)
+        signals[name] = (y.astype(np.float32), track, gate if isinstance(shaping, np.ndarray) else None)
+    return signals
+
+
+def reference_at_frames(track: np.ndarray, n_frames: int) -> np.ndarray:
+    idx = np.minimum(np.arange(n_frames) * PITCH_HOP_LENGTH, track.size - 1)
+    return track[idx]
+
+
+def accuracy_table(sr: int) -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'signal':<18} {'engine':<6} {'median |err| cents':>19} {'voiced %':>9} {'voicing agree %':>16}")
+    for name, (y, track, gate) in make_cases(sr, 4.0, rng).items():
+        outputs = {engine: estimate_pitch(y, sr, engine=engine) for engine in PITCH_ENGINES}
+        n_frames = min(len(f0) for f0, _ in outputs.values())
+        truth = reference_at_frames(track, n_frames)
+        expected_voiced = np.ones(n_frames, dtype=bool)
+        if gate is not None:
+            expected_voiced = reference_at_frames(gate, n_frames) > 0
+        for engine, (f0, voiced) in outputs.items():
+            f0, voiced = f0[:n_frames], voiced[:n_frames].astype(bool)
+            both = voiced & expected_voiced & np.isfinite(f0)
+            cents = np.abs(1200 * np.log2(f0[both] / truth[both])) if both.any() else np.array([np.nan])
+            agree = np.mean(voiced == expected_voiced) * 100
+            print(
+                f"{name:<18} {engine:<6} {np.median(cents):>19.1f} "
+                f"{voiced.mean() * 100:>9.1f} {agree:>16.1f}"
+            )
+
+
+def speed_table(sr: int, durations: list, repeat: int) -> None:
+    rng = np.random.default_rng(1)
+    print(f"\n{'clip':>6} {'engine':<6} {'median s':>9} {'x realtime':>11}")
+    for seconds in durations:
+        y, _, _ = make_cases(sr, seconds, rng)["vibrato + noise"]
+        for engine in PITCH_ENGINES:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                estimate_pitch(y, sr, engine=engine)
+                timings.append(time.perf_counter() - started)
+            elapsed = statistics.median(timings)
+            print(f"{seconds:>5}s {engine:<6} {elapsed:>9.3f} {seconds / elapsed:>11.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--durations", type=int, nargs="+", default=[10, 60, 180], help="clip lengths in seconds")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sr = VOICE_SAMPLE_RATE
+    # Compile pyin's numba kernels before timing anything.
+    for engine in PITCH_ENGINES:
+        estimate_pitch(np.zeros(sr, dtype=np.float32), sr, engine=engine)
+
+    accuracy_table(sr)
+    speed_table(sr, args.durations, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
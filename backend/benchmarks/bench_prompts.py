@@ -0,0 +1,131 @@
+"""
+Prompt catalog benchmark (app.services.prompt_store): the old per-request
+linear filter against the indexed PromptCatalog, on a synthetic catalog.
+
+For each catalog size it reports the one-off index build time, then per call:
+- /prompt/all: filtering every prompt (old) vs returning the cached bucket,
+- /prompt/random: filtering then choosing (old) vs one pick from the bucket,
+and checks both return the same prompts for every filter combination.
+
+Run from backend/:
+    python -m benchmarks.bench_prompts
+    python -m benchmarks.bench_prompts --sizes 1000 100000 --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from app.services.prompt_store import PromptCatalog
+
+TYPES = ("behavioral", "situational", "technical", "general", "background")
+DIFFICULTIES = ("Easy", "Medium", "Hard", "Expert", "Master", 1, 2, 3, 4, 5)
+FILTERS = [
+    (prompt_type, difficulty)
+    for prompt_type in ("all", "behavior", "tech", "general")
+    for difficulty in ("all", "easy", "3", "master")
+]
+
+
+def legacy_normalize_prompt_type(prompt_type):
+    # As before: the alias table was rebuilt on every call.
+    raw = (prompt_type or "").strip().lower()
+    aliases = {
+        "all": "all", "any": "all", "default": "all",
+        "behavior": "behavioral", "behaviour": "behavioral", "behavioral": "behavioral",
+        "situation": "situational", "situational": "situational",
+        "technical": "technical", "tech": "technical",
+        "background": "general", "general": "general", "other": "general",
+    }
+    return aliases.get(raw, "all")
+
+
+def legacy_normalize_difficulty(difficulty):
+    raw = (difficulty or "").strip().lower()
+    aliases = {
+        "all": "all", "any": "all", "default": "all",
+        "1": "easy", "easy": "easy", "2": "medium", "medium": "medium", "3": "hard", "hard": "hard",
+        "4": "expert", "expert": "expert", "5": "master", "master": "master",
+    }
+    return aliases.get(raw, "all")
+
+
+def legacy_difficulty_bucket(value):
+    if isinstance(value, str):
+        normalized = legacy_normalize_difficulty(value)
+        if normalized != "all":
+            return normalized
+    try:
+        score = int(value)
+    except (TypeError, ValueError):
+        return "all"
+    return {1: "easy", 2: "medium", 3: "hard", 4: "expert", 5: "master"}.get(score, "all")
+
+
+def legacy_list_prompts(prompts, prompt_type="all", difficulty="all"):
+    normalized_type = legacy_normalize_prompt_type(prompt_type)
+    normalized_difficulty = legacy_normalize_difficulty(difficulty)
+    return [
+        prompt
+        for prompt in prompts
+        if (normalized_type == "all" or legacy_normalize_prompt_type(str(prompt.get("type", ""))) == normalized_type)
+        and (normalized_difficulty == "all" or legacy_difficulty_bucket(prompt.get("difficulty")) == normalized_difficulty)
+    ]
+
+
+def legacy_random_prompt(prompts, prompt_type="all", difficulty="all"):
+    return random.choice(legacy_list_prompts(prompts, prompt_type, difficulty))
+
+
+def make_prompts(count: int, rng: random.Random) -> list:
+    return [
+        {
+            "id": f"p_{index:06d}",
+            "type": rng.choice(TYPES),
+            "text": f"Synthetic interview question {index}?",
+            "difficulty": rng.choice(DIFFICULTIES),
+        }
+        for index in range(count)
+    ]
+
+
+def median_us(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for prompt_type, difficulty in FILTERS:
+            fn(prompt_type, difficulty)
+        timings.append((time.perf_counter() - started) / len(FILTERS))
+    return statistics.median(timings) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    for size in args.sizes:
+        prompts = make_prompts(size, rng)
+        started = time.perf_counter()
+        catalog = PromptCatalog(prompts)
+        build_ms = (time.perf_counter() - started) * 1000
+        for prompt_type, difficulty in FILTERS:
+            assert list(catalog.select(prompt_type, difficulty)) == legacy_list_prompts(prompts, prompt_type, difficulty)
+
+        print(f"\n{size} prompts: index built once in {build_ms:.1f} ms (same results for {len(FILTERS)} filters)")
+        print(
+            f"  list   us/call   linear {median_us(lambda t, d: legacy_list_prompts(prompts, t, d), args.repeat):>11.1f}"
+            f"   indexed {median_us(catalog.select, args.repeat * 100):>7.2f}"
+        )
+        print(
+            f"  random us/call   linear {median_us(lambda t, d: legacy_random_prompt(prompts, t, d), args.repeat):>11.1f}"
+            f"   indexed {median_us(catalog.random, args.repeat * 100):>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
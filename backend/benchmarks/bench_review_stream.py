@@ -0,0 +1,220 @@
+"""
+Review streaming benchmark against a local fake chat-completions server (no
+network, no API key).
+
+The fake server returns a fixed review as the JSON object analyze_interview
+asks for, after a first-token delay and then one token per `--token-latency`
+seconds, either as one response body or streamed as SSE chunks. For each
+mode it reports when the client first had something to show, when all
+category scores and the "doing well" section were known, and when the review
+was complete. It also checks that the scores and sections parsed from the
+stream match the parse of the finished review.
+
+It then times parsing a finished review: the old chain of str.split calls
+on the text layout against parse_review on the same text and on JSON.
+
+Run from backend/:
+    python -m benchmarks.bench_review_stream
+    python -m benchmarks.bench_review_stream --token-latency 0.03 --first-token 1.0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from openai import AsyncOpenAI
+
+from benchmarks.bench_transcription import start_server
+from app.services import Converter
+from app.services.review_parser import REVIEW_SCORE_FIELDS, REVIEW_SECTIONS, parse_review, review_fields
+
+STREAMED_FIELDS = [field for field, _, _ in REVIEW_SCORE_FIELDS] + [section for section, _ in REVIEW_SECTIONS]
+
+SAMPLE_REVIEW = """QUESTION: Tell me about a time you disagreed with a teammate.
+TYPE: behavioural
+DIFFICULTY: medium
+
+CATEGORY SCORES:
+- Communication Clarity: 18/25
+- Content & Substance: 16/25
+- Professionalism: 17/20
+- Body Language: 12/15
+- Vocal Delivery: 11/15
+
+TOTAL SCORE: 74/100 (7.4/10)
+
+WHAT YOU ARE DOING WELL (be specific, reference exact moments from the transcript):
+- You set up the situation quickly: "we had two weeks until the release and disagreed on the caching layer".
+- You described how you listened to your teammate's concerns before proposing a compromise.
+
+WHAT YOU MUST IMPROVE (be direct and actionable, reference exact moments from the transcript):
+- The result was vague ("it went fine"); quantify the outcome, for example latency or delivery date.
+- You used "um" and "like" often in the first thirty seconds; pause instead of filling silence.
+
+HABITS TO KEEP:
+- Keeping eye contact while explaining the compromise.
+
+ACTION PLAN FOR NEXT INTERVIEW:
+- Prepare two STAR stories with measurable results.
+- Record a practice answer and count filler words.
+"""
+# The same review as the JSON object the prompt asks for.
+SAMPLE_JSON_REVIEW = json.dumps(parse_review(SAMPLE_REVIEW)[0].model_dump(), indent=2)
+
+
+def review_tokens(text: str) -> list:
+    return re.findall(r"\S+\s*|\s+|[{}\[\]]", text)
+
+
+def split_chain_parse(review: str) -> dict:
+    """
+    The chained str.split parse analyze_interview used on the text layout.
+    """
+    parsed = {}
+    for field, label, maximum in REVIEW_SCORE_FIELDS:
+        parsed[field] = review.split(f"{label}: ")[1].split(f"/{maximum}")[0].strip()
+    headings = [heading for _, heading in REVIEW_SECTIONS]
+    for index, (section, heading) in enumerate(REVIEW_SECTIONS):
+        text = review.split(heading)[1]
+        if index + 1 < len(headings):
+            text = text.split(headings[index + 1])[0]
+        parsed[section] = text.strip()
+    return parsed
+
+
+def finished_parse(review: str) -> dict:
+    parsed, _ = parse_review(review)
+    return review_fields(parsed)
+
+
+def build_fake_chat(first_token: float, token_latency: float) -> FastAPI:
+    app = FastAPI()
+    tokens = review_tokens(SAMPLE_JSON_REVIEW)
+
+    def chunk(payload: dict) -> str:
+        return f"data: {json.dumps(payload)}\n\n"
+
+    @app.post("/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        base = {"id": "fake", "created": 0, "model": body["model"]}
+        if not body.get("stream"):
+            await asyncio.sleep(first_token + token_latency * len(tokens))
+            return {
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": SAMPLE_JSON_REVIEW},
+                    "finish_reason": "stop",
+                }],
+            }
+
+        async def events():
+            await asyncio.sleep(first_token)
+            for token in tokens:
+                yield chunk({**base, "object": "chat.completion.chunk", "choices": [
+                    {"index": 0, "delta": {"content": token}, "finish_reason": None}
+                ]})
+                await asyncio.sleep(token_latency)
+            yield chunk({**base, "object": "chat.completion.chunk", "choices": [
+                {"index": 0, "delta": {}, "finish_reason": "stop"}
+            ]})
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+async def run_mode(client: AsyncOpenAI, streaming: bool) -> dict:
+    Converter.REVIEW_STREAMING = streaming
+    marks = {}
+    parsed = {}
+    started = time.perf_counter()
+
+    def on_stage(stage: str, details: dict) -> None:
+        now = time.perf_counter() - started
+        marks.setdefault("first_feedback", now)
+        if stage == "review_score":
+            parsed[details["field"]] = details["value"]
+            if all(field in parsed for field, _, _ in REVIEW_SCORE_FIELDS):
+                marks.setdefault("scores", now)
+        elif stage == "review_section":
+            parsed[details["section"]] = details["text"]
+            if details["section"] == "doing_well":
+                marks.setdefault("doing_well", now)
+
+    review = await Converter.generate_review(client, "bench prompt", on_stage=on_stage)
+    total = time.perf_counter() - started
+    if not streaming:
+        # Without streaming nothing is known until the response is parsed.
+        parsed = finished_parse(review)
+        marks = {key: total for key in ("first_feedback", "scores", "doing_well")}
+    return {"marks": marks, "total": total, "review": review, "parsed": parsed}
+
+
+def time_parse(fn, text: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+async def run(args) -> None:
+    server, port = start_server(build_fake_chat(args.first_token, args.token_latency))
+    client = AsyncOpenAI(api_key="fake", base_url=f"http://127.0.0.1:{port}/v1", max_retries=0)
+    print(f"{len(review_tokens(SAMPLE_JSON_REVIEW))} tokens, first token after {args.first_token}s, {args.token_latency}s per token")
+    print(f"{'mode':<10} {'first feedback s':>17} {'all scores s':>13} {'doing well s':>13} {'complete s':>11}  parse")
+    try:
+        for streaming in (False, True):
+            outcome = await run_mode(client, streaming)
+            expected = finished_parse(outcome["review"])
+            parsed = outcome["parsed"]
+            verdict = (
+                "matches finished parse"
+                if all(parsed.get(key) == expected[key] for key in STREAMED_FIELDS)
+                else "MISMATCH"
+            )
+            marks = outcome["marks"]
+            print(
+                f"{'streamed' if streaming else 'blocking':<10} {marks.get('first_feedback', float('nan')):>17.2f} "
+                f"{marks.get('scores', float('nan')):>13.2f} {marks.get('doing_well', float('nan')):>13.2f} "
+                f"{outcome['total']:>11.2f}  {verdict}"
+            )
+    finally:
+        await client.close()
+        server.should_exit = True
+
+    assert finished_parse(SAMPLE_REVIEW) == finished_parse(SAMPLE_JSON_REVIEW)
+    truncated = SAMPLE_REVIEW.split("HABITS TO KEEP")[0]
+    print()
+    print(f"{'parser':<28} {'us / review':>12}  missing heading")
+    for name, fn, text in (
+        ("str.split chain (text)", split_chain_parse, SAMPLE_REVIEW),
+        ("parse_review (text)", finished_parse, SAMPLE_REVIEW),
+        ("parse_review (json)", finished_parse, SAMPLE_JSON_REVIEW),
+    ):
+        try:
+            fn(truncated)
+            missing = "partial result"
+        except IndexError:
+            missing = "IndexError"
+        print(f"{name:<28} {time_parse(fn, text, args.parse_repeat):>12.1f}  {missing}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--first-token", type=float, default=0.6, help="fake time to first token (s)")
+    parser.add_argument("--token-latency", type=float, default=0.08, help="fake time per token (s)")
+    parser.add_argument("--parse-repeat", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
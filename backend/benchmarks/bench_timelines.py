@@ -0,0 +1,126 @@
+"""
+Timeline ingest/storage/serving benchmark: the previous list-of-dicts path
+against float32 TimelineSeries arrays (app.services.timeline_arrays).
+
+For sessions of the given lengths at 30 fps (posture + eye series) it reports:
+- upload size: JSON form field vs the binary TLN1 encoding,
+- ingest time: json.loads only (old) vs json.loads + conversion vs binary decode,
+- memory held per result (tracemalloc) and the SQLite blob size,
+- per-request serving of /results/posture_timeline: walking the dicts and
+  FastAPI's jsonable_encoder (old) vs pairs from the arrays + json.dumps,
+and checks the served pairs match the uploaded points.
+
+Run from backend/:
+    python -m benchmarks.bench_timelines
+    python -m benchmarks.bench_timelines --minutes 5 30 --fps 30
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+
+from app.services.timeline_arrays import (
+    decode_timelines_binary,
+    encode_timelines_binary,
+    encode_timelines_blob,
+    timelines_from_payload,
+)
+
+SERIES = ("posture_timeline", "eye_timeline")
+
+
+def make_points(minutes: float, fps: int, rng: np.random.Generator) -> list:
+    n = int(minutes * 60 * fps)
+    timestamps = np.round(np.arange(n) / fps + rng.uniform(0, 0.004, n), 2)
+    values = np.clip(np.round(70 + np.cumsum(rng.normal(0, 0.5, n))), 0, 100).astype(int)
+    return [{"timestamp": float(t), "percentage": int(v)} for t, v in zip(timestamps, values)]
+
+
+def old_to_pairs(timeline) -> list:
+    pairs = []
+    for item in timeline:
+        if isinstance(item, dict):
+            pairs.append([item.get("timestamp"), item.get("percentage")])
+    return pairs
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def held_bytes(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[5, 30])
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    for minutes in args.minutes:
+        payload = {name: make_points(minutes, args.fps, rng) for name in SERIES}
+        form_json = json.dumps(payload)
+        arrays = timelines_from_payload(payload)
+        binary = encode_timelines_binary(arrays)
+        stored_old = json.loads(form_json)
+
+        served = arrays["posture_timeline"].to_pairs()
+        expected = old_to_pairs(payload["posture_timeline"])
+        max_error = float(np.max(np.abs(np.asarray(served) - np.asarray(expected, dtype=float))))
+        assert len(served) == len(expected) and max_error < 1e-3, max_error
+        assert all(
+            np.array_equal(decoded.values, arrays[name].values)
+            for name, decoded in decode_timelines_binary(binary).items()
+        )
+
+        points = len(payload["posture_timeline"])
+        print(f"\n{minutes:g} min at {args.fps} fps: {points} points per series, {len(SERIES)} series")
+        print(f"  upload       JSON {len(form_json) / 1024:>9.0f} KiB   binary {len(binary) / 1024:>9.0f} KiB")
+        print(
+            f"  ingest ms    json.loads {best_of(lambda: json.loads(form_json), args.repeat):>7.2f}"
+            f"   + arrays {best_of(lambda: timelines_from_payload(json.loads(form_json)), args.repeat):>7.2f}"
+            f"   binary {best_of(lambda: decode_timelines_binary(binary), args.repeat):>7.2f}"
+        )
+        print(
+            f"  held KiB     dicts {held_bytes(lambda: json.loads(form_json)) / 1024:>9.0f}"
+            f"   arrays {held_bytes(lambda: decode_timelines_binary(binary)) / 1024:>9.0f}"
+        )
+        old_blob = len(json.dumps(stored_old).encode("utf-8"))
+        meta, new_blob = encode_timelines_blob(arrays)
+        print(f"  SQLite blob  JSON {old_blob / 1024:>9.0f} KiB   binary {(len(new_blob) + len(meta)) / 1024:>9.0f} KiB")
+
+        def serve_old():
+            body = jsonable_encoder({"ok": True, "posture_timeline": old_to_pairs(stored_old["posture_timeline"])})
+            return json.dumps(body)
+
+        def serve_new():
+            return json.dumps({"ok": True, "posture_timeline": arrays["posture_timeline"].to_pairs()})
+
+        print(
+            f"  serve ms     dicts+encoder {best_of(serve_old, args.repeat):>7.2f}"
+            f"   arrays {best_of(serve_new, args.repeat):>7.2f}   (max |diff| {max_error:.1e})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Chunked transcription benchmark against a local fake Whisper server (no
+network, no API key).
+
+The fake server implements POST /v1/audio/transcriptions. It decodes the
+upload and "transcribes" every speech segment as a word derived from its
+tone frequency, then sleeps base + per-second latency to mimic the API.
+Each synthetic recording is a run of tone phrases separated by pauses, so
+the expected transcript is known: the chunked result must match both it and
+the single-request result word for word (same order, nothing split or lost);
+the script exits with status 1 if any run does not.
+
+Run from backend/:
+    python -m benchmarks.bench_transcription
+    python -m benchmarks.bench_transcription --durations 120 600 --latency-per-sec 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import soundfile
+import uvicorn
+from fastapi import FastAPI, File, Form, UploadFile
+from openai import AsyncOpenAI
+
+from app.services.Converter import transcribe_audio
+from app.services.transcription_chunks import STT_CHUNK_SECONDS, STT_MAX_CONCURRENCY, transcribe_in_chunks
+from app.services.voice_analysis import VOICE_SAMPLE_RATE, _resolve_ffmpeg, decode_audio_to_pcm
+from app.services.voice_features import speech_intervals
+
+WORD_BASE_HZ = 200.0
+WORD_STEP_HZ = 25.0
+WORD_COUNT = 24
+
+
+def word_for_frequency(freq: float) -> str:
+    return f"w{int(round((freq - WORD_BASE_HZ) / WORD_STEP_HZ)) % WORD_COUNT:02d}"
+
+
+def make_recording(seconds: int, sr: int, rng: np.random.Generator) -> tuple[np.ndarray, list]:
+    """
+    Tone phrases of 1.5-6 s (one word each) separated by 0.4-1.5 s pauses.
+    """
+    parts, words, total = [], [], 0
+    while total < seconds * sr:
+        k = int(rng.integers(WORD_COUNT))
+        n = int(rng.uniform(1.5, 6.0) * sr)
+        t = np.arange(n) / sr
+        envelope = np.minimum(1.0, np.minimum(t, t[::-1]) / 0.02)
+        parts.append(0.4 * envelope * np.sin(2 * np.pi * (WORD_BASE_HZ + WORD_STEP_HZ * k) * t))
+        pause = np.zeros(int(rng.uniform(0.4, 1.5) * sr))
+        parts.append(pause)
+        words.append(f"w{k:02d}")
+        total += n + len(pause)
+    y = np.concatenate(parts) + 0.0005 * rng.standard_normal(total)
+    return y.astype(np.float32), words
+
+
+def encode_webm(ffmpeg_path: str, y: np.ndarray, sr: int) -> bytes:
+    proc = subprocess.run(
+        [
+            ffmpeg_path, "-hide_banner", "-loglevel", "error",
+            "-f", "f32le", "-ar", str(sr), "-ac", "1", "-i", "pipe:0",
+            "-c:a", "libopus", "-b:a", "32k", "-f", "webm", "pipe:1",
+        ],
+        input=y.tobytes(),
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return proc.stdout
+
+
+def fake_transcribe(y: np.ndarray, sr: int) -> str:
+    words = []
+    for start, end in speech_intervals(y):
+        middle = y[start:end][(end - start) // 4 : 3 * (end - start) // 4]
+        if middle.size < sr // 10:
+            continue
+        spectrum = np.abs(np.fft.rfft(middle * np.hanning(middle.size)))
+        words.append(word_for_frequency(np.argmax(spectrum) * sr / middle.size))
+    return " ".join(words)
+
+
+def build_fake_whisper(latency_base: float, latency_per_sec: float, stats: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(file: UploadFile = File(...), model: str = Form(...), prompt: str = Form("")):
+        data = await file.read()
+        if file.filename.endswith(".flac"):
+            y, sr = soundfile.read(io.BytesIO(data), dtype="float32")
+        else:
+            y, sr = await asyncio.to_thread(decode_audio_to_pcm, data)
+        stats["requests"] += 1
+        stats["bytes"] += len(data)
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(latency_base + latency_per_sec * len(y) / sr)
+        finally:
+            stats["in_flight"] -= 1
+        return {"text": fake_transcribe(y, sr)}
+
+    return app
+
+
+def start_server(app: FastAPI) -> tuple[uvicorn.Server, int]:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, port
+
+
+async def run(args) -> None:
+    ffmpeg_path = _resolve_ffmpeg()
+    if not ffmpeg_path:
+        raise SystemExit("ffmpeg is required for this benchmark.")
+
+    stats = {"requests": 0, "bytes": 0, "in_flight": 0, "max_in_flight": 0}
+    server, port = start_server(build_fake_whisper(args.latency_base, args.latency_per_sec, stats))
+    client = AsyncOpenAI(api_key="fake", base_url=f"http://127.0.0.1:{port}/v1", max_retries=0)
+    sr = VOICE_SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    failures = []
+
+    print(f"chunk target {STT_CHUNK_SECONDS}s, concurrency {STT_MAX_CONCURRENCY}")
+    print(f"{'clip':>6} {'mode':<8} {'wall s':>7} {'requests':>9} {'peak in flight':>15} {'upload KiB':>11}  transcript")
+    try:
+        for seconds in args.durations:
+            y, expected = make_recording(seconds, sr, rng)
+            webm = encode_webm(ffmpeg_path, y, sr)
+            # Decode the way /analyze does, so chunking sees the same PCM.
+            pcm, _ = decode_audio_to_pcm(webm)
+
+            runs = (
+                ("single", lambda: transcribe_audio(webm, client=client)),
+                ("chunked", lambda: transcribe_in_chunks(
+                    pcm, sr, lambda chunk, name: transcribe_audio(chunk, filename=name, client=client)
+                )),
+            )
+            transcripts = {}
+            for mode, call in runs:
+                stats.update(requests=0, bytes=0, max_in_flight=0)
+                started = time.perf_counter()
+                text = await call()
+                elapsed = time.perf_counter() - started
+                transcripts[mode] = text.split()
+                verdict = "matches" if transcripts[mode] == expected else f"MISMATCH ({len(text.split())}/{len(expected)} words)"
+                if transcripts[mode] != expected:
+                    failures.append(f"{seconds}s {mode}: transcript differs from the expected words")
+                print(
+                    f"{seconds:>5}s {mode:<8} {elapsed:>7.2f} {stats['requests']:>9} "
+                    f"{stats['max_in_flight']:>15} {stats['bytes'] / 1024:>11.0f}  {verdict}"
+                )
+            if transcripts["chunked"] != transcripts["single"]:
+                failures.append(f"{seconds}s: chunked transcript differs from the single-request one")
+    finally:
+        await client.close()
+        server.should_exit = True
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--durations", type=int, nargs="+", default=[120, 300, 600], help="recording lengths in seconds")
+    parser.add_argument("--latency-base", type=float, default=0.4, help="fake per-request latency (s)")
+    parser.add_argument("--latency-per-sec", type=float, default=0.03, help="fake latency per second of audio (s)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import BackendStatusWidget from "./components/BackendStatusWidget";
 import ResultsPage from "./resultspage/ResultsPage";
 import AnalyzingPage from "./analyzing/AnalyzingPage";
 import CountdownPage from "./countdown/CountdownPage";
+import { EMPTY_ANALYSIS_PROGRESS, reduceAnalysisProgress } from "./utils/analysisJob";
 
 const FALLBACK_PROMPT = {
   id: "fallback-prompt",
@@ -45,6 +46,8 @@ export default function App({
   const [loadingDots, setLoadingDots] = useState("");
   const [interviewRound, setInterviewRound] = useState(0);
   const [trackerPhase, setTrackerPhase] = useState("idle");
+  const [resultId, setResultId] = useState("");
+  const [analysisProgress, setAnalysisProgress] = useState(EMPTY_ANALYSIS_PROGRESS);
   const lastPromptLoadKeyRef = useRef("");
 
   const apiBase = (import.meta.env.VITE_API_BASE_URL || "http://127.0.0.1:8000").replace(/\/$/, "");
@@ -141,11 +144,18 @@ export default function App({
     return () => window.clearInterval(timer);
   }, [promptLoading]);
 
-  async function handleAnalysisResult() {
+  const handleAnalysisProgress = useCallback((stage, details) => {
+    setAnalysisProgress((current) => reduceAnalysisProgress(current, stage, details));
+  }, []);
+
+  async function handleAnalysisResult(data) {
+    const nextResultId = data?.result_id || "";
+    setResultId(nextResultId);
+    const query = nextResultId ? `?result_id=${encodeURIComponent(nextResultId)}` : "";
     try {
       const [eyeRes, postureRes] = await Promise.all([
-        fetch(`${apiBase}/results/eye_timeline`),
-        fetch(`${apiBase}/results/posture_timeline`),
+        fetch(`${apiBase}/results/eye_timeline${query}`),
+        fetch(`${apiBase}/results/posture_timeline${query}`),
       ]);
 
       const eyeData = await eyeRes.json();
@@ -164,6 +174,7 @@ export default function App({
       return;
     }
     setTrackerPhase("idle");
+    setAnalysisProgress(EMPTY_ANALYSIS_PROGRESS);
     setView("interview");
     setInterviewRound((previous) => previous + 1);
   }
@@ -173,7 +184,7 @@ export default function App({
       <>
         {backendStatusWidget}
         <div className="app-shell">
-          <ResultsPage onRestart={handleRestart} />
+          <ResultsPage resultId={resultId} onRestart={handleRestart} />
         </div>
       </>
     );
@@ -210,7 +221,7 @@ export default function App({
     return (
       <>
         {backendStatusWidget}
-        <AnalyzingPage />
+        <AnalyzingPage progress={analysisProgress} />
       </>
     );
   }
@@ -244,6 +255,7 @@ export default function App({
             autoStartCamera={true}
             drawLandmarks={false}
             onAnalysisResult={handleAnalysisResult}
+            onAnalysisProgress={handleAnalysisProgress}
             onPhaseChange={setTrackerPhase}
             onEnd={() => setView("results")}
             prompt={prompt || FALLBACK_PROMPT}
@@ -1,12 +1,48 @@
 import "./AnalyzingPage.css";
 
-export default function AnalyzingPage() {
+function sectionItems(text) {
+  return String(text || "")
+    .split("\n")
+    .map((line) => line.replace(/^\s*-\s*/, "").trim())
+    .filter(Boolean);
+}
+
+export default function AnalyzingPage({ progress = null }) {
+  const scores = progress?.scores || [];
+  const sections = progress?.sections || [];
+
   return (
     <div className="analyzing-page">
       <div className="analyzing-card">
         <div className="analyzing-spinner" aria-hidden="true" />
         <h1 className="analyzing-title">Analyzing Your Results...</h1>
-        <p className="analyzing-subtitle">Please wait while we process your interview.</p>
+        <p className="analyzing-subtitle" role="status" aria-live="polite">
+          {progress?.message || "Please wait while we process your interview."}
+        </p>
+
+        {scores.length ? (
+          <ul className="analyzing-scores">
+            {scores.map((score) => (
+              <li key={score.field}>
+                <span>{score.label}</span>
+                <strong>
+                  {score.value}/{score.max}
+                </strong>
+              </li>
+            ))}
+          </ul>
+        ) : null}
+
+        {sections.map((section) => (
+          <section key={section.section} className="analyzing-section">
+            <h2>{section.heading}</h2>
+            <ul>
+              {sectionItems(section.text).map((item, index) => (
+                <li key={index}>{item}</li>
+              ))}
+            </ul>
+          </section>
+        ))}
       </div>
     </div>
   );
@@ -22,6 +22,8 @@ import {
 import { ema } from "../utils/math";
 import { computePostureScore } from "../utils/scoringPosture";
 import { computeEyeContactScore } from "../utils/scoringEye";
+import { encodeTimelinesBinary } from "../utils/timelineBinary";
+import { analyzeInterview } from "../utils/analysisJob";
 import "./VisionTracker.css";
 import AnalyzingPage from "../analyzing/AnalyzingPage";
 
@@ -93,6 +95,7 @@ export default function VisionTracker({
   prompt = null,
   onUpdate,
   onAnalysisResult,
+  onAnalysisProgress,
   onPhaseChange,
   onEnd, // âœ… NEW: lets parent return to entry page
 }) {
@@ -463,14 +466,13 @@ export default function VisionTracker({
     formData.append("prompt_difficulty", String(prompt?.difficulty || ""));
     formData.append("vision_metrics", JSON.stringify(latestMetricsRef.current || {}));
     formData.append("interview_summary", JSON.stringify(interviewSummary));
-    formData.append("interview_timelines", JSON.stringify(interviewTimelines));
+    formData.append("interview_timelines_bin", encodeTimelinesBinary(interviewTimelines), "timelines.bin");
     formData.append("good_signals", JSON.stringify(goodSignals));
     formData.append("red_flags", JSON.stringify(redFlags));
 
     const apiBase = (import.meta.env.VITE_API_BASE_URL || "http://127.0.0.1:8000").replace(/\/$/, "");
-    const response = await fetch(`${apiBase}/analyze`, { method: "POST", body: formData });
-    if (!response.ok) throw new Error(`Analyze failed with status ${response.status}`);
-    const data = await response.json();
+    // Job mode: scores and feedback sections stream in while the review is written.
+    const data = await analyzeInterview(apiBase, formData, onAnalysisProgress);
     onAnalysisResult?.(data);
     setStatus(`Uploaded ${filename} (${audioBlob.size} bytes).`);
   }
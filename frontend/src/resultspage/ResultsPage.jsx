@@ -114,21 +114,23 @@ function renderList(items, emptyLabel) {
   );
 }
 
-export default function ResultsPage({ onRestart }) {
+export default function ResultsPage({ resultId = "", onRestart }) {
   const [eyeHistory, setEyeHistory] = useState([]);
   const [postureHistory, setPostureHistory] = useState([]);
   const [fullResults, setFullResults] = useState({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
 
+  const resultQuery = resultId ? `?result_id=${encodeURIComponent(resultId)}` : "";
+
   useEffect(() => {
     async function load() {
       const apiBase = (import.meta.env.VITE_API_BASE_URL || "http://127.0.0.1:8000").replace(/\/$/, "");
       try {
         const [eyeRes, postureRes, fullRes] = await Promise.all([
-          fetch(`${apiBase}/results/eye_timeline`),
-          fetch(`${apiBase}/results/posture_timeline`),
-          fetch(`${apiBase}/results/full`),
+          fetch(`${apiBase}/results/eye_timeline${resultQuery}`),
+          fetch(`${apiBase}/results/posture_timeline${resultQuery}`),
+          fetch(`${apiBase}/results/full${resultQuery}`),
         ]);
 
         const eyeJson = await eyeRes.json();
@@ -149,12 +151,23 @@ export default function ResultsPage({ onRestart }) {
     }
 
     load();
-  }, []);
+  }, [resultQuery]);
 
   const eyeData = useMemo(() => normalizeXY(eyeHistory), [eyeHistory]);
   const postureData = useMemo(() => normalizeXY(postureHistory), [postureHistory]);
-  const eyeAverage = useMemo(() => averageScore(eyeData), [eyeData]);
-  const postureAverage = useMemo(() => averageScore(postureData), [postureData]);
+  // Averages come from the backend's timeline stats (computed over every point at
+  // upload); the timelines fetched above are downsampled for charting.
+  const timelineStats = fullResults?.timeline_stats || {};
+  const eyeStatsMean = timelineStats.eye_timeline?.mean;
+  const postureStatsMean = timelineStats.posture_timeline?.mean;
+  const eyeAverage = useMemo(
+    () => (eyeStatsMean != null ? Math.round(eyeStatsMean) : averageScore(eyeData)),
+    [eyeStatsMean, eyeData]
+  );
+  const postureAverage = useMemo(
+    () => (postureStatsMean != null ? Math.round(postureStatsMean) : averageScore(postureData)),
+    [postureStatsMean, postureData]
+  );
   const totalDuration = useMemo(
     () => Math.max(sessionLength(eyeData), sessionLength(postureData)),
     [eyeData, postureData]
@@ -172,7 +185,7 @@ export default function ResultsPage({ onRestart }) {
 
   const handleDownload = async () => { // added download section here
     const apiBase = (import.meta.env.VITE_API_BASE_URL || "http://127.0.0.1:8000").replace(/\/$/, "");
-    const res = await fetch(`${apiBase}/results/interview/pdf`);
+    const res = await fetch(`${apiBase}/results/interview/pdf${resultQuery}`);
     const blob = await res.blob();
     const url = URL.createObjectURL(blob);
     const a = document.createElement("a");
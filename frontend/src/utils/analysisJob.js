@@ -0,0 +1,100 @@
+// Submits an interview to POST /analyze?mode=job and follows the job's
+// server-sent events (GET /analyze/jobs/{id}/events) until it completes, so
+// scores and feedback sections can be shown while the review is generated.
+
+// Pipeline stages reported by the backend, in the order they usually
+// finish, with what to show while waiting. Transcription and voice analysis
+// run side by side, so their events can arrive in either order.
+const STAGE_MESSAGES = {
+  queued: "Waiting for an analysis slot...",
+  started: "Transcribing and analysing your voice...",
+  decoded: "Audio decoded. Transcribing and analysing your voice...",
+  transcribed: "Transcript ready. Analysing your voice...",
+  voice_done: "Voice analysis ready. Writing feedback...",
+  reviewed: "Feedback written. Saving results...",
+  completed: "Done.",
+};
+const STAGE_ORDER = Object.keys(STAGE_MESSAGES);
+
+const PROGRESS_STAGES = [
+  ...STAGE_ORDER,
+  "review_score",
+  "review_section",
+  "failed",
+];
+
+export const EMPTY_ANALYSIS_PROGRESS = { stage: "", message: "", scores: [], sections: [] };
+
+export function reduceAnalysisProgress(progress, stage, details = {}) {
+  if (stage === "review_score") {
+    const scores = progress.scores.filter((score) => score.field !== details.field);
+    return { ...progress, scores: [...scores, details] };
+  }
+  if (stage === "review_section") {
+    const sections = progress.sections.filter((section) => section.section !== details.section);
+    return { ...progress, sections: [...sections, details] };
+  }
+  // Never step the message back (e.g. "decoded" arriving after "transcribed").
+  if (STAGE_ORDER.indexOf(stage) <= STAGE_ORDER.indexOf(progress.stage)) return progress;
+  return { ...progress, stage, message: STAGE_MESSAGES[stage] };
+}
+
+function followJobEvents(apiBase, job, onProgress) {
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${apiBase}${job.events_url}`);
+
+    const finish = (settle, value) => {
+      source.close();
+      settle(value);
+    };
+
+    PROGRESS_STAGES.forEach((stage) => {
+      source.addEventListener(stage, (message) => {
+        let event;
+        try {
+          event = JSON.parse(message.data);
+        } catch {
+          return;
+        }
+        if (stage === "completed") {
+          onProgress?.(stage, event.details || {});
+          finish(resolve, event.result);
+        } else if (stage === "failed") {
+          finish(reject, new Error(event.details?.error || "Analysis failed."));
+        } else {
+          onProgress?.(stage, event.details || {});
+        }
+      });
+    });
+
+    source.onerror = async () => {
+      // EventSource reconnects by itself unless the stream was refused; then fall back to polling.
+      if (source.readyState !== EventSource.CLOSED) return;
+      try {
+        finish(resolve, await pollJob(apiBase, job));
+      } catch (error) {
+        finish(reject, error);
+      }
+    };
+  });
+}
+
+async function pollJob(apiBase, job) {
+  for (;;) {
+    const response = await fetch(`${apiBase}${job.status_url}`, { cache: "no-store" });
+    if (!response.ok) throw new Error(`Analysis job lookup failed with status ${response.status}`);
+    const { job: state } = await response.json();
+    if (state.status === "succeeded") return state.result;
+    if (state.status === "failed") throw new Error(state.error || "Analysis failed.");
+    await new Promise((resolveDelay) => setTimeout(resolveDelay, 1000));
+  }
+}
+
+export async function analyzeInterview(apiBase, formData, onProgress) {
+  const response = await fetch(`${apiBase}/analyze?mode=job`, { method: "POST", body: formData });
+  if (!response.ok) throw new Error(`Analyze failed with status ${response.status}`);
+  const data = await response.json();
+  if (response.status !== 202 || !data?.events_url) return data;
+  onProgress?.("queued", {});
+  return followJobEvents(apiBase, data, onProgress);
+}
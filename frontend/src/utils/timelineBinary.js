@@ -0,0 +1,36 @@
+// Binary timeline upload ("TLN1"), decoded by backend/app/services/timeline_arrays.py.
+// Little-endian: magic "TLN1", uint32 series count, then per series:
+// uint32 name length, UTF-8 name, uint32 point count n,
+// n float32 timestamps (seconds), n float32 values.
+const MAGIC = [0x54, 0x4c, 0x4e, 0x31];
+
+export function encodeTimelinesBinary(timelines) {
+  const encoder = new TextEncoder();
+  const entries = Object.entries(timelines || {}).map(([name, points]) => [
+    encoder.encode(name),
+    Array.isArray(points) ? points : [],
+  ]);
+  const size = entries.reduce((total, [name, points]) => total + 8 + name.length + points.length * 8, 8);
+
+  const buffer = new ArrayBuffer(size);
+  const view = new DataView(buffer);
+  const bytes = new Uint8Array(buffer);
+  bytes.set(MAGIC, 0);
+  view.setUint32(4, entries.length, true);
+
+  let offset = 8;
+  for (const [name, points] of entries) {
+    view.setUint32(offset, name.length, true);
+    bytes.set(name, offset + 4);
+    offset += 4 + name.length;
+    view.setUint32(offset, points.length, true);
+    offset += 4;
+    const valuesOffset = offset + points.length * 4;
+    points.forEach((point, index) => {
+      view.setFloat32(offset + index * 4, Number(point?.timestamp) || 0, true);
+      view.setFloat32(valuesOffset + index * 4, Number(point?.percentage) || 0, true);
+    });
+    offset = valuesOffset + points.length * 4;
+  }
+  return new Blob([buffer], { type: "application/octet-stream" });
+}